@@ -0,0 +1,85 @@
+"""
+Checks that zxcvbn.aggregate.Aggregate stays the same size however many results it
+counts, that aggregates of shards merge (also through json) into the one a single
+pass gives, and that its top words are within the stated error of the true counts;
+reports how fast it counts.
+
+    python benchmarks/bench_aggregate.py [count]
+"""
+import collections
+import json
+import random
+import sys
+import time
+
+import zxcvbn
+from zxcvbn.aggregate import Aggregate, FIELDS
+
+SHARDS = 8
+
+
+def make_results(rng, count):
+    # real results for a pool of passwords, replayed with a long tail of made-up words
+    # in a third of their dictionary matches, so the word counts have to be compacted.
+    pool = []
+    for _ in range(2000):
+        password = ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz0123456789!qwerty')
+                           for _ in range(rng.randint(4, 16)))
+        result = zxcvbn.password_strength(password)
+        pool.append(dict((field, result[field]) for field in FIELDS if field in result))
+    for n in range(count):
+        result = rng.choice(pool)
+        if result.get('sequence') and rng.random() < 0.3:
+            sequence = [dict(match, matched_word='tail%d' % rng.randint(0, count))
+                        if match['pattern'] == 'dictionary' else match for match in result['sequence']]
+            result = dict(result, sequence=sequence)
+        yield result
+
+
+def comparable(aggregate):
+    data = aggregate.to_dict()
+    # floating point sums depend on the order they were added in.
+    data['log10_sum'] = round(data['log10_sum'], 6)
+    return data
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    results = list(make_results(random.Random(0), count))
+    truth = collections.Counter(match['matched_word'] for result in results
+                                for match in result.get('sequence', []) if match['pattern'] == 'dictionary')
+
+    whole = Aggregate()
+    sizes = []
+    start = time.time()
+    for n, result in enumerate(results, 1):
+        whole.add(result)
+        if n in (count // 100, count // 10, count):
+            sizes.append((n, len(json.dumps(whole.to_dict()))))
+    elapsed = time.time() - start
+    print('%d results counted at %.0f results/s' % (count, count / elapsed))
+    for n, size in sizes:
+        print('%10d results: aggregate of %6.1f KiB as json, %d words' % (n, size / 1024.0, len(whole.word_counts)))
+
+    shards = [Aggregate() for _ in range(SHARDS)]
+    for n, result in enumerate(results):
+        shards[n % SHARDS].add(result)
+    merged = Aggregate()
+    for shard in shards:
+        merged.merge(Aggregate.from_dict(json.loads(json.dumps(shard.to_dict()))))
+    assert merged.count == whole.count and merged.scores == whole.scores and merged.bins == whole.bins
+    assert merged.patterns == whole.patterns and merged.dictionaries == whole.dictionaries
+    unsharded = Aggregate.from_dict(json.loads(json.dumps(whole.to_dict())))
+    assert comparable(unsharded) == comparable(whole)
+
+    for aggregate, name in ((whole, 'single pass'), (merged, '%d shards' % SHARDS)):
+        for word, counted in aggregate.top_words(50):
+            assert counted <= truth[word] <= counted + aggregate.words_error, (name, word)
+        top = [word for word, _ in aggregate.top_words(20)]
+        missed = [word for word, _ in truth.most_common(20) if word not in top]
+        print('%12s: words_error %d, true top 20 missing from its top 20: %s'
+              % (name, aggregate.words_error, ', '.join(missed) or 'none'))
+
+
+if __name__ == '__main__':
+    main()
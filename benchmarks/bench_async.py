@@ -0,0 +1,99 @@
+"""
+Event-loop latency while an asyncio app scores passwords: clients concurrent
+coroutines each score their share of the passwords, while a ticker measures how
+late the loop wakes it up every millisecond. Compares calling password_strength
+directly in the coroutines with zxcvbn.aio on threads and on processes, and checks
+they all give the same results.
+
+    python benchmarks/bench_async.py [count] [clients]
+"""
+import asyncio
+import random
+import sys
+import time
+
+import zxcvbn
+import zxcvbn.aio
+
+TICK = 0.001
+FIELDS = ['guesses', 'score']
+
+
+def make_passwords(count, rng):
+    # mostly short passwords, with some of the long, symbol-heavy ones that stall a loop.
+    passwords = []
+    for _ in range(count):
+        if rng.random() < 0.1:
+            length = rng.randint(40, 80)
+        else:
+            length = rng.randint(6, 14)
+        passwords.append(''.join(rng.choice('abcdefghijklmnopqrstuvwxyz0123456789!@#$%^&*qwerty')
+                                 for _ in range(length)))
+    return passwords
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+async def ticker(lags, stop):
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(TICK)
+        lags.append(loop.time() - start - TICK)
+
+
+async def run(score, passwords, clients):
+    lags = []
+    stop = asyncio.Event()
+    tick = asyncio.ensure_future(ticker(lags, stop))
+    results = [None] * len(passwords)
+
+    async def client(k):
+        for n in range(k, len(passwords), clients):
+            results[n] = await score(passwords[n])
+
+    start = time.time()
+    await asyncio.gather(*[client(k) for k in range(clients)])
+    elapsed = time.time() - start
+    stop.set()
+    await tick
+    return results, elapsed, lags
+
+
+async def blocking(password):
+    result = zxcvbn.password_strength(password)
+    return dict((field, result[field]) for field in FIELDS)
+
+
+async def main_async(passwords, clients):
+    zxcvbn.password_strength(passwords[0])
+    print('%d passwords, %d clients' % (len(passwords), clients))
+    print('%10s %8s %14s %12s %12s %12s' % ('executor', 'workers', 'passwords/s', 'lag p50 ms',
+                                             'lag p99 ms', 'lag max ms'))
+    expected, elapsed, lags = await run(blocking, passwords, clients)
+    for executor, workers in [(None, None), ('thread', 1), ('thread', 4), ('process', 1), ('process', 2)]:
+        if executor is None:
+            scorer, score = None, blocking
+        else:
+            scorer = zxcvbn.aio.AsyncScorer(executor, workers)
+            score = lambda password: scorer.password_strength(password, fields=FIELDS)
+        results, elapsed, lags = await run(score, passwords, clients)
+        assert results == expected, executor
+        print('%10s %8s %14.0f %12.2f %12.2f %12.2f' % (
+            executor or 'blocking', workers or '', len(passwords) / elapsed, percentile(lags, 0.5) * 1e3,
+            percentile(lags, 0.99) * 1e3, max(lags) * 1e3))
+        if scorer is not None:
+            scorer.close()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    clients = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+    asyncio.run(main_async(make_passwords(count, random.Random(0)), clients))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+Throughput of password_strength_many against calling password_strength in a loop,
+in passwords per second, over an audit-like mix of passwords with repeats, with
+and without the table of common passwords; checks both give the same results.
+
+    python benchmarks/bench_batch.py [count]
+"""
+import json
+import random
+import sys
+import time
+
+import zxcvbn
+from zxcvbn import matching
+
+WORDS = ['love', 'pass', 'monkey', 'dragon', 'sunshine', 'princess', 'football', 'michael',
+         'qwerty', 'shadow', 'master', 'summer', 'iloveyou', 'welcome', 'jordan', 'hunter']
+SUFFIXES = ['', '1', '12', '123', '!', '2016', '1990', '007', 'abc']
+CHUNKSIZES = [64, 256, 1024]
+
+
+def make_passwords(count, rng):
+    common = list(matching.load_ranked_dictionary('passwords'))[:2000]
+    passwords = []
+    for _ in range(count):
+        kind = rng.random()
+        if kind < 0.3:
+            # common passwords repeat, heavily skewed towards the top of the list.
+            password = common[int(rng.paretovariate(1.2)) % len(common)]
+        elif kind < 0.8:
+            password = rng.choice(WORDS) + rng.choice(SUFFIXES) + rng.choice(WORDS)[:rng.randint(0, 4)]
+            if rng.random() < 0.3:
+                password = password.capitalize()
+        else:
+            password = ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz0123456789!@#')
+                               for _ in range(rng.randint(8, 14)))
+        passwords.append(password)
+    return passwords
+
+
+def comparable(result):
+    return json.dumps(dict(result, calc_time=None))
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    passwords = make_passwords(count, random.Random(0))
+    print('%d passwords, %d distinct' % (len(passwords), len(set(passwords))))
+    print('%8s %12s %14s %10s' % ('table', 'chunksize', 'passwords/s', 'speedup'))
+    for use_table in (True, False):
+        estimator = zxcvbn.Estimator()
+        estimator.common_results = use_table
+        sample = passwords[:2000]
+        assert [comparable(r) for r in estimator.password_strength_many(sample, chunksize=128)] == \
+                [comparable(estimator.password_strength(p)) for p in sample]
+        start = time.time()
+        for password in passwords:
+            estimator.password_strength(password)
+        loop = len(passwords) / (time.time() - start)
+        print('%8s %12s %14.0f %10s' % (use_table, 'loop', loop, ''))
+        for chunksize in CHUNKSIZES:
+            start = time.time()
+            for _ in estimator.password_strength_many(passwords, chunksize=chunksize):
+                pass
+            many = len(passwords) / (time.time() - start)
+            print('%8s %12d %14.0f %9.1fx' % (use_table, chunksize, many, many / loop))
+
+
+if __name__ == '__main__':
+    main()
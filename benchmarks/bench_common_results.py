@@ -0,0 +1,54 @@
+"""
+Checks every entry of the precomputed common-password table against the live engine,
+then times password_strength on those passwords with and without the table, and the
+table's one-off load.
+
+    python benchmarks/bench_common_results.py
+"""
+import json
+import sys
+import time
+import timeit
+
+import zxcvbn.common_results
+from zxcvbn.main import Estimator
+
+SAMPLE = 2000
+
+
+def comparable(result):
+    result = dict(result)
+    result.pop('calc_time', None)
+    # json keeps key order, so this also checks matches are rebuilt in the same order.
+    return json.dumps(result)
+
+
+def main():
+    start = time.time()
+    table = zxcvbn.common_results.load_table()
+    load = time.time() - start
+    if table is None:
+        sys.exit('the table is missing or out of date: run scripts/build_common_results.py')
+    passwords = sorted(table[1])
+
+    live = Estimator()
+    live.common_results = False
+    cached = Estimator()
+    for password in passwords:
+        assert comparable(cached.password_strength(password)) == \
+                comparable(live.password_strength(password)), password
+        assert zxcvbn.common_results.lookup_score(password)[1] == \
+                live.password_strength(password)['score'], password
+    print('%d table entries match the engine; table loaded in %.1f ms' % (len(passwords), load * 1000))
+
+    sample = passwords[::max(1, len(passwords) // SAMPLE)]
+    hit = min(timeit.repeat(lambda: [cached.password_strength(p) for p in sample],
+                            number=1, repeat=5)) / len(sample) * 1e6
+    full = min(timeit.repeat(lambda: [live.password_strength(p) for p in sample],
+                             number=1, repeat=5)) / len(sample) * 1e6
+    print('password_strength per common password: table %.1f us, engine %.1f us (%.1fx)'
+          % (hit, full, full / hit))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+Times date_match against the original every-window implementation, on
+digit-heavy passwords, passwords with separated dates and passwords with no
+digits at all.
+
+    python benchmarks/bench_date_match.py
+"""
+import random
+import re
+import timeit
+
+from zxcvbn import matching, scoring
+
+LENGTHS = [8, 16, 32, 64]
+SAMPLES = 200
+
+
+def window_date_match(password):
+    # the original date_match: every 4-8 and 6-10 character window, and a pairwise submatch filter.
+    matches = []
+    maybe_date_with_separator = re.compile(r'''
+      ^
+      ( \d{1,4} )    # day, month, year
+      ( [\s/\\_.-] ) # separator
+      ( \d{1,2} )    # day, month
+      \2             # same separator
+      ( \d{1,4} )    # day, month, year
+      $
+    ''', re.VERBOSE)
+    for i in range(0, len(password) - 3):
+        candidates = []
+        for j in range(i + 4, min(i + 9, len(password) + 1)):
+            token = password[i:j]
+            if not token.isdigit():
+                continue
+            for k, l in matching.DATE_SPLITS[len(token)]:
+                dmy = matching.map_ints_to_dmy((int(token[:k]), int(token[k:l]), int(token[l:])))
+                if dmy:
+                    candidates.append(dmy)
+            if not len(candidates):
+                continue
+            best_candidate = candidates[0]
+            metric = lambda candidate: abs(candidate['year'] - scoring.REFERENCE_YEAR)
+            min_distance = metric(candidates[0])
+            for candidate in candidates[1:]:
+                distance = metric(candidate)
+                if distance < min_distance:
+                    best_candidate, min_distance = candidate, distance
+            matches.append(dict(pattern='date', token=token, i=i, j=j-1, separator='',
+                                year=best_candidate['year'], month=best_candidate['month'],
+                                day=best_candidate['day']))
+    for i in range(0, len(password) - 5):
+        for j in range(i + 6, min(i + 11, len(password) + 1)):
+            token = password[i:j]
+            rx_match = maybe_date_with_separator.search(token)
+            if not rx_match:
+                continue
+            dmy = matching.map_ints_to_dmy((int(rx_match.group(1)), int(rx_match.group(3)),
+                                            int(rx_match.group(4))))
+            if not dmy:
+                continue
+            matches.append(dict(pattern='date', token=token, i=i, j=j-1, separator=rx_match.group(2),
+                                year=dmy['year'], month=dmy['month'], day=dmy['day']))
+
+    def is_submatch(match):
+        for other_match in matches:
+            if match == other_match:
+                continue
+            if other_match['i'] <= match['i'] and other_match['j'] >= match['j']:
+                return True
+        return False
+    return [match for match in matches if not is_submatch(match)]
+
+
+def digits(length, rng):
+    return ''.join(rng.choice('0123456789') for _ in range(length))
+
+
+def separated(length, rng):
+    password = ''
+    while len(password) < length:
+        sep = rng.choice('/-._ ')
+        password += rng.choice(['', 'x', 'pw']) + sep.join(
+            [str(rng.randint(1, 31)), str(rng.randint(1, 12)), str(rng.choice([rng.randint(0, 99), rng.randint(1950, 2020)]))])
+    return password[:length]
+
+
+def letters(length, rng):
+    return ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz!.- ') for _ in range(length))
+
+
+def main():
+    rng = random.Random(0)
+    print('%-10s %6s %14s %14s %8s' % ('input', 'length', 'runs (us)', 'windows (us)', 'speedup'))
+    for label, make in [('digits', digits), ('separated', separated), ('letters', letters)]:
+        for length in LENGTHS:
+            passwords = [make(length, rng) for _ in range(SAMPLES)]
+            for password in passwords:
+                assert matching.date_match(password) == window_date_match(password), password
+            runs = min(timeit.repeat(lambda: [matching.date_match(p) for p in passwords],
+                                     number=1, repeat=5)) / SAMPLES * 1e6
+            windows = min(timeit.repeat(lambda: [window_date_match(p) for p in passwords],
+                                        number=1, repeat=5)) / SAMPLES * 1e6
+            print('%-10s %6d %14.1f %14.1f %7.1fx' % (label, length, runs, windows, windows / runs))
+
+
+if __name__ == '__main__':
+    main()
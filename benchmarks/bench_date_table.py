@@ -0,0 +1,70 @@
+"""
+Times the separator-free date reading of numeric tokens (years, birthdays, PINs):
+map_digits_to_dmy's table and LRU lookups against working each one out from
+DATE_SPLITS, with DATE_CACHE's hit rate; then the time date_match takes on digit
+runs, as every password with a date or number gets them, with and without the cache.
+DATE_CACHE is off by default; it is turned on here.
+
+    python benchmarks/bench_date_table.py
+"""
+import random
+import timeit
+
+from zxcvbn import matching
+
+SAMPLES = 20000
+
+
+def years_and_pins(rng):
+    return [str(rng.randint(1950, 2015)) if rng.random() < 0.6 else '%04d' % rng.randint(0, 9999)
+            for _ in range(SAMPLES)]
+
+
+def birthdays(rng):
+    # an audit's worth of users: a few thousand distinct birthdays, each seen several times.
+    population = ['%02d%02d%d' % (rng.randint(1, 28), rng.randint(1, 12), rng.randint(1950, 2005))
+                  for _ in range(3000)]
+    return [rng.choice(population) for _ in range(SAMPLES)]
+
+
+def random_digits(rng):
+    return ['%0*d' % (length, rng.randint(0, 10 ** length - 1))
+            for length in [rng.randint(5, 8) for _ in range(SAMPLES)]]
+
+
+def main():
+    rng = random.Random(0)
+    matching.DATE_CACHE.resize(8192)
+    print('%-28s %14s %14s %8s %10s' % ('tokens', 'computed (us)', 'lookup (us)', 'speedup', 'hit rate'))
+    for label, make in [('years and pins (table)', years_and_pins),
+                        ('birthdays (cache)', birthdays),
+                        ('random 5-8 digits (misses)', random_digits)]:
+        tokens = make(rng)
+        for token in tokens:
+            assert matching.map_digits_to_dmy(token) == matching._map_digits_to_dmy(token), token
+        matching.DATE_CACHE.clear()
+        computed = min(timeit.repeat(lambda: [matching._map_digits_to_dmy(t) for t in tokens],
+                                     number=1, repeat=5)) / SAMPLES * 1e6
+        looked_up = min(timeit.repeat(lambda: [matching.map_digits_to_dmy(t) for t in tokens],
+                                      number=1, repeat=5)) / SAMPLES * 1e6
+        info = matching.DATE_CACHE.info()
+        hit_rate = info['hits'] / max(info['hits'] + info['misses'], 1)
+        print('%-28s %14.2f %14.2f %7.1fx %9.0f%%'
+              % (label, computed, looked_up, computed / looked_up, 100 * hit_rate))
+
+    # phone numbers, card and account numbers: each is read at every offset and length.
+    runs = ['%0*d' % (length, rng.randint(0, 10 ** length - 1)) for length in [rng.randint(8, 16)
+                                                                                for _ in range(SAMPLES // 10)]]
+    runs += [rng.choice(runs) for _ in range(len(runs))]
+    times = []
+    for maxsize in (0, 8192):
+        matching.DATE_CACHE.resize(maxsize)
+        matching.DATE_CACHE.clear()
+        times.append(min(timeit.repeat(lambda: [matching.date_match(run) for run in runs],
+                                       number=1, repeat=3)) / len(runs) * 1e6)
+    print('date_match on digit runs, half repeated: %.1f us without the cache, %.1f us with it'
+          % tuple(times))
+
+
+if __name__ == '__main__':
+    main()
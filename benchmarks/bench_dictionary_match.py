@@ -0,0 +1,89 @@
+"""
+Times dictionary_match against the per-dictionary substring scan it replaced,
+for passwords of growing length built from dictionary words; then times the
+single-pass forward + reversed matcher against rescanning the reversed password,
+over tests.txt.
+
+    python benchmarks/bench_dictionary_match.py
+"""
+import os
+import random
+import timeit
+
+from zxcvbn import matching
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'tests.txt')
+LENGTHS = [8, 16, 32, 64, 128]
+SAMPLES = 50
+
+
+def substring_scan(password, _ranked_dictionaries={}):
+    # the original O(n^2 * dictionaries) implementation over plain dicts, kept as a reference.
+    if not _ranked_dictionaries:
+        _ranked_dictionaries.update((name, dict(ranked_dict.items()))
+                                    for name, ranked_dict in matching.RANKED_DICTIONARIES.items())
+    matches = []
+    pw_lower = password.lower()
+    for dict_name, ranked_dict in _ranked_dictionaries.items():
+        for i in range(0, len(password)):
+            for j in range(i, len(password)):
+                word = pw_lower[i:j+1]
+                if word in ranked_dict:
+                    matches.append((i, j, dict_name, ranked_dict[word]))
+    return matches
+
+
+def reversed_rescan(password):
+    # the original reversed_dictionary_match: a second full pass over password[::-1].
+    matches = matching.dictionary_match(password[::-1])
+    for match in matches:
+        match['token'] = match['token'][::-1]
+        match['reversed'] = True
+        match['i'], match['j'] = len(password) - 1 - match['j'], len(password) - 1 - match['i']
+    return matches
+
+
+def make_passwords(length, rng):
+    words = [word for ranked_dict in matching.RANKED_DICTIONARIES.values()
+             for word in list(ranked_dict)[:2000]]
+    passwords = []
+    for _ in range(SAMPLES):
+        password = ''
+        while len(password) < length:
+            password += rng.choice(words) + rng.choice(['', '1', '!', '2016'])
+        passwords.append(password[:length])
+    return passwords
+
+
+def main():
+    rng = random.Random(0)
+    matching.dictionary_match('warmup')  # map the tables outside the timings
+    print('%6s %14s %14s %8s' % ('length', 'trie (us)', 'scan (us)', 'speedup'))
+    for length in LENGTHS:
+        passwords = make_passwords(length, rng)
+        for password in passwords:
+            found = sorted((m['i'], m['j'], m['dictionary_name'], m['rank'])
+                           for m in matching.dictionary_match(password))
+            assert found == sorted(substring_scan(password)), password
+        trie = min(timeit.repeat(lambda: [matching.dictionary_match(p) for p in passwords],
+                                 number=1, repeat=5)) / SAMPLES * 1e6
+        scan = min(timeit.repeat(lambda: [substring_scan(p) for p in passwords],
+                                 number=1, repeat=5)) / SAMPLES * 1e6
+        print('%6d %14.1f %14.1f %7.1fx' % (length, trie, scan, scan / trie))
+
+    with open(CORPUS) as f:
+        corpus = [line.strip() for line in f if line.strip()]
+    corpus += make_passwords(32, rng)
+    for password in corpus:
+        assert matching.forward_and_reversed_dictionary_match(password) == \
+                matching.dictionary_match(password) + reversed_rescan(password), password
+    single = min(timeit.repeat(lambda: [matching.forward_and_reversed_dictionary_match(p) for p in corpus],
+                               number=1, repeat=5))
+    rescan = min(timeit.repeat(lambda: [matching.dictionary_match(p) + reversed_rescan(p) for p in corpus],
+                               number=1, repeat=5))
+    print('\nforward + reversed over %d passwords: single pass %.1f ms, rescan %.1f ms (%.0f%% saved)'
+          % (len(corpus), single * 1000, rescan * 1000, 100 * (1 - single / rescan)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Compares password_strength calls that only read the score with calls that read the
+feedback and crack time strings too (what every call paid for before they were lazy),
+in time and in peak traced memory per call; also counts the match dicts each call
+allocates.
+
+    python benchmarks/bench_feedback.py [locale]
+"""
+import os
+import random
+import string
+import sys
+import timeit
+import tracemalloc
+
+import zxcvbn
+import zxcvbn.common_results
+from zxcvbn import matching
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'tests.txt')
+RANDOM = 300
+
+
+def make_passwords(rng):
+    with open(CORPUS) as f:
+        passwords = [line.strip() for line in f if line.strip()]
+    passwords += [''.join(rng.choice(string.ascii_letters + string.digits) for _ in range(rng.randint(6, 16)))
+                  for _ in range(RANDOM)]
+    return passwords
+
+
+def score_only(estimator, password, locale):
+    return estimator.password_strength(password, locale=locale)['score'] if password else 0
+
+
+def full(estimator, password, locale):
+    result = estimator.password_strength(password, locale=locale)
+    return result.get('score'), result.get('crack_times_display'), result['feedback']
+
+
+def peak_kib(f, estimator, passwords, locale):
+    tracemalloc.start()
+    peaks = []
+    for password in passwords:
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        f(estimator, password, locale)
+        peaks.append(tracemalloc.get_traced_memory()[1] - before)
+    tracemalloc.stop()
+    return sum(peaks) / len(peaks) / 1024
+
+
+def count_dicts(matches):
+    return sum(1 + count_dicts(m.get('base_matches', [])) for m in matches)
+
+
+def main():
+    locale = sys.argv[1] if len(sys.argv) > 1 else None
+    rng = random.Random(0)
+    passwords = make_passwords(rng)
+    # analysed every time, and looked up in the table of common passwords, where the
+    # strings are a much larger share of the call.
+    analysed = zxcvbn.Estimator()
+    analysed.common_results = False
+    common = sorted(zxcvbn.common_results.load_table()[1])
+    cases = [('analysed', analysed, passwords),
+             ('table hits', zxcvbn.Estimator(), rng.sample(common, 1000))]
+    print('%12s %12s %14s %14s' % ('passwords', 'reads', 'per call (us)', 'peak (KiB)'))
+    for label, estimator, sample in cases:
+        for name, f in [('score only', score_only), ('everything', full)]:
+            elapsed = min(timeit.repeat(lambda: [f(estimator, p, locale) for p in sample],
+                                        number=1, repeat=7)) / len(sample) * 1e6
+            print('%12s %12s %14.1f %14.1f' % (label, name, elapsed, peak_kib(f, estimator, sample, locale)))
+    matches = [count_dicts(matching.omnimatch(p)) for p in passwords]
+    print('\nmatch dicts per analysed call: mean %.0f, max %d' % (sum(matches) / len(matches), max(matches)))
+
+
+if __name__ == '__main__':
+    main()
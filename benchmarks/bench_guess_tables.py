@@ -0,0 +1,160 @@
+"""
+Checks the memoized nCk, binomial sums, spatial counts and shared case and l33t
+variations against the loops they replaced, value and type, over a grid of arguments
+and every match found in tests.txt; then times guess estimation for those matches
+with the memoized tables against the original loops.
+
+    python benchmarks/bench_guess_tables.py
+"""
+import copy
+import os
+import timeit
+
+from zxcvbn import layouts, matching, scoring
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'tests.txt')
+
+
+def original_nCk(n, k):
+    if k > n:
+        return 0
+    if k == 0:
+        return 1
+    r = 1
+    for d in range(1, k):
+      r *= n
+      r /= d
+      n -= 1
+    return r
+
+
+def original_spatial_guesses(match):
+    layout = layouts.get_layout(match['graph'])
+    s = layout['starting_positions']
+    d = layout['average_degree']
+    guesses = 0
+    L = len(match['token'])
+    t = match['turns']
+    for i in range(2, L):
+        possible_turns = min(t, i - 1)
+        for j in range(1, possible_turns):
+            guesses += original_nCk(i - 1, j - 1) * s * (d ** j)
+    if match['shifted_count']:
+        S = match['shifted_count']
+        U = len(match['token']) - S
+        if S == 0 or U == 0:
+            guesses *= 2
+        else:
+            shifted_variations = 0
+            for i in range(1,min(S, U)):
+                shifted_variations += original_nCk(S + U, i)
+            guesses *= shifted_variations
+    return guesses
+
+
+def original_uppercase_variations(match):
+    word = match['token']
+    if scoring.ALL_LOWER.match(word) or word.lower() == word:
+        return 1
+    for regex in [scoring.START_UPPER, scoring.END_UPPER, scoring.ALL_UPPER]:
+        if regex.match(word):
+            return 2
+    U = len([chr for chr in word if chr.isupper()])
+    L = len([chr for chr in word if chr.islower()])
+    variations = 0
+    for i in range(1, min(U, L)):
+        variations += original_nCk(U + L, i)
+    return variations
+
+
+def original_l33t_variations(match):
+    if not match['l33t']:
+        return 1
+    variations = 1
+    for subbed, unsubbed in match['sub'].items():
+        chrs = match['token'].lower()
+        S = len([chr for chr in chrs if chr == subbed])
+        U = len([chr for chr in chrs if chr == unsubbed])
+        if S == 0 or U == 0:
+            variations *= 2
+        else:
+            p = min(U, S)
+            possibilities = 0
+            for i in range(1, p):
+                possibilities += original_nCk(U + S, i)
+            variations *= possibilities
+    return variations
+
+
+def original_dictionary_guesses(match, _variations=None):
+    match['base_guesses'] = match['rank']
+    match['uppercase_variations'] = original_uppercase_variations(match)
+    match['l33t_variations'] = original_l33t_variations(match)
+    reversed_variations = 2 if match['reversed'] else 1
+    match['bonus'] = 0 if match['dictionary_name'] == 'user_inputs' else 1
+    return match['base_guesses'] * match['uppercase_variations'] * match['l33t_variations'] * reversed_variations
+
+
+def same(a, b):
+    return a == b and type(a) is type(b)
+
+
+def estimate_all(cases):
+    for password, matches in cases:
+        variations = {}
+        for match in matches:
+            scoring.estimate_guesses(match, password, _variations=variations)
+
+
+def main():
+    for n in range(0, 60):
+        for k in range(0, 60):
+            assert same(scoring.nCk(n, k), original_nCk(n, k)), (n, k)
+    for name in layouts.layout_names():
+        for L in range(1, 40):
+            for t in range(1, L + 1):
+                for S in range(0, L + 1):
+                    match = dict(graph=name, token='x' * L, turns=t, shifted_count=S)
+                    assert same(scoring.spatial_guesses(match), original_spatial_guesses(match)), match
+
+    with open(CORPUS) as f:
+        passwords = [line.strip() for line in f if line.strip()]
+    # mixed case and long keyboard walks are where the variation and spatial loops run longest.
+    passwords += [p.upper() for p in passwords] + [p[::-1].title() for p in passwords]
+    passwords += [''.join(c.upper() if i % 3 else c for i, c in enumerate(p * 2)) for p in passwords]
+    passwords += ['qwertyuiop[]asdfghjkl;zxcvbnm,./', 'QweRtyUIop1qAz2wsX3EDc', '1qaz2wsx3edc4rfv5tgb']
+    cases = [(p, [dict((k, v) for k, v in m.items() if k not in ('guesses', 'guesses_log10'))
+                  for m in matching.omnimatch(p)]) for p in passwords]
+    estimated = copy.deepcopy(cases)
+    estimate_all(estimated)
+    originals = dict(scoring.ESTIMATION_FUNCTIONS, dictionary=original_dictionary_guesses,
+                     spatial=lambda match, _variations=None: original_spatial_guesses(match))
+    functions = scoring.ESTIMATION_FUNCTIONS
+    reference = copy.deepcopy(cases)
+    scoring.ESTIMATION_FUNCTIONS = originals
+    try:
+        estimate_all(reference)
+    finally:
+        scoring.ESTIMATION_FUNCTIONS = functions
+    for (password, matches), (_, expected) in zip(estimated, reference):
+        for match, expected_match in zip(matches, expected):
+            for key in ('guesses', 'uppercase_variations', 'l33t_variations'):
+                assert same(match.get(key), expected_match.get(key)), (password, match)
+    print('%d passwords, %d matches: estimates identical' % (len(cases), sum(len(m) for _, m in cases)))
+
+    def timed(estimation_functions):
+        copies = [copy.deepcopy(cases) for _ in range(5)]
+        scoring.ESTIMATION_FUNCTIONS = estimation_functions
+        try:
+            return min(timeit.timeit(lambda: estimate_all(c), number=1) for c in copies)
+        finally:
+            scoring.ESTIMATION_FUNCTIONS = functions
+
+    tables = timed(functions)
+    loops = timed(originals)
+    print('estimate_guesses over all matches: tables %.1f ms, loops %.1f ms (%.1fx)'
+          % (tables * 1000, loops * 1000, loops / tables))
+
+
+if __name__ == '__main__':
+    main()
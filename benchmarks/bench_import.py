@@ -0,0 +1,64 @@
+"""
+Import-time regression benchmark: median wall time of `import zxcvbn` in fresh
+interpreters, of the first password_strength call, which pays for loading the
+dictionaries and adjacency graphs, and of the two together, which is what a
+short-lived process pays. Other checkouts given (e.g. a git worktree of an older
+commit) are measured alongside.
+
+    python benchmarks/bench_import.py [--budget MS] [checkout ...]
+
+With --budget, exits non-zero when the median of import + first call takes longer
+than MS.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+
+PROBE = r'''
+import time
+start = time.perf_counter()
+import zxcvbn
+imported = time.perf_counter()
+zxcvbn.password_strength('correcthorsebatterystaple')
+print(imported - start, time.perf_counter() - imported)
+'''
+
+
+def measure(path, runs):
+    """ Sorted (import, first call, total) times in ms over runs fresh interpreters. """
+    imports, first_calls, totals = [], [], []
+    for _ in range(runs):
+        out = subprocess.check_output([sys.executable, '-c', PROBE], cwd=path,
+                                      env=dict(os.environ, PYTHONPATH=path))
+        import_time, first_call = [float(x) * 1000 for x in out.split()]
+        imports.append(import_time)
+        first_calls.append(first_call)
+        totals.append(import_time + first_call)
+    return sorted(imports), sorted(first_calls), sorted(totals)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=11)
+    parser.add_argument('--budget', type=float, help='maximum median import + first call time, in ms')
+    parser.add_argument('checkouts', nargs='*', help='other trees to measure, e.g. older worktrees')
+    args = parser.parse_args()
+
+    print('%-12s %16s %16s %16s' % ('', 'import (ms)', 'first call (ms)', 'total (ms)'))
+    total = None
+    for path in args.checkouts + [ROOT]:
+        label = 'this tree' if path == ROOT else os.path.basename(os.path.abspath(path))
+        measured = measure(os.path.abspath(path), args.runs)
+        print('%-12s %s' % (label[:12], ' '.join('%7.1f (min %5.1f)' % (times[len(times) // 2], times[0])
+                                                for times in measured)))
+        total = measured[2][len(measured[2]) // 2]
+    if args.budget is not None and total > args.budget:
+        print('import + first call over budget of %.1f ms' % args.budget)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Times l33t_match against the translate-and-rematch approach it replaced, which
+reran dictionary_match once per substitution map, on symbol-heavy passwords.
+
+    python benchmarks/bench_l33t_match.py
+"""
+import timeit
+
+from zxcvbn import matching
+
+PASSWORDS = [
+    'p4$$w0rd',
+    'Tr0ub4dour&3',
+    '1|!7$5@4',
+    '71(<!98{',
+    '+!77|3$5@8(',
+    '1|!7$5@4' * 4,
+    '4@8({[<3691!|70$5+%2' * 2,
+    'b4$k3+b4ll|!7713c0c4c0l4' * 2,
+]
+
+
+def enumerate_l33t_subs_with_duplicates(table):
+    # enumerate_l33t_subs as it was, with a dedup step that never removed anything.
+    subs = [[]]
+    for first_key in table:
+        next_subs = []
+        for l33t_chr in table[first_key]:
+            for sub in subs:
+                dup = [k for k, (subbed, _) in enumerate(sub) if subbed == l33t_chr]
+                if not dup:
+                    next_subs.append(sub + [(l33t_chr, first_key)])
+                else:
+                    alternative = list(sub)
+                    alternative.pop(dup[0])
+                    alternative.append((l33t_chr, first_key))
+                    next_subs.append(sub)
+                    next_subs.append(alternative)
+        subs = next_subs
+    return [dict(sub) for sub in subs]
+
+
+def translate_and_rematch(password):
+    # the original l33t_match: one full dictionary_match per substitution map.
+    matches = []
+    for sub in enumerate_l33t_subs_with_duplicates(matching.relevant_l33t_subtable(password)):
+        if len(sub) == 0:
+            break
+        for match in matching.dictionary_match(matching.translate(password, sub)):
+            token = password[match['i']:match['j'] + 1]
+            if token.lower() == match['matched_word']:
+                continue
+            match_sub = dict((k, v) for k, v in sub.items() if k in token)
+            matches.append((match['i'], match['j'], match['matched_word'], match['dictionary_name'],
+                            ', '.join(['%s -> %s' % (k, v) for k, v in match_sub.items()])))
+    return [match for match in matches if match[1] > match[0]]
+
+
+def main():
+    matching.dictionary_match('warmup')  # compile the index outside the timings
+    print('%-50s %6s %12s %12s' % ('password', 'maps', 'walk (ms)', 'rematch (ms)'))
+    for password in PASSWORDS:
+        found = set((m['i'], m['j'], m['matched_word'], m['dictionary_name'], m['sub_display'])
+                    for m in matching.l33t_match(password))
+        assert found == set(translate_and_rematch(password)), password
+        maps = len(enumerate_l33t_subs_with_duplicates(matching.relevant_l33t_subtable(password)))
+        walk = min(timeit.repeat(lambda: matching.l33t_match(password), number=1, repeat=5))
+        rematch = min(timeit.repeat(lambda: translate_and_rematch(password), number=1, repeat=3))
+        print('%-50s %6d %12.2f %12.2f' % (password, maps, walk * 1000, rematch * 1000))
+
+
+if __name__ == '__main__':
+    main()
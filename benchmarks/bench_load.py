@@ -0,0 +1,73 @@
+"""
+Compares load time and memory of the mapped binary frequency tables with the
+json fallback, and with any other checkouts given (e.g. a git worktree of an older
+commit). Each measurement runs in a fresh interpreter; the json case runs against a
+copy of the package with generated/frequency_lists.bin removed.
+
+    python benchmarks/bench_load.py [checkout ...]
+"""
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+PACKAGE = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'zxcvbn')
+RUNS = 5
+
+PROBE = r'''
+import time
+start = time.time()
+import zxcvbn
+import zxcvbn.matching
+elapsed = time.time() - start
+
+def status():
+    fields = {}
+    with open('/proc/self/status') as f:
+        for line in f:
+            key, _, value = line.partition(':')
+            if key in ('VmRSS', 'RssAnon', 'RssFile'):
+                fields[key] = int(value.split()[0]) / 1024.0
+    return fields
+
+start = time.time()
+zxcvbn.matching.RANKED_DICTIONARIES
+elapsed += time.time() - start
+imported = status()
+zxcvbn.password_strength('correcthorsebatterystaple')
+scored = status()
+print(elapsed, imported['RssAnon'], imported['RssFile'], scored['RssAnon'], scored['RssFile'])
+'''
+
+
+def measure(path):
+    samples = []
+    for _ in range(RUNS):
+        out = subprocess.check_output([sys.executable, '-c', PROBE], cwd=path,
+                                      env=dict(os.environ, PYTHONPATH=path))
+        samples.append([float(x) for x in out.split()])
+    samples.sort()
+    return samples[len(samples) // 2]
+
+
+def main():
+    if not os.path.exists('/proc/self/status'):
+        print('needs /proc/self/status (linux)')
+        return
+    tmp = tempfile.mkdtemp()
+    try:
+        shutil.copytree(PACKAGE, os.path.join(tmp, 'zxcvbn'))
+        os.remove(os.path.join(tmp, 'zxcvbn', 'generated', 'frequency_lists.bin'))
+        print('%-8s %12s %22s %22s' % ('', 'load (ms)', 'after load anon/file', 'after score anon/file'))
+        checkouts = [(os.path.basename(os.path.abspath(path)), path) for path in sys.argv[1:]]
+        for label, path in checkouts + [('json', tmp), ('binary', os.path.dirname(PACKAGE))]:
+            elapsed, anon, mapped, scored_anon, scored_mapped = measure(path)
+            print('%-8s %12.1f %13.1f / %4.1f MB %13.1f / %4.1f MB'
+                  % (label[:8], elapsed * 1000, anon, mapped, scored_anon, scored_mapped))
+    finally:
+        shutil.rmtree(tmp)
+
+
+if __name__ == '__main__':
+    main()
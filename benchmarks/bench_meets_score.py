@@ -0,0 +1,67 @@
+"""
+Times meets_score against password_strength(...)['score'] >= min_score, separately for
+the passwords each accepts and rejects, over tests.txt and random passwords, after
+checking that both always agree.
+
+    python benchmarks/bench_meets_score.py [min_score]
+"""
+import os
+import random
+import string
+import sys
+import timeit
+
+import zxcvbn
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'tests.txt')
+RANDOM = 500
+REPEAT = 5
+
+
+def full_call(password, min_score):
+    return zxcvbn.password_strength(password).get('score', 0) >= min_score
+
+
+def make_passwords(rng):
+    with open(CORPUS) as f:
+        passwords = [line.strip() for line in f if line.strip()]
+    words = [p for p in passwords if p.isalpha()]
+    for _ in range(RANDOM):
+        kind = rng.random()
+        if kind < 0.4:
+            password = rng.choice(words) + str(rng.randint(0, 9999))
+        elif kind < 0.7:
+            password = ''.join(rng.choice(string.ascii_letters + string.digits + '!@#$')
+                               for _ in range(rng.randint(6, 20)))
+        else:
+            password = ' '.join(rng.choice(words) for _ in range(rng.randint(1, 4)))
+        passwords.append(password)
+    return passwords
+
+
+def per_call(f, passwords, min_score):
+    if not passwords:
+        return float('nan')
+    return min(timeit.repeat(lambda: [f(p, min_score) for p in passwords],
+                             number=1, repeat=REPEAT)) / len(passwords) * 1e6
+
+
+def main():
+    passwords = make_passwords(random.Random(0))
+    scores = [int(sys.argv[1])] if len(sys.argv) > 1 else [1, 2, 3, 4]
+    print('%5s %9s %9s %14s %14s %8s' % ('score', 'outcome', 'passwords', 'meets (us)', 'full (us)', 'speedup'))
+    for min_score in scores:
+        outcomes = {True: [], False: []}
+        for password in passwords:
+            expected = full_call(password, min_score)
+            assert zxcvbn.meets_score(password, min_score) == expected, (password, min_score)
+            outcomes[expected].append(password)
+        for outcome, label in [(True, 'accept'), (False, 'reject')]:
+            meets = per_call(zxcvbn.meets_score, outcomes[outcome], min_score)
+            full = per_call(full_call, outcomes[outcome], min_score)
+            print('%5d %9s %9d %14.1f %14.1f %7.1fx' % (min_score, label, len(outcomes[outcome]),
+                                                        meets, full, full / meets))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+Scaling of password_strength_parallel from 1 to N workers (default: the cpu count,
+and twice that), in passwords per second against a single-process
+password_strength_many, with each worker's memory at the end of the run: RSS, and
+the private dirty pages it no longer shares with the parent. The largest run is
+repeated without gc.freeze for comparison. Linux only (reads /proc).
+
+    python benchmarks/bench_parallel.py [count] [max_workers]
+"""
+import json
+import os
+import random
+import string
+import sys
+import time
+
+import zxcvbn
+import zxcvbn.parallel
+
+
+def make_passwords(count, rng):
+    words = ['love', 'pass', 'monkey', 'dragon', 'sunshine', 'qwerty', 'shadow', 'summer']
+    return [rng.choice(words) + ''.join(rng.choice(string.ascii_letters + string.digits)
+                                        for _ in range(rng.randint(2, 10)))
+            for _ in range(count)]
+
+
+def memory_kib(pid):
+    fields = {}
+    with open('/proc/%d/smaps_rollup' % pid) as f:
+        for line in f:
+            key, _, value = line.partition(':')
+            if key in ('Rss', 'Private_Dirty'):
+                fields[key] = int(value.split()[0])
+    return fields
+
+
+def children():
+    pids = []
+    for entry in os.listdir('/proc'):
+        if entry.isdigit():
+            try:
+                with open('/proc/%s/stat' % entry) as f:
+                    stat = f.read()
+            except IOError:
+                continue
+            if int(stat.rsplit(')', 1)[1].split()[1]) == os.getpid():
+                pids.append(int(entry))
+    return pids
+
+
+def run(passwords, workers, freeze):
+    start = time.time()
+    results = []
+    memory = []
+    for k, result in enumerate(zxcvbn.parallel.password_strength_parallel(
+            passwords, workers=workers, chunksize=128, _freeze=freeze)):
+        results.append(result)
+        if k == len(passwords) - 1:
+            # the pool is still up until the generator finishes.
+            memory = [memory_kib(pid) for pid in children()]
+    return results, len(passwords) / (time.time() - start), memory
+
+
+def comparable(result):
+    return json.dumps(dict(result, calc_time=None))
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 8000
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else 2 * (os.cpu_count() or 1)
+    passwords = make_passwords(count, random.Random(0))
+
+    zxcvbn.parallel.prepare()
+    start = time.time()
+    serial = list(zxcvbn.password_strength_many(passwords))
+    baseline = count / (time.time() - start)
+    parent = memory_kib(os.getpid())
+    print('%d passwords on %d cpus; one process: %.0f passwords/s, RSS %.1f MiB, private dirty %.1f MiB'
+          % (count, os.cpu_count(), baseline, parent['Rss'] / 1024, parent['Private_Dirty'] / 1024))
+    print('%8s %7s %14s %8s %14s %22s' % ('workers', 'freeze', 'passwords/s', 'scaling',
+                                          'RSS (MiB)', 'private dirty (MiB)'))
+    workers = 1
+    runs = []
+    while workers <= max_workers:
+        runs.append((workers, True))
+        workers *= 2
+    runs.append((runs[-1][0], False))
+    for workers, freeze in runs:
+        results, rate, memory = run(passwords, workers, freeze)
+        assert [comparable(r) for r in results] == [comparable(r) for r in serial]
+        rss = sum(m['Rss'] for m in memory) / len(memory) / 1024
+        dirty = sum(m['Private_Dirty'] for m in memory) / len(memory) / 1024
+        print('%8d %7s %14.0f %7.2fx %14.1f %22.1f' % (workers, freeze, rate, rate / baseline, rss, dirty))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+Times omnimatch over tests.txt with the prepass preconditions on and off, and
+reports how often each matcher was skipped and how long the prepass itself takes.
+
+    python benchmarks/bench_prepass.py
+"""
+import os
+import timeit
+
+from zxcvbn import matching
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'tests.txt')
+
+
+def main():
+    with open(CORPUS) as f:
+        corpus = [line.strip() for line in f if line.strip()]
+    matching.omnimatch('warmup')
+
+    skipped = dict((matcher.__name__, 0) for matcher in matching.MATCHERS)
+    for password in corpus:
+        applicable = matching.applicable_matchers(matching.prepass(password))
+        for matcher in matching.MATCHERS:
+            if matcher not in applicable:
+                skipped[matcher.__name__] += 1
+
+    preconditions = dict(matching.MATCHER_PRECONDITIONS)
+    with_skips = min(timeit.repeat(lambda: [matching.omnimatch(p) for p in corpus],
+                                   number=5, repeat=5)) / 5
+    matching.MATCHER_PRECONDITIONS.clear()
+    try:
+        without = min(timeit.repeat(lambda: [matching.omnimatch(p) for p in corpus],
+                                    number=5, repeat=5)) / 5
+    finally:
+        matching.MATCHER_PRECONDITIONS.update(preconditions)
+    view = min(timeit.repeat(lambda: [matching.prepass(p) for p in corpus],
+                             number=5, repeat=5)) / 5
+
+    n = len(corpus)
+    print('omnimatch over %d passwords: %.1f us with preconditions, %.1f us running every matcher'
+          % (n, with_skips / n * 1e6, without / n * 1e6))
+    print('prepass: %.1f us per password' % (view / n * 1e6))
+    for name, count in skipped.items():
+        print('  %-40s skipped for %5.1f%%' % (name, 100.0 * count / n))
+
+
+if __name__ == '__main__':
+    main()
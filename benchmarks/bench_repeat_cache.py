@@ -0,0 +1,47 @@
+"""
+Times repeat_match, and the whole password_strength call, over repeat-heavy passwords
+with the base token cache off and on, and prints the cache's size and hit rate.
+
+    python benchmarks/bench_repeat_cache.py
+"""
+import random
+import timeit
+
+import zxcvbn
+from zxcvbn import matching
+
+SAMPLES = 2000
+BASES = ['abc', 'qwe', 'pass', 'love', '123', 'x9!', 'hello', 'abc123', 'aa', 'zz', 'monkey', 'dragon']
+
+
+def make_passwords(rng):
+    passwords = []
+    for _ in range(SAMPLES):
+        base = rng.choice(BASES)
+        password = base * rng.randint(2, 5)
+        if rng.random() < 0.5:
+            password += rng.choice(['', '1', '!', '2016']) + rng.choice(BASES) * 2
+        passwords.append(password)
+    return passwords
+
+
+def main():
+    rng = random.Random(0)
+    passwords = make_passwords(rng)
+    zxcvbn.password_strength('warmup')
+
+    maxsize = matching.REPEAT_CACHE.store.maxsize
+    print('%-20s %14s %14s %8s' % ('%d passwords' % len(passwords), 'uncached (ms)', 'cached (ms)', 'speedup'))
+    for label, func in [('repeat_match', matching.repeat_match),
+                        ('password_strength', zxcvbn.password_strength)]:
+        matching.REPEAT_CACHE.store.resize(0)
+        uncached = min(timeit.repeat(lambda: [func(p) for p in passwords], number=1, repeat=3))
+        matching.REPEAT_CACHE.store.resize(maxsize)
+        matching.REPEAT_CACHE.clear()
+        cached = min(timeit.repeat(lambda: [func(p) for p in passwords], number=1, repeat=3))
+        print('%-20s %14.1f %14.1f %7.1fx' % (label, uncached * 1000, cached * 1000, uncached / cached))
+    print('cache: %s' % matching.REPEAT_CACHE.info())
+
+
+if __name__ == '__main__':
+    main()
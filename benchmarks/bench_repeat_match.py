@@ -0,0 +1,87 @@
+"""
+Scaling benchmark for repeat detection: the run-based engine against the backtracking
+regexes, for passwords of 16 to 1024 characters. _find_repeats uses the regexes below
+matching.REPEAT_RUNS_LENGTH characters and the runs from there; the last column says
+which. Only detection is timed; scoring the base tokens is the same for both.
+
+    python benchmarks/bench_repeat_match.py
+"""
+import random
+import re
+import timeit
+
+from zxcvbn import matching
+
+LENGTHS = [16, 32, 64, 128, 256, 512, 1024]
+SAMPLES = 10
+
+greedy = re.compile(r'(.+)\1+')
+lazy = re.compile(r'(.+?)\1+')
+lazy_anchored = re.compile(r'^(.+?)\1+$')
+
+
+def regex_repeats(password):
+    # the original repeat_match loop, without the base token analysis.
+    result = []
+    last_index = 0
+    while last_index < len(password):
+        greedy_match = greedy.search(password[last_index:])
+        lazy_match = lazy.search(password[last_index:])
+        if not greedy_match:
+            break
+        if len(greedy_match.group(0)) > len(lazy_match.group(0)):
+            match = greedy_match
+            base_token = lazy_anchored.search(match.group(0)).group(1)
+        else:
+            match = lazy_match
+            base_token = match.group(1)
+        i, j = match.span(0)
+        i += last_index
+        j += last_index - 1
+        result.append((i, j, match.group(0), base_token))
+        last_index = j + 1
+    return result
+
+
+def random_text(length, rng):
+    return ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz0123456789') for _ in range(length))
+
+
+def near_repeat(length, rng):
+    # a long block repeated with one character changed per copy: every regex attempt
+    # nearly succeeds, which is where backtracking goes super-linear.
+    block = random_text(max(length // 4, 2), rng)
+    password = ''
+    while len(password) < length:
+        k = rng.randrange(len(block))
+        password += block[:k] + '#' + block[k+1:]
+    return password[:length]
+
+
+def repeats(length, rng):
+    password = ''
+    while len(password) < length:
+        password += random_text(rng.randint(1, 6), rng) * rng.randint(2, 4) + random_text(3, rng)
+    return password[:length]
+
+
+def main():
+    rng = random.Random(0)
+    print('%-12s %6s %14s %14s %8s %6s' % ('input', 'length', 'runs (us)', 'regex (us)', 'speedup', 'used'))
+    for label, make in [('random', random_text), ('repeats', repeats), ('near repeat', near_repeat)]:
+        for length in LENGTHS:
+            passwords = [make(length, rng) for _ in range(SAMPLES)]
+            for password in passwords:
+                expected = regex_repeats(password)
+                assert list(matching._run_repeats(password)) == expected, password
+                assert list(matching._find_repeats(password)) == expected, password
+            runs = min(timeit.repeat(lambda: [list(matching._run_repeats(p)) for p in passwords],
+                                     number=1, repeat=3)) / SAMPLES * 1e6
+            regex = min(timeit.repeat(lambda: [list(matching._regex_repeats(p)) for p in passwords],
+                                      number=1, repeat=3)) / SAMPLES * 1e6
+            used = 'regex' if length < matching.REPEAT_RUNS_LENGTH else 'runs'
+            print('%-12s %6d %14.1f %14.1f %7.1fx %6s' % (label, length, runs, regex, regex / runs, used))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Times password_strength without a result cache, and on hits in the in-process and
+the sqlite-backed ResultCache, then re-reads the sqlite cache from a second process
+and prints both caches' metrics.
+
+    python benchmarks/bench_result_cache.py
+"""
+import json
+import multiprocessing
+import os
+import random
+import string
+import tempfile
+import timeit
+
+import zxcvbn
+from zxcvbn.result_cache import ResultCache, SQLiteStore
+
+SAMPLES = 500
+SECRET = b'bench_result_cache shared secret'
+
+
+def make_passwords(rng):
+    return [''.join(rng.choice(string.ascii_letters + string.digits) for _ in range(rng.randint(8, 16)))
+            for _ in range(SAMPLES)]
+
+
+def comparable(result):
+    return json.dumps(dict(result, calc_time=None))
+
+
+def reread(path, passwords, queue):
+    # a different process with the same secret sees the entries the first one wrote.
+    estimator = zxcvbn.Estimator(cache=ResultCache(secret=SECRET, store=SQLiteStore(path)))
+    for password in passwords:
+        estimator.password_strength(password)
+    queue.put(estimator.cache.info())
+
+
+def main():
+    passwords = make_passwords(random.Random(0))
+    plain = zxcvbn.Estimator()
+    path = os.path.join(tempfile.mkdtemp(), 'results.db')
+    cached = [('memory', zxcvbn.Estimator(cache=ResultCache(maxsize=SAMPLES, ttl=600))),
+              ('sqlite', zxcvbn.Estimator(cache=ResultCache(secret=SECRET, store=SQLiteStore(path, ttl=600))))]
+
+    def per_call(estimator):
+        return min(timeit.repeat(lambda: [estimator.password_strength(p) for p in passwords],
+                                 number=1, repeat=3)) / SAMPLES * 1e6
+
+    print('%8s %12s' % ('cache', 'per call (us)'))
+    print('%8s %12.1f' % ('none', per_call(plain)))
+    for name, estimator in cached:
+        for password in passwords:
+            assert comparable(estimator.password_strength(password)) == \
+                    comparable(plain.password_strength(password)), password
+        print('%8s %12.1f   %s' % (name, per_call(estimator), estimator.cache.info()))
+
+    stored = b''
+    for name in (path, path + '-wal'):
+        if os.path.exists(name):
+            with open(name, 'rb') as f:
+                stored += f.read()
+    assert not any(password.encode() in stored for password in passwords)
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=reread, args=(path, passwords, queue))
+    process.start()
+    print('second process: %s' % queue.get())
+    process.join()
+
+
+if __name__ == '__main__':
+    main()
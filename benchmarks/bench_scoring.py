@@ -0,0 +1,128 @@
+"""
+Times most_guessable_match_sequence against the dict-based search it replaced,
+for passwords of 8 to 128 characters, checking both pick the same sequence; then,
+for passwords of thousands of characters with a single match, its time and peak
+memory, which should stay close to linear in the length.
+
+    python benchmarks/bench_scoring.py
+"""
+import math
+import random
+import timeit
+import tracemalloc
+
+from zxcvbn import matching, scoring
+
+LENGTHS = [8, 16, 32, 64, 128]
+LONG_LENGTHS = [1000, 3000, 6000]
+SAMPLES = 20
+PIECES = ['password', 'dragon', 'qwerty', '1990', '12/25/1988', 'abcdef', 'zxcvbn', 'P@ssw0rd',
+          'monkey', 'abcabcabc', '!!', 'Sunshine', '2468', 'x7#q', 'letmein', 'asdfgh']
+
+
+def dict_search(password, matches, _exclude_additive=False):
+    # the original most_guessable_match_sequence, kept as the reference.
+    n = len(password)
+    matches_by_j = [[] for _ in range(0, n)]
+    for m in matches:
+        matches_by_j[m['j']].append(m)
+    optimal = {'m': [{} for _ in range(0, n)], 'pi': [{} for _ in range(0, n)],
+               'g': [float('inf') for _ in range(0, n)], 'l': [0 for _ in range(0, n)]}
+
+    def update(m, l):
+        k = m['j']
+        pi = scoring.estimate_guesses(m, password)
+        if l > 1:
+            pi *= optimal['pi'][m['i'] - 1][l - 1]
+        g = math.factorial(l) * pi
+        if not _exclude_additive:
+            g += scoring.MIN_GUESSES_BEFORE_GROWING_SEQUENCE ** (l - 1)
+        if g < optimal['g'][k]:
+            optimal['g'][k] = g
+            optimal['l'][k] = l
+            optimal['m'][k][l] = m
+            optimal['pi'][k][l] = pi
+
+    def bruteforce_update(k):
+        update(make_bruteforce_match(0, k), 1)
+        if k == 0:
+            return
+        for l, last_m in optimal['m'][k - 1].items():
+            if last_m['pattern'] == 'bruteforce':
+                update(make_bruteforce_match(last_m['i'], k), l)
+            else:
+                update(make_bruteforce_match(k, k), l + 1)
+
+    def make_bruteforce_match(i, j):
+        return dict(pattern='bruteforce', token=password[i:j+1], i=i, j=j)
+
+    def unwind(n):
+        optimal_match_sequence = []
+        k = n - 1
+        l = optimal['l'][k]
+        while k >= 0:
+            m = optimal['m'][k][l]
+            optimal_match_sequence.insert(0, m)
+            k = m['i'] - 1
+            l -= 1
+        return optimal_match_sequence
+
+    for k in range(0, n):
+        for m in matches_by_j[k]:
+            if m['i'] > 0:
+                for l in optimal['m'][m['i'] - 1].keys():
+                    update(m, l + 1)
+            else:
+                update(m, 1)
+        bruteforce_update(k)
+    return dict(password=password, guesses=optimal['g'][n - 1],
+                guesses_log10=math.log(optimal['g'][n - 1], 10), sequence=unwind(n))
+
+
+def make_passwords(length, rng):
+    passwords = []
+    for _ in range(SAMPLES):
+        password = ''
+        while len(password) < length:
+            password += rng.choice(PIECES) + rng.choice(['', '1', '!', '7'])
+        passwords.append(password[:length])
+    return passwords
+
+
+def main():
+    rng = random.Random(0)
+    print('%6s %8s %14s %14s %8s' % ('length', 'matches', 'arrays (us)', 'dicts (us)', 'speedup'))
+    for length in LENGTHS:
+        passwords = make_passwords(length, rng)
+        cases = [(p, matching.omnimatch(p)) for p in passwords]
+        for password, matches in cases:
+            assert scoring.most_guessable_match_sequence(password, matches) == \
+                    dict_search(password, matches), password
+        arrays = min(timeit.repeat(lambda: [scoring.most_guessable_match_sequence(p, m) for p, m in cases],
+                                   number=1, repeat=5)) / SAMPLES * 1e6
+        dicts = min(timeit.repeat(lambda: [dict_search(p, m) for p, m in cases],
+                                  number=1, repeat=5)) / SAMPLES * 1e6
+        print('%6d %8.0f %14.1f %14.1f %7.1fx' % (length, sum(len(m) for _, m in cases) / SAMPLES,
+                                                  arrays, dicts, dicts / arrays))
+
+    print()
+    print('%6s %14s %14s %14s %14s' % ('length', 'arrays (ms)', 'arrays (MB)', 'dicts (ms)', 'dicts (MB)'))
+    for length in LONG_LENGTHS:
+        password = 'password' + ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz0123456789')
+                                        for _ in range(length - 8))
+        matches = matching.dictionary_match('password')[:1]
+        row = []
+        for search in (scoring.most_guessable_match_sequence, dict_search):
+            fresh = lambda: [dict(m) for m in matches]
+            row.append(min(timeit.repeat(lambda: search(password, fresh()), number=1, repeat=3)) * 1e3)
+            tracemalloc.start()
+            search(password, fresh())
+            row.append(tracemalloc.get_traced_memory()[1] / 1e6)
+            tracemalloc.stop()
+        assert scoring.most_guessable_match_sequence(password, [dict(m) for m in matches]) == \
+                dict_search(password, [dict(m) for m in matches])
+        print('%6d %14.1f %14.1f %14.1f %14.1f' % tuple([length] + row))
+
+
+if __name__ == '__main__':
+    main()
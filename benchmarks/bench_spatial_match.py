@@ -0,0 +1,94 @@
+"""
+Spatial matcher microbenchmark: spatial_match over compiled transition tables
+against the original per-layout neighbour scan, for keyboard-walk passwords
+of growing length; then the cost of enabling more or fewer layouts.
+
+    python benchmarks/bench_spatial_match.py
+"""
+import random
+import timeit
+
+from zxcvbn import adjacency, layouts, matching
+
+LENGTHS = [8, 16, 32, 64, 128]
+SAMPLES = 50
+WALKS = ['qwertyuiop', 'asdfghjkl', 'zxcvbnm', '1qaz2wsx3edc', 'QAZWSX!@#$', 'poiuytrewq',
+         '7894561230', '/*-+963', 'aoeuidhtns', '.pyfgcrl', 'mnbvcxz']
+
+
+def neighbour_scan(password):
+    # the original spatial_match: for each layout, search every neighbour string of every character.
+    result = []
+    for graph_name, graph in adjacency.load_graphs().items():
+        i = 0
+        while i < len(password) - 1:
+            j = i + 1
+            last_direction = None
+            turns = 0
+            shifted_count = 0
+            while True:
+                prev_char = password[j-1]
+                found = False
+                cur_direction = -1
+                adjacents = graph[prev_char] if prev_char in graph else []
+                if j < len(password):
+                    cur_char = password[j]
+                    for adj in adjacents:
+                        cur_direction += 1
+                        if adj and adj.find(cur_char) != -1:
+                            found = True
+                            if adj.find(cur_char) == 1:
+                                shifted_count += 1
+                            if last_direction != cur_direction:
+                                turns += 1
+                                last_direction = cur_direction
+                            break
+                if found:
+                    j += 1
+                else:
+                    if j - i > 2:
+                        result.append((i, j - 1, graph_name, turns, shifted_count))
+                    i = j
+                    break
+    return result
+
+
+def make_passwords(length, rng):
+    passwords = []
+    for _ in range(SAMPLES):
+        password = ''
+        while len(password) < length:
+            walk = rng.choice(WALKS)
+            start = rng.randrange(len(walk) - 2)
+            password += walk[start:start + rng.randint(3, 8)] + rng.choice(['', '!', 'x9'])
+        passwords.append(password[:length])
+    return passwords
+
+
+def main():
+    rng = random.Random(0)
+    matching.spatial_match('warmup')  # compile the tables outside the timings
+    print('%6s %16s %16s %8s' % ('length', 'tables (us)', 'scan (us)', 'speedup'))
+    for length in LENGTHS:
+        passwords = make_passwords(length, rng)
+        for password in passwords:
+            found = [(m['i'], m['j'], m['graph'], m['turns'], m['shifted_count'])
+                     for m in matching.spatial_match(password)]
+            assert found == neighbour_scan(password), password
+        tables = min(timeit.repeat(lambda: [matching.spatial_match(p) for p in passwords],
+                                   number=1, repeat=5)) / SAMPLES * 1e6
+        scan = min(timeit.repeat(lambda: [neighbour_scan(p) for p in passwords],
+                                 number=1, repeat=5)) / SAMPLES * 1e6
+        print('%6d %16.1f %16.1f %7.1fx' % (length, tables, scan, scan / tables))
+
+    passwords = make_passwords(32, rng)
+    print('\n%-40s %12s' % ('layouts (length 32)', 'us/password'))
+    for names in [['qwerty'], ['qwerty', 'keypad'], layouts.DEFAULT_LAYOUTS, layouts.layout_names()]:
+        enabled = layouts.get_layouts(names)
+        elapsed = min(timeit.repeat(lambda: [matching.spatial_match(p, _layouts=enabled) for p in passwords],
+                                    number=1, repeat=5)) / SAMPLES * 1e6
+        print('%-48s %12.1f' % (','.join(names), elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+"""
+Load test for zxcvbn.server: starts an instance on localhost (or uses --url's), then
+keeps concurrency keep-alive connections busy POSTing passwords to /score, and
+reports throughput, client-side latency percentiles and the server's own metrics.
+Each result is checked against password_strength in this process.
+
+    python benchmarks/load_server.py [--requests N] [--concurrency N] [--max-batch N ...]
+    python benchmarks/load_server.py --port 8765 --external    # a server already running
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+
+import zxcvbn
+
+FIELDS = ['guesses', 'score']
+
+
+def make_requests(count, rng):
+    requests = []
+    for _ in range(count):
+        user_inputs = rng.sample(['alice', 'bob', 'example.com', 'smith'], rng.randint(0, 2))
+        length = rng.randint(40, 60) if rng.random() < 0.05 else rng.randint(6, 14)
+        password = ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz0123456789!@#alice')
+                           for _ in range(length))
+        requests.append(dict(password=password, user_inputs=user_inputs, fields=FIELDS))
+    return requests
+
+
+async def http(reader, writer, method, path, body=b''):
+    writer.write(('%s %s HTTP/1.1\r\nHost: localhost\r\nContent-Length: %d\r\n\r\n'
+                  % (method, path, len(body))).encode('ascii') + body)
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line == b'\r\n':
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def load(port, requests, concurrency):
+    latencies = []
+    results = [None] * len(requests)
+
+    async def client(k):
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        for n in range(k, len(requests), concurrency):
+            start = time.time()
+            status, results[n] = await http(reader, writer, 'POST', '/score',
+                                            json.dumps(requests[n]).encode('utf-8'))
+            latencies.append(time.time() - start)
+            assert status == 200, results[n]
+        writer.close()
+
+    start = time.time()
+    await asyncio.gather(*[client(k) for k in range(concurrency)])
+    elapsed = time.time() - start
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    _, metrics = await http(reader, writer, 'GET', '/metrics')
+    writer.close()
+    return results, elapsed, sorted(latencies), metrics
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(port, max_batch):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([os.getcwd(), os.environ.get('PYTHONPATH', '')]))
+    server = subprocess.Popen([sys.executable, '-m', 'zxcvbn.server', '--port', str(port),
+                               '--max-batch', str(max_batch)], env=env)
+    for _ in range(300):
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return server
+        except OSError:
+            time.sleep(0.1)
+    server.kill()
+    raise SystemExit('the server did not start')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=3000)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--max-batch', type=int, nargs='+', default=[1, 16, 64])
+    parser.add_argument('--port', type=int)
+    parser.add_argument('--external', action='store_true', help='use the server already on --port')
+    args = parser.parse_args()
+
+    requests = make_requests(args.requests, random.Random(0))
+    expected = [dict((field, zxcvbn.password_strength(r['password'], r['user_inputs'])[field])
+                     for field in FIELDS) for r in requests]
+    print('%d requests over %d connections' % (len(requests), args.concurrency))
+    print('%10s %12s %10s %10s %10s %11s' % ('max_batch', 'requests/s', 'p50 ms', 'p99 ms', 'max ms',
+                                             'mean batch'))
+    for max_batch in ([None] if args.external else args.max_batch):
+        port = args.port or free_port()
+        server = None if args.external else start_server(port, max_batch)
+        try:
+            results, elapsed, latencies, metrics = asyncio.run(load(port, requests, args.concurrency))
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait()
+        assert results == expected, 'results differ from password_strength'
+        print('%10s %12.0f %10.2f %10.2f %10.2f %11.1f' % (
+            max_batch or '?', len(requests) / elapsed, latencies[len(latencies) // 2] * 1e3,
+            latencies[int(len(latencies) * 0.99)] * 1e3, latencies[-1] * 1e3, metrics['mean_batch']))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+Concurrency stress check: scores passwords whose results depend on their
+user_inputs from many threads at once, sharing one Estimator, and verifies every
+result matches the one computed serially. Then has all the threads read the lazy
+fields of each of a set of fresh results at the same moment, and verifies every read
+gets the serial value.
+
+    python benchmarks/stress_threads.py [--threads N] [--rounds N]
+"""
+import argparse
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import zxcvbn
+
+NAMES = ['qzxwvk', 'plorbix', 'zantrop', 'kwimble', 'frodzy', 'vexmira', 'glunder', 'hoxtak']
+LAZY_FIELDS = ['feedback', 'crack_times_display']
+
+
+def make_cases(rng, count):
+    cases = []
+    for _ in range(count):
+        user_inputs = rng.sample(NAMES, 2)
+        word = rng.choice(NAMES)  # a user input for some cases, a random word for others
+        password = rng.choice([word, word * 2, word + '2016', word.capitalize() + '!'])
+        cases.append((password, user_inputs))
+    return cases
+
+
+def summary(result):
+    return (result['guesses'], [(m['pattern'], m['token'], m.get('dictionary_name'), m.get('base_guesses'))
+                                for m in result['sequence']])
+
+
+def lazy_reads(estimator, cases, threads):
+    """ Reads the lazy fields of a fresh result per case from threads threads released
+    together; returns (reads, the reads that raised or got something else).
+    """
+    expected = [dict((field, estimator.password_strength(pw, ui)[field]) for field in LAZY_FIELDS)
+                for pw, ui in cases]
+    barrier = threading.Barrier(threads)
+    failures = []
+    reads = 0
+    with ThreadPoolExecutor(threads) as pool:
+        for (pw, ui), want in zip(cases, expected):
+            result = estimator.password_strength(pw, ui)
+
+            def read(_):
+                barrier.wait()
+                try:
+                    return dict((field, result.get(field) if n % 2 else result[field])
+                                for n, field in enumerate(LAZY_FIELDS))
+                except Exception as e:
+                    return e
+
+            for got in pool.map(read, range(threads)):
+                reads += 1
+                if got != want:
+                    failures.append((pw, got))
+    return reads, failures
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    estimator = zxcvbn.Estimator()
+    cases = make_cases(rng, 200)
+    expected = [summary(estimator.password_strength(pw, ui)) for pw, ui in cases]
+
+    jobs = list(range(len(cases))) * args.rounds
+    rng.shuffle(jobs)
+    start = time.time()
+    with ThreadPoolExecutor(args.threads) as pool:
+        results = pool.map(lambda k: (k, summary(estimator.password_strength(*cases[k]))), jobs)
+        mismatches = [k for k, result in results if result != expected[k]]
+    elapsed = time.time() - start
+
+    print('%d calls on %d threads in %.2fs, %d mismatches' % (len(jobs), args.threads, elapsed, len(mismatches)))
+    if mismatches:
+        raise SystemExit('results leaked between threads: %r' % cases[mismatches[0]][0])
+
+    # switch threads often, so that they interleave inside the lazy fields' functions.
+    sys.setswitchinterval(1e-6)
+    reads, failures = lazy_reads(estimator, cases, args.threads)
+    print('%d concurrent reads of lazy fields, %d failed' % (reads, len(failures)))
+    if failures:
+        raise SystemExit('lazy field read failed for %r: %r' % failures[0])
+
+
+if __name__ == '__main__':
+    main()
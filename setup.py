@@ -9,7 +9,10 @@ setup(name='zxcvbn',
       url='https://www.github.com/rpearl/python-zxcvbn',
       packages=['zxcvbn'],
       package_data={'zxcvbn': ['generated/frequency_lists.json',
-                               'generated/adjacency_graphs.json',
+                               'generated/frequency_lists.bin',
+                               'generated/layouts/*.json',
+                               'generated/date_table.json',
+                               'generated/common_results.txt.gz',
                                'locale/*/LC_MESSAGES/zxcvbn.mo']},
       cmdclass = {'compile_catalog': babel.compile_catalog,
                   'extract_messages': babel.extract_messages,
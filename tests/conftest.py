@@ -0,0 +1,12 @@
+import sys
+
+import pytest
+
+
+@pytest.fixture
+def fast_switching():
+    # switch threads often, so that they interleave inside the scoring and lazy functions.
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
@@ -0,0 +1,124 @@
+"""
+zxcvbn.aggregate.Aggregate against counts taken straight from the results: exact
+where they are meant to be, within their stated error where not, and the same
+whether gathered in one pass or merged from shards.
+"""
+import collections
+import json
+import math
+import os
+import random
+
+import pytest
+
+import zxcvbn
+from zxcvbn.__main__ import main
+from zxcvbn.aggregate import Aggregate, QUANTILES
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'tests.txt')
+
+
+def passwords():
+    with open(CORPUS) as f:
+        corpus = [line.strip() for line in f if line.strip()]
+    rng = random.Random(24)
+    words = ['password', 'dragon', 'monkey', 'hunter', 'summer', 'alice', 'qwerty', 'letmein']
+    generated = [rng.choice(words) + rng.choice(['', '1', '2016', '!', 'x9']) for _ in range(150)]
+    return corpus + generated + ['', '']
+
+
+@pytest.fixture(scope='module')
+def results():
+    return [dict(result) for result in zxcvbn.password_strength_many(passwords())]
+
+
+def test_exact_counts(results):
+    aggregate = Aggregate().update(results)
+    scored = [result for result in results if 'score' in result]
+    log10s = [result['guesses_log10'] for result in scored]
+    matches = [match for result in scored for match in result['sequence']]
+    assert aggregate.count == len(results)
+    assert aggregate.scores == collections.Counter(result.get('score') for result in results)
+    assert aggregate.patterns == collections.Counter(match['pattern'] for match in matches)
+    assert aggregate.dictionaries == collections.Counter(match['dictionary_name'] for match in matches
+                                                         if match['pattern'] == 'dictionary')
+    summary = aggregate.summary()
+    assert summary['guesses_log10']['min'] == min(log10s)
+    assert summary['guesses_log10']['max'] == max(log10s)
+    assert summary['guesses_log10']['mean'] == pytest.approx(sum(log10s) / len(log10s))
+    # plenty of room: no word count is cut short.
+    assert aggregate.words_error == 0
+    assert aggregate.word_counts == collections.Counter(match['matched_word'] for match in matches
+                                                        if match['pattern'] == 'dictionary')
+
+
+@pytest.mark.parametrize('resolution', [0.1, 0.5, 2.0])
+def test_quantiles_within_half_a_bin(results, resolution):
+    aggregate = Aggregate(resolution).update(results)
+    log10s = sorted(result['guesses_log10'] for result in results if 'score' in result)
+    for q in QUANTILES + [0, 1]:
+        expected = log10s[max(int(math.ceil(q * len(log10s))), 1) - 1]
+        assert abs(aggregate.quantile(q) - expected) <= resolution / 2 + 1e-9, q
+    assert Aggregate().quantile(0.5) is None
+
+
+def test_word_counts_within_words_error(results):
+    aggregate = Aggregate(words=8).update(results)
+    true_counts = collections.Counter(match['matched_word'] for result in results
+                                      for match in result.get('sequence', []) if match['pattern'] == 'dictionary')
+    assert aggregate.words_error > 0
+    assert len(aggregate.word_counts) <= 8
+    for word, count in true_counts.items():
+        assert count - aggregate.words_error <= aggregate.word_counts[word] <= count, word
+        if count > aggregate.words_error:
+            assert word in aggregate.word_counts, word
+
+
+@pytest.mark.parametrize('words', [1000, 8])
+def test_merged_shards_match_one_pass(results, words):
+    whole = Aggregate(words=words).update(results)
+    merged = Aggregate(words=words)
+    for k in range(0, len(results), 37):
+        shard = Aggregate(words=words).update(results[k:k + 37])
+        merged.merge(Aggregate.from_dict(json.loads(json.dumps(shard.to_dict()))))
+    expected, found = whole.to_dict(), merged.to_dict()
+    assert found.pop('log10_sum') == pytest.approx(expected.pop('log10_sum'))
+    expected_words, found_words = expected.pop('word_counts'), found.pop('word_counts')
+    expected_error, found_error = expected.pop('words_error'), found.pop('words_error')
+    assert found == expected
+    if words == 1000:
+        assert (found_words, found_error) == (expected_words, expected_error)
+    true_counts = collections.Counter(match['matched_word'] for result in results
+                                      for match in result.get('sequence', []) if match['pattern'] == 'dictionary')
+    for word, count in true_counts.items():
+        assert count - found_error <= found_words.get(word, 0) <= count, word
+
+
+def test_round_trip_and_mismatched_resolutions(results):
+    aggregate = Aggregate().update(results)
+    assert Aggregate.from_dict(json.loads(json.dumps(aggregate.to_dict()))) == aggregate
+    with pytest.raises(ValueError):
+        aggregate.merge(Aggregate(resolution=0.5))
+
+
+def test_command_line_aggregates_merge(capsys, tmp_path):
+    lines = passwords()
+    halves = []
+    for k, part in enumerate([lines[:len(lines) // 2], lines[len(lines) // 2:]]):
+        path = tmp_path / ('part%d.txt' % k)
+        path.write_text('\n'.join(part) + '\n', encoding='utf-8')
+        halves.append(str(path))
+    whole = tmp_path / 'whole.txt'
+    whole.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+
+    assert main(['--aggregate', str(whole)]) == 0
+    expected = json.loads(capsys.readouterr().out)
+    saved = []
+    for k, path in enumerate(halves):
+        saved.append(str(tmp_path / ('part%d.json' % k)))
+        assert main(['--save-aggregate', saved[-1], path]) == 0
+    capsys.readouterr()
+    assert main(['--merge'] + saved) == 0
+    found = json.loads(capsys.readouterr().out)
+    assert found['guesses_log10'].pop('mean') == pytest.approx(expected['guesses_log10'].pop('mean'))
+    assert found == expected
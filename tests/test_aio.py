@@ -0,0 +1,101 @@
+"""
+zxcvbn.aio: results match password_strength, at most limit calls run at a time, and
+a timed out call keeps its slot until its work ends.
+"""
+import asyncio
+import threading
+
+import pytest
+
+import zxcvbn
+from zxcvbn.aio import AsyncScorer, password_strength_async
+
+PASSWORDS = ['', 'hunter2', 'Tr0ub4dour&3', 'correcthorsebatterystaple', '11/11/1991']
+
+
+def comparable(result):
+    result = dict(result)
+    result.pop('calc_time', None)
+    return result
+
+
+class BlockingEstimator(zxcvbn.Estimator):
+    """ Holds every call until release is set, counting the calls running at once. """
+
+    def __init__(self):
+        zxcvbn.Estimator.__init__(self)
+        self.release = threading.Event()
+        self.running = self.most_running = 0
+        self._lock = threading.Lock()
+
+    def password_strength(self, *args, **kwargs):
+        with self._lock:
+            self.running += 1
+            self.most_running = max(self.most_running, self.running)
+        try:
+            self.release.wait(10)
+            return zxcvbn.Estimator.password_strength(self, *args, **kwargs)
+        finally:
+            with self._lock:
+                self.running -= 1
+
+
+@pytest.mark.parametrize('executor', ['thread', 'process'])
+def test_results_match_password_strength(executor):
+    async def run():
+        async with AsyncScorer(executor, workers=2) as scorer:
+            return await asyncio.gather(*[scorer.password_strength(password, ['plorbix'], fields=['score', 'sequence'])
+                                          for password in PASSWORDS])
+    expected = [dict(score=result.get('score'), sequence=result.get('sequence'))
+                for result in (zxcvbn.password_strength(password, ['plorbix']) for password in PASSWORDS)]
+    found = [dict(score=result.get('score'), sequence=result.get('sequence')) for result in asyncio.run(run())]
+    assert found == expected
+
+
+def test_password_strength_async():
+    async def run():
+        return await asyncio.gather(*map(password_strength_async, PASSWORDS))
+    assert [comparable(result) for result in asyncio.run(run())] == \
+            [comparable(zxcvbn.password_strength(password)) for password in PASSWORDS]
+
+
+def test_limit_bounds_calls_in_flight():
+    estimator = BlockingEstimator()
+
+    async def run(scorer):
+        calls = [asyncio.ensure_future(scorer.password_strength(password)) for password in PASSWORDS * 2]
+        await asyncio.sleep(0.1)
+        assert scorer.in_flight == 2
+        estimator.release.set()
+        return await asyncio.gather(*calls)
+
+    scorer = AsyncScorer('thread', workers=4, limit=2, estimator=estimator)
+    try:
+        results = asyncio.run(run(scorer))
+    finally:
+        scorer.close()
+    assert estimator.most_running == 2
+    assert [result['password'] for result in results if result.get('password') is not None] == \
+            [password for password in PASSWORDS * 2 if password]
+    assert scorer.in_flight == 0
+
+
+def test_timed_out_call_keeps_its_slot():
+    estimator = BlockingEstimator()
+
+    async def run(scorer):
+        with pytest.raises(asyncio.TimeoutError):
+            await scorer.password_strength('hunter2', timeout=0.05)
+        # the first call still runs, so the second waits for its slot and times out too.
+        assert scorer.in_flight == 1
+        with pytest.raises(asyncio.TimeoutError):
+            await scorer.password_strength('hunter3', timeout=0.05)
+        estimator.release.set()
+        return await scorer.password_strength('hunter4', timeout=10)
+
+    scorer = AsyncScorer('thread', workers=1, limit=1, estimator=estimator)
+    try:
+        assert asyncio.run(run(scorer))['password'] == 'hunter4'
+    finally:
+        scorer.close()
+    assert estimator.most_running == 1
@@ -0,0 +1,48 @@
+"""
+password_strength_many against one password_strength call per password.
+"""
+import os
+
+import pytest
+
+import zxcvbn
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'tests.txt')
+
+
+def corpus():
+    with open(CORPUS) as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def comparable(result):
+    result = dict(result)
+    result.pop('calc_time', None)
+    return result
+
+
+@pytest.mark.parametrize('chunksize', [1, 7, 256])
+def test_many_matches_single_calls(chunksize):
+    passwords = corpus() + ['', 'p@ssw0rd', 'P@SSW0RD', 'p@ssw0rd'] + corpus()[:5]
+    estimator = zxcvbn.Estimator()
+    for kwargs in [{}, dict(user_inputs=['plorbix', 'Wonderland']), dict(layouts=['dvorak']), dict(locale='es')]:
+        expected = [comparable(estimator.password_strength(password, **kwargs)) for password in passwords]
+        found = [comparable(result) for result in
+                 estimator.password_strength_many(iter(passwords), chunksize=chunksize, **kwargs)]
+        assert found == expected, kwargs
+
+
+def test_repeated_passwords_get_their_own_copies():
+    first, second = zxcvbn.password_strength_many(['hunter2', 'hunter2'])
+    assert comparable(first) == comparable(second)
+    token = second['sequence'][0]['token']
+    first['sequence'][0]['token'] = 'changed'
+    assert second['sequence'][0]['token'] == token
+
+
+def test_many_is_lazy():
+    def passwords():
+        yield 'hunter2'
+        raise AssertionError('read past the first chunk')
+    results = zxcvbn.password_strength_many(passwords(), chunksize=1)
+    assert next(results)['password'] == 'hunter2'
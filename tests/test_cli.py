@@ -0,0 +1,57 @@
+"""
+python -m zxcvbn: one json line per input line, in order, matching password_strength.
+"""
+import json
+
+import pytest
+
+import zxcvbn
+from zxcvbn.__main__ import main
+
+PASSWORDS = ['hunter2', '', 'Tr0ub4dour&3', 'correcthorsebatterystaple', 'plorbix1987', 'ñandú', 'hunter2']
+
+
+def comparable(result):
+    result = json.loads(json.dumps(dict(result)))
+    result.pop('calc_time', None)
+    return result
+
+
+def run(capsys, argv):
+    assert main(argv) == 0
+    return [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+
+@pytest.fixture
+def passwords_file(tmp_path):
+    path = tmp_path / 'passwords.txt'
+    # no final newline: the last line is still a password.
+    path.write_bytes('\n'.join(PASSWORDS).encode('utf-8'))
+    return str(path)
+
+
+@pytest.mark.parametrize('workers', ['1', '2'])
+def test_results_match_password_strength(capsys, passwords_file, workers):
+    found = [comparable(result) for result in run(capsys, ['-j', workers, '--chunksize', '2', '-u', 'plorbix',
+                                                           passwords_file])]
+    assert found == [comparable(zxcvbn.password_strength(password, ['plorbix'])) for password in PASSWORDS]
+
+
+def test_fields(capsys, passwords_file):
+    found = run(capsys, ['-f', 'score,guesses', passwords_file, passwords_file])
+    assert found == [dict((field, result[field]) for field in ['score', 'guesses'] if field in result)
+                     for result in map(zxcvbn.password_strength, PASSWORDS * 2)]
+
+
+def test_line_endings_and_undecodable_bytes(capsys, tmp_path):
+    path = tmp_path / 'passwords.txt'
+    path.write_bytes(b'hunter2\r\n\xffpass\n')
+    found = run(capsys, ['-f', 'password', str(path)])
+    assert found == [dict(password='hunter2'), dict(password='\udcffpass')]
+
+
+def test_bad_arguments(capsys):
+    for argv in [['--chunksize', '0'], ['-j', '-1']]:
+        with pytest.raises(SystemExit):
+            main(argv)
+    assert 'must' in capsys.readouterr().err
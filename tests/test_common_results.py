@@ -0,0 +1,48 @@
+import json
+
+import zxcvbn.common_results
+import zxcvbn.matching
+from zxcvbn.main import Estimator
+
+# every STRIDE-th entry is checked against the engine; the whole table takes
+# benchmarks/bench_common_results.py about half a minute.
+STRIDE = 10
+
+
+def comparable(result):
+    result = dict(result)
+    result.pop('calc_time', None)
+    # json keeps key order, so this also checks matches are rebuilt in the same order.
+    return json.dumps(result)
+
+
+def test_table_matches_engine_fingerprint():
+    assert zxcvbn.common_results.load_table() is not None, \
+        'the table is missing or out of date: run scripts/build_common_results.py'
+
+
+def test_table_holds_variants_of_common_passwords():
+    _, entries = zxcvbn.common_results.load_table()
+    expected = set()
+    for word in zxcvbn.matching.load_ranked_dictionaries()['passwords']:
+        expected.update(zxcvbn.common_results.variants(word))
+    assert set(entries) == expected
+
+
+def test_table_results_match_engine():
+    _, entries = zxcvbn.common_results.load_table()
+    live = Estimator()
+    live.common_results = False
+    cached = Estimator()
+    mismatches = []
+    for password in sorted(entries)[::STRIDE]:
+        expected = live.password_strength(password)
+        if comparable(cached.password_strength(password)) != comparable(expected) or \
+                zxcvbn.common_results.lookup_score(password) != (expected['guesses'], expected['score']):
+            mismatches.append(password)
+    assert not mismatches
+
+
+def test_lookup_misses_outside_table():
+    assert zxcvbn.common_results.lookup('qzxwvk plorbix') is None
+    assert zxcvbn.common_results.lookup_score('qzxwvk plorbix') is None
@@ -0,0 +1,114 @@
+"""
+date_match, which only looks inside digit and date separator runs, against the search
+over every substring of the password it replaces; and the 4 digit date table and
+DATE_CACHE against working each reading out.
+"""
+import os
+import random
+
+from zxcvbn import matching, scoring
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'tests.txt')
+PASSWORDS = [
+    '1191', '11111991', '2015_06_04', '1.1.91', '12/31/1999x', 'ab1-2-3cd 4 5 6',
+    'born13.08.1987andstill19870813', '٢٠١٥٠٦٠٤', '1/1/1/1/1/1', '99999999', '',
+]
+
+
+def corpus():
+    with open(CORPUS) as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def substring_dates(password):
+    # every 4-8 and 6-10 character substring tried, as date_match used to.
+    matches = []
+    for i in range(len(password) - 3):
+        candidates = []
+        for j in range(i + 4, min(i + 9, len(password) + 1)):
+            token = password[i:j]
+            if not token.isdigit():
+                continue
+            for k, l in matching.DATE_SPLITS[len(token)]:
+                dmy = matching.map_ints_to_dmy((int(token[:k]), int(token[k:l]), int(token[l:])))
+                if dmy:
+                    candidates.append(dmy)
+            if candidates:
+                best = min(candidates, key=lambda dmy: abs(dmy['year'] - scoring.REFERENCE_YEAR))
+                matches.append(dict(pattern='date', token=token, i=i, j=j-1, separator='',
+                                    year=best['year'], month=best['month'], day=best['day']))
+    for i in range(len(password) - 5):
+        for j in range(i + 6, min(i + 11, len(password) + 1)):
+            token = password[i:j]
+            rx_match = matching.MAYBE_DATE_WITH_SEPARATOR.search(token)
+            if not rx_match:
+                continue
+            dmy = matching.map_ints_to_dmy((int(rx_match.group(1)), int(rx_match.group(3)), int(rx_match.group(4))))
+            if dmy:
+                matches.append(dict(pattern='date', token=token, i=i, j=j-1, separator=rx_match.group(2),
+                                    year=dmy['year'], month=dmy['month'], day=dmy['day']))
+    return sorted((match for match in matches
+                   if not any(other is not match and other['i'] <= match['i'] and other['j'] >= match['j']
+                              for other in matches)),
+                  key=lambda match: (match['i'], match['j']))
+
+
+def random_passwords():
+    rng = random.Random(12)
+    for _ in range(300):
+        yield ''.join(rng.choice('0123456789' * 3 + '/-._ \\ab') for _ in range(rng.randint(4, 24)))
+
+
+def check(password):
+    found = sorted(matching.date_match(password), key=lambda match: (match['i'], match['j']))
+    assert found == substring_dates(password), password
+
+
+def test_date_match_same_as_substring_search():
+    for password in PASSWORDS + corpus() + list(random_passwords()):
+        check(password)
+
+
+def test_date_table_holds_every_4_digit_reading():
+    table = matching._date_table()
+    assert table is not None
+    for n in range(10000):
+        token = '%04d' % n
+        assert table.get(token) == matching._map_digits_to_dmy(token), token
+        assert matching.map_digits_to_dmy(token) == matching._map_digits_to_dmy(token), token
+
+
+def test_stale_date_table_is_not_used(monkeypatch):
+    monkeypatch.setattr(matching, 'DATE_MAX_YEAR', matching.DATE_MAX_YEAR + 1)
+    monkeypatch.setattr(matching.zxcvbn.resources, '_loaded', {})
+    assert matching._date_table() is None
+    assert matching.map_digits_to_dmy('1191') == matching._map_digits_to_dmy('1191')
+
+
+def test_date_cache(monkeypatch):
+    cache = matching.zxcvbn.cache.LRUCache(maxsize=64)
+    monkeypatch.setattr(matching, 'DATE_CACHE', cache)
+    tokens = ['%0*d' % (length, n) for length in range(5, 9) for n in range(0, 10 ** length, 10 ** length // 40)]
+    for _ in range(2):
+        for token in tokens[:50]:
+            assert matching.map_digits_to_dmy(token) == matching._map_digits_to_dmy(token), token
+    info = cache.info()
+    assert (info['hits'], info['misses'], info['size']) == (50, 50, 50)
+    # entries are found by a keyed hash, so no token is kept as it is.
+    assert not any(isinstance(key, str) or token.encode() in key for key in cache._data for token in tokens)
+    for token in tokens:
+        matching.map_digits_to_dmy(token)
+    assert len(cache) == 64
+    # 4 digit tokens come from the table and never reach the cache.
+    cache.clear()
+    matching.map_digits_to_dmy('1191')
+    assert cache.info()['misses'] == 0
+    for password in PASSWORDS + list(random_passwords()):
+        check(password)
+
+
+def test_date_cache_off_by_default():
+    # see DATE_CACHE: on by default, its misses would cost more than its hits save.
+    assert matching.DATE_CACHE.maxsize == 0
+    matching.map_digits_to_dmy('11111991')
+    assert len(matching.DATE_CACHE) == 0
@@ -0,0 +1,128 @@
+"""
+The mapped ZXFT0002 frequency tables: built and loaded back, refused when truncated,
+the JSON lists used in their place, and the dictionary matches found over them, forward
+and reversed, against the plain substring search they replace.
+"""
+import os
+
+import pytest
+
+from zxcvbn import frequency_tables, matching, resources
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'tests.txt')
+SMALL = {
+    'passwords': {'password': 1, 'pass': 2, 'word': 3, 'drow': 4, 'p@ss': 5},
+    'names': {'anna': 1, 'ann': 2, 'naïve': 3},
+    'empty': {},
+}
+
+
+def corpus():
+    with open(CORPUS) as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def write(path, ranked_dictionaries):
+    with open(path, 'wb') as f:
+        frequency_tables.write_frequency_tables(ranked_dictionaries, f)
+    return path
+
+
+def substring_matches(password, ranked_dictionaries, reverse=False):
+    # every substring looked up in every dict, as dictionary_match used to.
+    text = password[::-1] if reverse else password
+    lower = text.lower()
+    n = len(text)
+    found = []
+    for dict_name, ranked_dict in ranked_dictionaries.items():
+        for i in range(n):
+            for j in range(i, n):
+                word = lower[i:j+1]
+                if word in ranked_dict:
+                    span = (n - 1 - j, n - 1 - i) if reverse else (i, j)
+                    found.append(span + (word, ranked_dict[word], dict_name))
+    return sorted(found)
+
+
+def keys(matches):
+    return sorted((m['i'], m['j'], m['matched_word'], m['rank'], m['dictionary_name']) for m in matches)
+
+
+def test_round_trip(tmp_path):
+    tables = frequency_tables.load_frequency_tables(write(tmp_path / 'small.bin', SMALL))
+    assert list(tables) == list(SMALL)
+    for name, ranked_dict in SMALL.items():
+        assert dict(tables[name].items()) == ranked_dict
+        assert len(tables[name]) == len(ranked_dict)
+        for word, rank in ranked_dict.items():
+            assert tables[name][word] == rank
+        assert 'absent' not in tables[name]
+        with pytest.raises(KeyError):
+            tables[name]['absent']
+    trie = tables['names'].trie
+    assert trie.find('anna') == [(1, 1)]
+    assert trie.find('an') == []
+    assert trie.find('word') == [(0, 3)]
+
+
+def test_matches_on_loaded_tables(tmp_path):
+    tables = frequency_tables.load_frequency_tables(write(tmp_path / 'small.bin', SMALL))
+    for password in ['PassWord', 'drowssap', 'annaNNa', 'p@ssword', 'NAÏVE', '']:
+        assert keys(matching.dictionary_match(password, tables)) == substring_matches(password, SMALL)
+        assert keys(matching.reversed_dictionary_match(password, tables)) == \
+                substring_matches(password, SMALL, reverse=True)
+
+
+def test_bundled_tables_match_substring_search():
+    plain = dict((name, dict(ranked.items())) for name, ranked in matching.load_ranked_dictionaries().items())
+    bundled = matching.load_ranked_dictionaries()
+    for password in corpus()[:200]:
+        found = matching.forward_and_reversed_dictionary_match(password, bundled)
+        assert keys([m for m in found if not m['reversed']]) == substring_matches(password, plain), password
+        assert keys([m for m in found if m['reversed']]) == \
+                substring_matches(password, plain, reverse=True), password
+        for m in found:
+            token = password[m['i']:m['j'] + 1]
+            assert m['token'] == token
+            assert (token[::-1] if m['reversed'] else token).lower() == m['matched_word']
+
+
+@pytest.mark.parametrize('size', [0, 4, 12, 40, 200, -8])
+def test_truncated_file_is_refused(tmp_path, size):
+    data = write(tmp_path / 'small.bin', SMALL).read_bytes()
+    truncated = tmp_path / 'truncated.bin'
+    truncated.write_bytes(data[:size] if size >= 0 else data[:len(data) + size])
+    with pytest.raises(ValueError):
+        frequency_tables.load_frequency_tables(truncated)
+
+
+def test_wrong_magic_is_refused(tmp_path):
+    path = write(tmp_path / 'small.bin', SMALL)
+    path.write_bytes(b'ZXFT0001' + path.read_bytes()[8:])
+    with pytest.raises(ValueError):
+        frequency_tables.load_frequency_tables(path)
+
+
+@pytest.mark.parametrize('contents', [None, b'', b'ZXFT0002\x03'])
+def test_json_fallback(tmp_path, monkeypatch, contents):
+    generated = resources._generated
+    path = tmp_path / 'frequency_lists.bin'
+    if contents is not None:
+        path.write_bytes(contents)
+
+    def _generated(name):
+        return path if name == 'frequency_lists.bin' else generated(name)
+    monkeypatch.setattr(resources, '_loaded', {})
+    monkeypatch.setattr(resources, '_generated', _generated)
+
+    assert resources.load_frequency_tables() is None
+    lists = resources.load_json('frequency_lists.json')
+    assert matching.frequency_list_names() == list(lists)
+    ranked_dictionaries = matching.load_ranked_dictionaries()
+    for name, ranked_dict in ranked_dictionaries.items():
+        assert isinstance(ranked_dict, dict)
+        assert ranked_dict == matching._build_ranked_dict(lists[name])
+    for password in ['correcthorsebatterystaple', 'drowssap', 'Tr0ub4dour&3']:
+        expected = sorted(substring_matches(password, ranked_dictionaries) +
+                          substring_matches(password, ranked_dictionaries, reverse=True))
+        assert keys(matching.forward_and_reversed_dictionary_match(password, ranked_dictionaries)) == expected
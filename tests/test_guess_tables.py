@@ -0,0 +1,155 @@
+"""
+The memoized nCk, binomial sums, spatial counts and shared case and l33t variations
+against the loops they replaced: the same values, of the same types.
+"""
+import copy
+import os
+
+import pytest
+
+from zxcvbn import layouts, matching, scoring
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'tests.txt')
+
+
+def original_nCk(n, k):
+    if k > n:
+        return 0
+    if k == 0:
+        return 1
+    r = 1
+    for d in range(1, k):
+      r *= n
+      r /= d
+      n -= 1
+    return r
+
+
+def original_binomial_sum(n, k):
+    total = 0
+    for i in range(1, k):
+        total += original_nCk(n, i)
+    return total
+
+
+def original_spatial_guesses(s, d, L, t, S):
+    guesses = 0
+    for i in range(2, L):
+        possible_turns = min(t, i - 1)
+        for j in range(1, possible_turns):
+            guesses += original_nCk(i - 1, j - 1) * s * (d ** j)
+    if S:
+        U = L - S
+        if S == 0 or U == 0:
+            guesses *= 2
+        else:
+            shifted_variations = 0
+            for i in range(1, min(S, U)):
+                shifted_variations += original_nCk(S + U, i)
+            guesses *= shifted_variations
+    return guesses
+
+
+def original_uppercase_variations(match):
+    word = match['token']
+    if scoring.ALL_LOWER.match(word) or word.lower() == word:
+        return 1
+    for regex in [scoring.START_UPPER, scoring.END_UPPER, scoring.ALL_UPPER]:
+        if regex.match(word):
+            return 2
+    U = len([chr for chr in word if chr.isupper()])
+    L = len([chr for chr in word if chr.islower()])
+    variations = 0
+    for i in range(1, min(U, L)):
+        variations += original_nCk(U + L, i)
+    return variations
+
+
+def original_l33t_variations(match):
+    if not match['l33t']:
+        return 1
+    variations = 1
+    for subbed, unsubbed in match['sub'].items():
+        chrs = match['token'].lower()
+        S = len([chr for chr in chrs if chr == subbed])
+        U = len([chr for chr in chrs if chr == unsubbed])
+        if S == 0 or U == 0:
+            variations *= 2
+        else:
+            possibilities = 0
+            for i in range(1, min(U, S)):
+                possibilities += original_nCk(U + S, i)
+            variations *= possibilities
+    return variations
+
+
+def same(a, b):
+    return a == b and type(a) is type(b)
+
+
+def corpus_matches():
+    with open(CORPUS) as f:
+        passwords = [line.strip() for line in f if line.strip()]
+    passwords += [p.upper() for p in passwords] + [p[::-1].title() for p in passwords]
+    passwords += ['qwertyuiop[]asdfghjkl;zxcvbnm,./', 'QweRtyUIop1qAz2wsX3EDc', '1qaz2wsx3edc4rfv5tgb']
+    return [(p, [dict((k, v) for k, v in m.items() if k not in ('guesses', 'guesses_log10'))
+                 for m in matching.omnimatch(p)]) for p in passwords]
+
+
+def test_nCk_and_binomial_sum():
+    for n in range(60):
+        for k in range(60):
+            assert same(scoring.nCk(n, k), original_nCk(n, k)), (n, k)
+            assert same(scoring.binomial_sum(n, k), original_binomial_sum(n, k)), (n, k)
+
+
+@pytest.mark.parametrize('name', layouts.layout_names())
+def test_spatial_guesses(name):
+    layout = layouts.get_layout(name)
+    s, d = layout['starting_positions'], layout['average_degree']
+    for L in range(1, 20):
+        for t in range(1, L + 1):
+            for S in range(L + 1):
+                match = dict(graph=name, token='x' * L, turns=t, shifted_count=S)
+                assert same(scoring.spatial_guesses(match), original_spatial_guesses(s, d, L, t, S)), match
+
+
+def test_spatial_matches_keep_scoring_inputs_internal():
+    matches = matching.spatial_match('qwertyuiop[]asdfghjkl;zxcvbnm,./1qaz2wsx3edc7894561230')
+    assert matches
+    for match in matches:
+        assert sorted(match) == ['graph', 'i', 'j', 'pattern', 'shifted_count', 'token', 'turns']
+
+
+def test_mac_keypad_scored_with_its_own_statistics():
+    # the only guesses the layout registry changed: mac_keypad used keypad's statistics.
+    match = dict(pattern='spatial', graph='mac_keypad', token='7412', turns=2, shifted_count=0, i=0, j=3)
+    assert scoring.estimate_guesses(match, '7412') == 84
+
+
+def test_estimates_match_original_loops():
+    for password, matches in corpus_matches():
+        variations = {}
+        for match in matches:
+            expected = copy.deepcopy(match)
+            scoring.estimate_guesses(match, password, _variations=variations)
+            if match['pattern'] == 'dictionary':
+                assert same(match['uppercase_variations'], original_uppercase_variations(expected)), match
+                assert same(match['l33t_variations'], original_l33t_variations(expected)), match
+                assert same(match['base_guesses'], expected['rank']), match
+            elif match['pattern'] == 'spatial':
+                layout = layouts.get_layout(match['graph'])
+                guesses = original_spatial_guesses(layout['starting_positions'], layout['average_degree'],
+                                                   len(match['token']), match['turns'], match['shifted_count'])
+                assert same(scoring.spatial_guesses(match), guesses), match
+
+
+def test_shared_variations_match_unshared():
+    for password, matches in corpus_matches():
+        shared = copy.deepcopy(matches)
+        variations = {}
+        for match in shared:
+            scoring.estimate_guesses(match, password, _variations=variations)
+        for match, expected in zip(shared, matches):
+            scoring.estimate_guesses(expected, password)
+            assert same(match['guesses'], expected['guesses']), (password, match)
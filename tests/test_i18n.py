@@ -0,0 +1,24 @@
+"""
+Feedback in a per-call locale, and the catalogs kept for the locales asked for.
+"""
+import zxcvbn
+from zxcvbn import i18n
+
+
+def test_feedback_in_call_locale():
+    english = zxcvbn.password_strength('password')['feedback']
+    spanish = zxcvbn.password_strength('password', locale='es')['feedback']
+    assert english['warnings'] == ['This is a top-10 common password.']
+    assert spanish['warnings'] == ['Esta es una clave común del top-10.']
+    assert zxcvbn.password_strength('password', locale='xx')['feedback'] == english
+
+
+def test_locales_share_catalogs():
+    assert i18n.get_translation('es_ES') is i18n.get_translation('es')
+    assert i18n.get_translation('fr') is i18n.get_translation('de')
+
+
+def test_catalogs_stay_bounded():
+    for k in range(2 * i18n._catalogs.maxsize):
+        i18n.get_translation('x%d' % k)
+    assert len(i18n._catalogs) == i18n._catalogs.maxsize
@@ -0,0 +1,52 @@
+"""
+Lazy feedback and crack time strings: computed on first read only, and read by many
+threads at once, all get the value a single thread gets.
+"""
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import zxcvbn
+from zxcvbn.lazy import LazyDict, lazy
+
+THREADS = 8
+PASSWORDS = ['qzxwvk', 'plorbix2016', 'Zantrop!', 'kwimblekwimble', 'password1', 'correcthorsebatterystaple',
+             'qwerty', '1q2w3e4r', '19841987', 'Tr0ub4dour&3']
+LAZY_FIELDS = ['feedback', 'crack_times_display']
+
+
+def test_lazy_values_are_computed_once_on_read():
+    calls = []
+    d = LazyDict([('a', 1), ('b', lazy(lambda: calls.append('b') or 2))])
+    assert list(d) == ['a', 'b'] and calls == []
+    assert d['b'] == 2 and d.get('b') == 2 and calls == ['b']
+    assert json.dumps(d) == '{"a": 1, "b": 2}'
+
+
+def test_results_read_like_plain_dicts():
+    result = zxcvbn.password_strength('Tr0ub4dour&3')
+    plain = json.loads(json.dumps(result))
+    assert list(plain) == list(result)
+    assert plain['feedback'] == result['feedback']
+    assert json.loads(json.dumps(dict(result))) == plain
+
+
+def test_concurrent_lazy_reads(fast_switching):
+    estimator = zxcvbn.Estimator()
+    barrier = threading.Barrier(THREADS)
+    failures = []
+    with ThreadPoolExecutor(THREADS) as pool:
+        for pw in PASSWORDS * 4:
+            want = dict((field, estimator.password_strength(pw, ['plorbix'])[field]) for field in LAZY_FIELDS)
+            result = estimator.password_strength(pw, ['plorbix'])
+
+            def read(n):
+                barrier.wait()
+                try:
+                    # half the threads go through get, the rest through [].
+                    return dict((field, result.get(field) if n % 2 else result[field]) for field in LAZY_FIELDS)
+                except Exception as e:
+                    return e
+
+            failures.extend((pw, got) for got in pool.map(read, range(THREADS)) if got != want)
+    assert failures == []
@@ -0,0 +1,35 @@
+"""
+The dictionary and l33t matchers over the mapped trie and over plain dicts holding
+the same words, which must find the same matches.
+"""
+import os
+
+import pytest
+
+import zxcvbn
+from zxcvbn import matching
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'tests.txt')
+L33T = ['p@$$w0rd', '4ll1gat0r', 'Tr0ub4dour&3', 'l33tsp34k1ng', 'b4$k3+b4ll|!7713', '1' * 40]
+
+
+@pytest.fixture(scope='module')
+def plain_dictionaries():
+    return dict((name, dict(ranked.items())) for name, ranked in matching.load_ranked_dictionaries().items())
+
+
+def corpus():
+    with open(CORPUS) as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def test_l33t_match_same_on_plain_dicts(plain_dictionaries):
+    for password in corpus() + L33T:
+        assert matching.l33t_match(password, plain_dictionaries) == matching.l33t_match(password), password
+
+
+def test_long_l33t_password_on_plain_dicts(plain_dictionaries):
+    # the walk is bounded by the longest word, not by the password.
+    estimator = zxcvbn.Estimator(dictionaries=plain_dictionaries)
+    password = '1' * 1200 + '@'
+    assert estimator.password_strength(password)['guesses'] == zxcvbn.password_strength(password)['guesses']
@@ -0,0 +1,66 @@
+"""
+meets_score, which stops as soon as the answer is certain, against the score of the
+full password_strength analysis.
+"""
+import os
+import random
+
+import pytest
+
+import zxcvbn
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'tests.txt')
+PASSWORDS = [
+    '', 'a', 'password', 'Password1', 'p@ssw0rd', 'zxcvbnm', 'qwertyuiop', '1234567890',
+    'aaaaaaaaaaaaaaaa', 'abcabcabcabc', '11/11/1991', 'alicewonderland', 'Alice1987!',
+    'dlrowolleh', 'correcthorsebatterystaple', 'Tr0ub4dour&3', 'x7$Kq!9vLm#2', 'ñandú-ñandú',
+]
+USER_INPUTS = ['alice', 'Wonderland', '1987']
+
+
+def corpus():
+    with open(CORPUS) as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def random_passwords():
+    rng = random.Random(15)
+    for _ in range(60):
+        yield ''.join(rng.choice('abcdef123!@ ') for _ in range(rng.randint(1, 20)))
+
+
+def score(estimator, password, user_inputs, layouts=None):
+    return estimator.password_strength(password, user_inputs, layouts).get('score', 0)
+
+
+@pytest.mark.parametrize('user_inputs', [[], USER_INPUTS])
+def test_meets_score_agrees_with_password_strength(user_inputs):
+    estimator = zxcvbn.Estimator()
+    for password in PASSWORDS + corpus() + list(random_passwords()):
+        expected = score(estimator, password, user_inputs)
+        for min_score in range(0, 6):
+            assert estimator.meets_score(password, min_score, user_inputs) == (expected >= min_score), \
+                    (password, min_score)
+            assert zxcvbn.meets_score(password, min_score, user_inputs) == (expected >= min_score), \
+                    (password, min_score)
+
+
+def test_meets_score_without_common_results():
+    # a list of names is not the default dictionaries, so nothing is looked up.
+    estimator = zxcvbn.Estimator(dictionaries=zxcvbn.matching.frequency_list_names())
+    assert not estimator.common_results
+    for password in PASSWORDS + corpus():
+        expected = score(estimator, password, USER_INPUTS)
+        for min_score in range(0, 6):
+            assert estimator.meets_score(password, min_score, USER_INPUTS) == (expected >= min_score), \
+                    (password, min_score)
+
+
+def test_meets_score_with_layouts():
+    estimator = zxcvbn.Estimator()
+    for password in PASSWORDS + ['qazwsxedc', '7412369', 'aoeuidhtns']:
+        for layouts in [['qwerty'], ['dvorak', 'mac_keypad']]:
+            expected = score(estimator, password, [], layouts)
+            for min_score in range(0, 6):
+                assert estimator.meets_score(password, min_score, [], layouts) == (expected >= min_score), \
+                        (password, layouts, min_score)
@@ -0,0 +1,44 @@
+"""
+password_strength_parallel against one password_strength call per password.
+"""
+import gc
+import os
+
+import zxcvbn
+from zxcvbn.parallel import password_strength_parallel
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'tests.txt')
+
+
+def corpus():
+    with open(CORPUS) as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def comparable(result):
+    result = dict(result)
+    result.pop('calc_time', None)
+    return result
+
+
+def test_parallel_matches_single_calls():
+    passwords = corpus() + ['', 'hunter2', 'hunter2']
+    expected = [comparable(zxcvbn.password_strength(password, ['plorbix'])) for password in passwords]
+    found = [comparable(result) for result in
+             password_strength_parallel(iter(passwords), ['plorbix'], workers=2, chunksize=5)]
+    assert found == expected
+    assert gc.get_freeze_count() == 0
+
+
+def test_parallel_fields():
+    passwords = corpus()[:10]
+    found = list(password_strength_parallel(passwords, workers=2, chunksize=3, fields=['score', 'guesses']))
+    assert found == [dict(score=result['score'], guesses=result['guesses'])
+                     for result in map(zxcvbn.password_strength, passwords)]
+
+
+def test_parallel_custom_estimator():
+    estimator = zxcvbn.Estimator(dictionaries=dict(words=dict(plorbix=1)))
+    found = list(password_strength_parallel(['plorbix', 'password'], workers=2, chunksize=1,
+                                            fields=['guesses'], estimator=estimator))
+    assert found == [dict(guesses=3), dict(guesses=estimator.password_strength('password')['guesses'])]
@@ -0,0 +1,52 @@
+"""
+The runs-based repeat finder, used from REPEAT_RUNS_LENGTH characters up, against the
+(.+)\\1+ / (.+?)\\1+ regexes repeat_match used to find repeats with.
+"""
+import random
+
+from zxcvbn import matching
+
+PASSWORDS = [
+    'aabaab' * 12,
+    'a' * 64,
+    'a' * 200 + 'b',
+    'abc' * 30 + 'ab' * 30,
+    'aabaabaabaab' * 8 + 'x' + 'ba' * 40,
+    ('xy' * 40 + '\n') * 3,
+    'correcthorsebatterystaple' * 4,
+    '1' * 1000 + '@',
+    ''.join(chr(0x3b1 + k % 3) for k in range(100)),
+]
+
+
+def random_passwords():
+    rng = random.Random(10)
+    for length in [64, 65, 100, 257, 600]:
+        for alphabet in ['ab', 'abc', 'ab\n', 'abcdefgh']:
+            for _ in range(20):
+                yield ''.join(rng.choice(alphabet) for _ in range(length))
+            yield ''.join(rng.choice(alphabet) for _ in range(length // 4)) * 4
+
+
+def test_runs_find_what_the_regexes_find():
+    for password in PASSWORDS + list(random_passwords()):
+        assert len(password) >= matching.REPEAT_RUNS_LENGTH
+        assert list(matching._run_repeats(password)) == list(matching._regex_repeats(password)), password
+
+
+def test_short_passwords_agree_too():
+    rng = random.Random(11)
+    for length in range(0, matching.REPEAT_RUNS_LENGTH):
+        for _ in range(10):
+            password = ''.join(rng.choice('aab') for _ in range(length))
+            assert list(matching._run_repeats(password)) == list(matching._regex_repeats(password)), password
+
+
+def test_repeat_match_same_either_way(monkeypatch):
+    expected = {}
+    monkeypatch.setattr(matching, 'REPEAT_RUNS_LENGTH', 10 ** 9)
+    for password in PASSWORDS:
+        expected[password] = matching.repeat_match(password)
+    monkeypatch.setattr(matching, 'REPEAT_RUNS_LENGTH', 64)
+    for password in PASSWORDS:
+        assert matching.repeat_match(password) == expected[password], password
@@ -0,0 +1,123 @@
+"""
+zxcvbn.result_cache.ResultCache, alone and behind an Estimator: hits give the
+uncached result, and entries that aren't exactly what was put read as misses.
+"""
+import zxcvbn
+import zxcvbn.cache
+import zxcvbn.layouts
+from zxcvbn.result_cache import ResultCache, SQLiteStore
+
+
+def comparable(result):
+    result = dict(result)
+    result.pop('calc_time', None)
+    return result
+
+
+def test_hits_give_a_new_copy():
+    cache = ResultCache()
+    cache.put('hunter2', ['bob'], dict(score=1, sequence=[]))
+    first = cache.get('hunter2', ['bob'])
+    first['score'] = 4
+    assert cache.get('hunter2', ['bob']) == dict(score=1, sequence=[])
+    assert cache.get('hunter2') is None
+    assert cache.get('hunter2', ['bob'], context=['other']) is None
+
+
+def test_nothing_kept_in_the_clear():
+    cache = ResultCache()
+    cache.put('hunter2', ['bob'], dict(matched_word='hunter'))
+    (key, value), = cache.store._data.items()
+    for secret in (b'hunter', b'bob'):
+        assert secret not in key and secret not in value
+
+
+def test_swapped_entries_read_as_misses():
+    cache = ResultCache()
+    cache.put('hunter2', (), dict(score=1, sequence=[dict(token='hunter')] * 5))
+    cache.put('correcthorse', (), dict(score=4, sequence=[]))
+    data = cache.store._data
+    first, second = list(data)
+    data[first], data[second] = data[second], data[first]
+    assert cache.get('hunter2') is None
+    assert cache.get('correcthorse') is None
+    assert cache.info()['rejected'] == 2
+
+
+def test_other_secret_reads_as_miss(tmp_path):
+    path = str(tmp_path / 'results.sqlite')
+    mine = ResultCache(secret=b'1' * 32, store=SQLiteStore(path))
+    mine.put('hunter2', (), dict(score=1))
+    assert ResultCache(secret=b'1' * 32, store=SQLiteStore(path)).get('hunter2') == dict(score=1)
+    assert ResultCache(secret=b'2' * 32, store=SQLiteStore(path)).get('hunter2') is None
+
+
+def test_estimator_hits_match_uncached():
+    estimator = zxcvbn.Estimator(cache=ResultCache())
+    for password, user_inputs in [('Tr0ub4dour&3', []), ('plorbix2016', ['plorbix']), ('', [])]:
+        expected = comparable(zxcvbn.Estimator().password_strength(password, user_inputs))
+        assert comparable(estimator.password_strength(password, user_inputs)) == expected
+        assert comparable(estimator.password_strength(password, user_inputs)) == expected
+    assert estimator.cache.info()['hits'] == 3
+
+
+def test_estimators_sharing_a_cache_keep_apart():
+    cache = ResultCache()
+    rare = zxcvbn.Estimator(dictionaries=dict(words=dict(plorbix=9999999)), cache=cache)
+    common = zxcvbn.Estimator(dictionaries=dict(words=dict(plorbix=1)), cache=cache)
+    assert rare.password_strength('plorbix')['guesses'] == 10000001
+    assert common.password_strength('plorbix')['guesses'] == 3
+    assert rare.password_strength('plorbix')['guesses'] == 10000001
+
+
+def test_dicts_edited_in_place_are_seen():
+    words = dict(plorbix=5000)
+    estimator = zxcvbn.Estimator(dictionaries=dict(words=words), cache=ResultCache())
+    assert estimator.password_strength('plorbix')['guesses'] == 5002
+    words['plorbix'] = 1
+    assert estimator.password_strength('plorbix')['guesses'] == 3
+
+
+def test_layouts_count_by_content():
+    graph = dict(a=['b', None], b=[None, 'a'])
+    first = zxcvbn.layouts.register_layout('test_cache_layout', graph)
+    assert zxcvbn.layouts.register_layout('test_cache_layout', dict(graph))['version'] == first['version']
+    other = zxcvbn.layouts.register_layout('test_cache_layout', dict(graph, c=['a', None]))
+    assert other['version'] != first['version']
+
+
+def test_tampered_entries_read_as_misses():
+    cache = ResultCache()
+    cache.put('hunter2', (), dict(score=1))
+    (key, value), = cache.store._data.items()
+    for k in [0, 20, len(value) - 1]:
+        cache.store._data[key] = value[:k] + bytes([value[k] ^ 1]) + value[k + 1:]
+        assert cache.get('hunter2') is None
+    cache.store._data[key] = value
+    assert cache.get('hunter2') == dict(score=1)
+    assert cache.info()['rejected'] == 3
+
+
+def test_expired_and_evicted_entries_are_misses():
+    now = [0.0]
+    cache = ResultCache(store=zxcvbn.cache.LRUCache(maxsize=2, ttl=10, _clock=lambda: now[0]))
+    for password in ['one', 'two', 'three']:
+        cache.put(password, (), dict(password=password))
+    assert cache.get('one') is None
+    assert cache.get('three') == dict(password='three')
+    now[0] = 11.0
+    assert cache.get('three') is None
+    off = ResultCache(maxsize=0)
+    off.put('one', (), dict(password='one'))
+    assert len(off) == 0 and off.get('one') is None
+
+
+def test_sqlite_store_is_bounded_and_shared(tmp_path):
+    path = str(tmp_path / 'results.sqlite')
+    writer = ResultCache(secret=b'1' * 32, store=SQLiteStore(path, maxsize=3))
+    for n in range(5):
+        writer.put('password%d' % n, (), dict(n=n))
+    reader = ResultCache(secret=b'1' * 32, store=SQLiteStore(path, maxsize=3))
+    assert len(reader) == 3
+    assert reader.get('password4') == dict(n=4)
+    assert reader.get('password0') is None
@@ -0,0 +1,109 @@
+"""
+most_guessable_match_sequence against the dict-based search it replaced, which is
+kept here as the reference.
+"""
+import math
+import random
+import tracemalloc
+
+from zxcvbn import matching, scoring
+
+PIECES = ['password', 'dragon', 'qwerty', '1990', '12/25/1988', 'abcdef', 'zxcvbn', 'P@ssw0rd',
+          'monkey', 'abcabcabc', '!!', 'Sunshine', '2468', 'x7#q', 'letmein', 'asdfgh']
+
+
+def dict_search(password, matches, _exclude_additive=False):
+    n = len(password)
+    matches_by_j = [[] for _ in range(0, n)]
+    for m in matches:
+        matches_by_j[m['j']].append(m)
+    optimal = {'m': [{} for _ in range(0, n)], 'pi': [{} for _ in range(0, n)],
+               'g': [float('inf') for _ in range(0, n)], 'l': [0 for _ in range(0, n)]}
+
+    def update(m, l):
+        k = m['j']
+        pi = scoring.estimate_guesses(m, password)
+        if l > 1:
+            pi *= optimal['pi'][m['i'] - 1][l - 1]
+        g = math.factorial(l) * pi
+        if not _exclude_additive:
+            g += scoring.MIN_GUESSES_BEFORE_GROWING_SEQUENCE ** (l - 1)
+        if g < optimal['g'][k]:
+            optimal['g'][k] = g
+            optimal['l'][k] = l
+            optimal['m'][k][l] = m
+            optimal['pi'][k][l] = pi
+
+    def make_bruteforce_match(i, j):
+        return dict(pattern='bruteforce', token=password[i:j+1], i=i, j=j)
+
+    for k in range(0, n):
+        for m in matches_by_j[k]:
+            if m['i'] > 0:
+                for l in list(optimal['m'][m['i'] - 1].keys()):
+                    update(m, l + 1)
+            else:
+                update(m, 1)
+        update(make_bruteforce_match(0, k), 1)
+        if k == 0:
+            continue
+        for l, last_m in list(optimal['m'][k - 1].items()):
+            if last_m['pattern'] == 'bruteforce':
+                update(make_bruteforce_match(last_m['i'], k), l)
+            else:
+                update(make_bruteforce_match(k, k), l + 1)
+    sequence = []
+    k = n - 1
+    l = optimal['l'][k]
+    while k >= 0:
+        m = optimal['m'][k][l]
+        sequence.insert(0, m)
+        k = m['i'] - 1
+        l -= 1
+    return dict(password=password, guesses=optimal['g'][n - 1],
+                guesses_log10=math.log(optimal['g'][n - 1], 10), sequence=sequence)
+
+
+def make_password(rng, length):
+    password = ''
+    while len(password) < length:
+        password += rng.choice(PIECES) + rng.choice(['', '1', '!', '7'])
+    return password[:length]
+
+
+def same_search(password, matches, exclude_additive=False):
+    got = scoring.most_guessable_match_sequence(password, [dict(m) for m in matches],
+                                                _exclude_additive=exclude_additive)
+    want = dict_search(password, [dict(m) for m in matches], _exclude_additive=exclude_additive)
+    return got == want
+
+
+def test_same_sequences_as_dict_search():
+    rng = random.Random(0)
+    for length in [1, 2, 8, 16, 32, 63, 64, 65, 128]:
+        for _ in range(5):
+            password = make_password(rng, length)
+            matches = matching.omnimatch(password)
+            assert same_search(password, matches), password
+            assert same_search(password, matches, exclude_additive=True), password
+
+
+def test_empty_password():
+    assert scoring.most_guessable_match_sequence('', []) == \
+        dict(password='', guesses=1, guesses_log10=0.0, sequence=[])
+
+
+def test_long_password_stays_small():
+    rng = random.Random(1)
+    password = 'password' + ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz0123456789') for _ in range(2992))
+    matches = matching.dictionary_match('password')[:1]
+    tracemalloc.start()
+    try:
+        result = scoring.most_guessable_match_sequence(password, [dict(m) for m in matches])
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert result == dict_search(password, [dict(m) for m in matches])
+    # the bruteforce guesses up to 10**3000 alone take about 2 MB.
+    assert peak < 20e6
+    assert len(scoring._SEQUENCE_TERMS[0]) == scoring.SEQUENCE_TERMS_LENGTH
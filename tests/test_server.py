@@ -0,0 +1,127 @@
+"""
+zxcvbn.server over a real socket: results match password_strength, requests arriving
+together are batched, connections are kept alive, bad requests get a 4xx answer, and
+/health and /metrics report what was served.
+"""
+import asyncio
+import json
+
+import zxcvbn
+from zxcvbn.server import MAX_BODY, Server
+
+PASSWORDS = ['hunter2', '', 'Tr0ub4dour&3', 'correcthorsebatterystaple', 'plorbix1987', 'hunter2']
+
+
+def comparable(result):
+    result = json.loads(json.dumps(dict(result)))
+    result.pop('calc_time', None)
+    return result
+
+
+async def request(port, method, path, body=None):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    payload = b'' if body is None else json.dumps(body).encode('utf-8')
+    writer.write(('%s %s HTTP/1.1\r\nContent-Length: %d\r\nConnection: close\r\n\r\n'
+                  % (method, path, len(payload))).encode('ascii') + payload)
+    status = int((await reader.readline()).split()[1])
+    while (await reader.readline()) != b'\r\n':
+        pass
+    data = json.loads(await reader.read())
+    writer.close()
+    return status, data
+
+
+def serve(client, **kwargs):
+    """ Runs client(port) against a Server(**kwargs) on a free port. """
+    kwargs.setdefault('max_delay', 0)
+
+    async def run():
+        server = Server(**kwargs)
+        listening = await server.start(port=0)
+        try:
+            return await client(listening.sockets[0].getsockname()[1])
+        finally:
+            listening.close()
+            server._batcher_task.cancel()
+    return asyncio.run(run())
+
+
+def test_bad_locales_are_refused():
+    async def client(port):
+        return [await request(port, 'POST', '/score', dict(password='hunter2', locale=locale))
+                for locale in ['../../../tmp/x', 'es' * 40, 'es', 'pt_BR']]
+    statuses = [status for status, _ in serve(client)]
+    assert statuses == [400, 400, 200, 200]
+
+
+def test_results_match_password_strength():
+    async def client(port):
+        requests = [request(port, 'POST', '/score', dict(password=password, user_inputs=user_inputs, locale=locale))
+                    for password in PASSWORDS for user_inputs in [[], ['plorbix']] for locale in [None, 'es']]
+        return await asyncio.gather(*requests)
+    found = serve(client, max_delay=0.05)
+    expected = [comparable(zxcvbn.password_strength(password, user_inputs, locale=locale))
+                for password in PASSWORDS for user_inputs in [[], ['plorbix']] for locale in [None, 'es']]
+    assert [status for status, _ in found] == [200] * len(expected)
+    assert [comparable(result) for _, result in found] == expected
+
+
+def test_fields():
+    async def client(port):
+        return await request(port, 'POST', '/score', dict(password='hunter2', fields=['score', 'nothing']))
+    assert serve(client) == (200, dict(score=zxcvbn.password_strength('hunter2')['score']))
+
+
+def test_bad_requests():
+    async def client(port):
+        return [(await request(port, method, path, body))[0] for method, path, body in [
+            ('GET', '/score', None),
+            ('POST', '/score', None),
+            ('POST', '/score', dict(user_inputs=[])),
+            ('POST', '/score', dict(password=1)),
+            ('POST', '/score', dict(password='hunter2', user_inputs='alice')),
+            ('POST', '/score', dict(password='x' * MAX_BODY)),
+            ('POST', '/health', None),
+            ('GET', '/nowhere', None),
+        ]]
+    assert serve(client) == [405, 400, 400, 400, 400, 413, 405, 404]
+
+
+def test_keep_alive():
+    async def client(port):
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        statuses = []
+        for password in ['hunter2', 'hunter3']:
+            body = json.dumps(dict(password=password, fields=['password'])).encode('utf-8')
+            writer.write(b'POST /score HTTP/1.1\r\nContent-Length: %d\r\n\r\n' % len(body) + body)
+            statuses.append(int((await reader.readline()).split()[1]))
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line == b'\r\n':
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.lower()] = value.strip()
+            assert headers['connection'] == 'keep-alive'
+            assert json.loads(await reader.readexactly(int(headers['content-length']))) == dict(password=password)
+        writer.close()
+        return statuses
+    assert serve(client) == [200, 200]
+
+
+def test_health_and_metrics():
+    async def client(port):
+        health = await request(port, 'GET', '/health')
+        await asyncio.gather(*[request(port, 'POST', '/score', dict(password=password)) for password in PASSWORDS])
+        await request(port, 'GET', '/nowhere')
+        return health, await request(port, 'GET', '/metrics')
+    (status, health), (status_metrics, metrics) = serve(client, max_delay=0.05)
+    assert (status, status_metrics) == (200, 200)
+    assert health['status'] == 'ok' and health['queued'] == 0
+    # the health request itself is counted, the metrics one not yet.
+    assert metrics['responses'] == {'200': len(PASSWORDS) + 1, '404': 1}
+    assert metrics['latency_window'] == len(PASSWORDS)
+    # requests arriving together are scored in fewer batches than there are requests.
+    assert 1 <= metrics['batches'] < len(PASSWORDS)
+    assert metrics['largest_batch'] > 1
+    assert all(value is not None for value in metrics['latency_ms'].values())
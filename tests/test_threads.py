@@ -0,0 +1,53 @@
+"""
+One Estimator shared by several threads: results must not leak between calls with
+different user_inputs or dictionaries.
+"""
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import zxcvbn
+import zxcvbn.matching
+
+THREADS = 8
+NAMES = ['qzxwvk', 'plorbix', 'zantrop', 'kwimble', 'frodzy', 'vexmira', 'glunder', 'hoxtak']
+
+
+def make_cases(rng, count):
+    cases = []
+    for _ in range(count):
+        user_inputs = rng.sample(NAMES, 2)
+        word = rng.choice(NAMES)  # a user input for some cases, a random word for others
+        password = rng.choice([word, word * 2, word + '2016', word.capitalize() + '!'])
+        cases.append((password, user_inputs))
+    return cases
+
+
+def summary(result):
+    return (result['guesses'], [(m['pattern'], m['token'], m.get('dictionary_name'), m.get('base_guesses'))
+                                for m in result['sequence']])
+
+
+def test_concurrent_scoring_matches_serial(fast_switching):
+    rng = random.Random(0)
+    estimator = zxcvbn.Estimator()
+    cases = make_cases(rng, 60)
+    expected = [summary(estimator.password_strength(pw, ui)) for pw, ui in cases]
+    jobs = list(range(len(cases))) * 5
+    rng.shuffle(jobs)
+    with ThreadPoolExecutor(THREADS) as pool:
+        results = list(pool.map(lambda k: (k, summary(estimator.password_strength(*cases[k]))), jobs))
+    assert [k for k, result in results if result != expected[k]] == []
+
+
+def test_user_inputs_do_not_stay_in_shared_dictionaries():
+    before = dict((name, len(ranked)) for name, ranked in zxcvbn.matching.load_ranked_dictionaries().items())
+    zxcvbn.password_strength('plorbix', ['plorbix'])
+    assert zxcvbn.password_strength('plorbix')['guesses'] > 1000
+    after = dict((name, len(ranked)) for name, ranked in zxcvbn.matching.load_ranked_dictionaries().items())
+    assert before == after
+
+
+def test_estimators_keep_their_own_dictionaries():
+    mine = zxcvbn.Estimator(dictionaries=dict(words=dict(plorbix=1)))
+    assert mine.password_strength('plorbix')['sequence'][0]['dictionary_name'] == 'words'
+    assert zxcvbn.password_strength('plorbix')['sequence'][0]['pattern'] == 'bruteforce'
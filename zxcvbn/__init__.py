@@ -1,19 +1,10 @@
 import zxcvbn.scoring
 import zxcvbn.main
 
-__all__ = ['password_strength']
+__all__ = ['password_strength', 'password_strength_many', 'meets_score', 'Estimator']
 
 password_strength = zxcvbn.main.password_strength
+password_strength_many = zxcvbn.main.password_strength_many
+meets_score = zxcvbn.main.meets_score
+Estimator = zxcvbn.main.Estimator
 
-
-if __name__ == '__main__':
-    import fileinput
-    ignored = ('match_sequence', 'password')
-
-    for line in fileinput.input():
-        pw = line.strip()
-        print("Password: " + pw)
-        out = password_strength(pw)
-        for key, value in out.iteritems():
-            if key not in ignored:
-                print("\t%s: %s" % (key, value))
@@ -0,0 +1,161 @@
+"""
+Scores newline-separated passwords and writes one json result per line, in order:
+
+    python -m zxcvbn [options] [file ...] > results.jsonl
+
+Reads the files given, or stdin ('-'), a chunk at a time, so inputs of any size stream
+through in constant memory. Each line, less its line ending, is one password.
+
+With --aggregate, writes a single zxcvbn.aggregate.Aggregate summary of the results
+instead; --save-aggregate also keeps its state, which --merge combines across runs.
+"""
+import argparse
+import io
+import json
+import os
+import sys
+import time
+
+import zxcvbn.aggregate
+import zxcvbn.main
+import zxcvbn.parallel
+
+
+def read_passwords(names, encoding, stats):
+    for name in names:
+        if name == '-':
+            stream = io.TextIOWrapper(sys.stdin.buffer, encoding=encoding, errors='surrogateescape')
+        else:
+            stream = open(name, encoding=encoding, errors='surrogateescape')
+        try:
+            while True:
+                start = time.time()
+                line = stream.readline()
+                stats['read'] += time.time() - start
+                if not line:
+                    break
+                stats['passwords'] += 1
+                yield line[:-1] if line.endswith('\n') else line
+        finally:
+            if name != '-':
+                stream.close()
+
+
+def score(passwords, args):
+    if args.workers == 1:
+        results = zxcvbn.main.password_strength_many(passwords, args.user_inputs, None, args.locale,
+                                                     args.chunksize)
+        if args.fields is None:
+            return results
+        return (dict((field, result[field]) for field in args.fields if field in result)
+                for result in results)
+    return zxcvbn.parallel.password_strength_parallel(passwords, args.user_inputs, None, args.locale,
+                                                      args.workers or None, args.chunksize, args.fields)
+
+
+def run(args, output, stats, aggregate=None):
+    results = score(read_passwords(args.files, args.encoding, stats), args)
+    while True:
+        start = time.time()
+        chunk = []
+        for result in results:
+            chunk.append(result)
+            if len(chunk) == args.chunksize:
+                break
+        stats['score'] += time.time() - start
+        if not chunk:
+            return
+        if aggregate is not None:
+            start = time.time()
+            aggregate.update(chunk)
+            stats['aggregate'] += time.time() - start
+            continue
+        start = time.time()
+        # json keeps lone surrogates (undecodable input bytes) as escapes.
+        data = ''.join(json.dumps(result) + '\n' for result in chunk)
+        stats['encode'] += time.time() - start
+        start = time.time()
+        output.write(data)
+        output.flush()
+        stats['write'] += time.time() - start
+
+
+def print_stats(stats, elapsed, workers, out):
+    # workers is None when scoring in this process.
+    # passwords are read as results are asked for, so scoring's time includes reading's.
+    stats['score'] -= stats['read']
+    out.write('%d passwords in %.2fs: %.0f passwords/s\n'
+              % (stats['passwords'], elapsed, stats['passwords'] / elapsed if elapsed else 0))
+    waiting = ' (waiting on %d workers)' % workers if workers else ''
+    for stage in ('read', 'score', 'encode', 'write', 'aggregate'):
+        out.write('%8s %8.2fs %5.1f%%%s\n' % (stage, stats[stage], 100 * stats[stage] / elapsed if elapsed else 0,
+                                             waiting if stage == 'score' else ''))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m zxcvbn', description=__doc__.strip().split('\n')[0])
+    parser.add_argument('files', nargs='*', default=['-'], metavar='file',
+                        help="files of passwords, one per line ('-' or none: stdin)")
+    parser.add_argument('-f', '--fields', type=lambda value: value.split(','),
+                        help='comma-separated keys of each result to write (default: all)')
+    parser.add_argument('-u', '--user-input', dest='user_inputs', action='append', default=[],
+                        help='a word to penalise, such as a name or email; may be repeated')
+    parser.add_argument('-j', '--workers', type=int, default=1,
+                        help='processes to score on, 0 for one per cpu (default: 1, this one)')
+    parser.add_argument('--chunksize', type=int, default=256, help='passwords per chunk (default: 256)')
+    parser.add_argument('--locale', help="language of feedback (default: the environment's)")
+    parser.add_argument('--encoding', default='utf-8', help='encoding of the input (default: utf-8)')
+    parser.add_argument('--aggregate', action='store_true',
+                        help='write one summary of all the results instead of each result')
+    parser.add_argument('--save-aggregate', metavar='FILE',
+                        help='also write the mergeable state of the aggregate to FILE (implies --aggregate)')
+    parser.add_argument('--merge', action='store_true',
+                        help='read files of saved aggregates instead of passwords, and summarise them together')
+    parser.add_argument('--resolution', type=float, default=0.1,
+                        help='width of the guesses_log10 histogram bins of the aggregate (default: 0.1)')
+    parser.add_argument('--stats', action='store_true',
+                        help='report throughput and the time spent in each stage on stderr')
+    args = parser.parse_args(argv)
+    if args.chunksize < 1:
+        parser.error('--chunksize must be at least 1')
+    if args.workers < 0:
+        parser.error('--workers must not be negative')
+    aggregate = None
+    if args.aggregate or args.save_aggregate or args.merge:
+        aggregate = zxcvbn.aggregate.Aggregate(args.resolution)
+        args.fields = zxcvbn.aggregate.FIELDS
+
+    if args.merge:
+        for name in args.files:
+            with (sys.stdin if name == '-' else open(name)) as f:
+                aggregate.merge(zxcvbn.aggregate.Aggregate.from_dict(json.load(f)))
+        return write_aggregate(aggregate, args)
+
+    stats = dict(passwords=0, read=0.0, score=0.0, encode=0.0, write=0.0, aggregate=0.0)
+    start = time.time()
+    try:
+        run(args, sys.stdout, stats, aggregate)
+    except BrokenPipeError:
+        # the reader went away (| head): stop quietly, without python's complaint at exit.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    except KeyboardInterrupt:
+        return 130
+    if args.stats:
+        workers = None if args.workers == 1 else args.workers or os.cpu_count()
+        print_stats(stats, time.time() - start, workers, sys.stderr)
+    if aggregate is not None:
+        return write_aggregate(aggregate, args)
+    return 0
+
+
+def write_aggregate(aggregate, args):
+    if args.save_aggregate:
+        with open(args.save_aggregate, 'w') as f:
+            json.dump(aggregate.to_dict(), f)
+    sys.stdout.write(json.dumps(aggregate.summary()) + '\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,7 +1,15 @@
+import zxcvbn.layouts
+import zxcvbn.resources
 
-import pkg_resources
-import json
 
-data = pkg_resources.resource_string(__name__, 'generated/adjacency_graphs.json')
-graphs = json.loads(data.decode())
+def load_graphs():
+    """ {layout name: adjacency graph} for the layouts in zxcvbn.layouts.DEFAULT_LAYOUTS. """
+    return zxcvbn.resources.load_once('adjacency_graphs', lambda: dict(
+        (layout['name'], layout['graph']) for layout in zxcvbn.layouts.get_layouts()))
 
+
+def __getattr__(name):
+    # graphs is loaded on first access rather than at import.
+    if name == 'graphs':
+        return load_graphs()
+    raise AttributeError('module %r has no attribute %r' % (__name__, name))
@@ -1,7 +1,8 @@
+from zxcvbn.adjacency import load_graphs
 
-import pkg_resources
-import json
-
-data = pkg_resources.resource_string(__name__, 'generated/adjacency_graphs.json')
-adjacency_graphs = json.loads(data.decode())
 
+def __getattr__(name):
+    # same graphs as zxcvbn.adjacency.graphs; the json is only parsed once.
+    if name == 'adjacency_graphs':
+        return load_graphs()
+    raise AttributeError('module %r has no attribute %r' % (__name__, name))
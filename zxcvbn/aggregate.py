@@ -0,0 +1,203 @@
+"""
+Aggregate statistics over any number of password_strength results, for audits that
+need the shape of a corpus rather than each password's result.
+
+An Aggregate keeps counts only, never passwords: how many results had each score,
+a histogram of guesses_log10 (fine enough to read quantiles off to within half a
+bin), how many matches had each pattern and dictionary, and an estimate of the most
+often matched dictionary words. Its size depends on its settings, not on how many
+results it has seen. Aggregates of separate shards merge into the counts a single
+pass would have given, except for the word counts, which stay within words_error of
+the true ones (see Aggregate):
+
+    total = Aggregate()
+    for shard in shards:
+        total.merge(Aggregate.from_dict(json.load(open(shard))))
+
+`python -m zxcvbn --aggregate` writes one for its input.
+"""
+import collections
+import math
+
+# the keys of a result an Aggregate reads; the others needn't be computed or sent.
+FIELDS = ['score', 'guesses_log10', 'sequence']
+QUANTILES = [0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99]
+
+
+class Aggregate(object):
+    """
+    Counts over results. guesses_log10 is binned resolution wide. At most words
+    matched words are counted at once; when more turn up, every count drops by the
+    same amount (see _compact), so a word's count may be short by up to
+    words_error, and words seen less often than that may be missing.
+    """
+
+    def __init__(self, resolution=0.1, words=1000):
+        self.resolution = resolution
+        self.words = words
+        self.count = 0
+        self.scores = collections.Counter()
+        self.bins = collections.Counter()
+        self.log10_sum = 0.0
+        self.log10_min = None
+        self.log10_max = None
+        self.patterns = collections.Counter()
+        self.dictionaries = collections.Counter()
+        self.word_counts = collections.Counter()
+        self.words_error = 0
+
+    def add(self, result):
+        """ Counts one password_strength result (all of it, or at least FIELDS). """
+        self.count += 1
+        if 'score' not in result:
+            # the empty password's result.
+            self.scores[None] += 1
+            return
+        self.scores[result['score']] += 1
+        log10 = result['guesses_log10']
+        self.bins[int(math.floor(log10 / self.resolution))] += 1
+        self.log10_sum += log10
+        if self.log10_min is None or log10 < self.log10_min:
+            self.log10_min = log10
+        if self.log10_max is None or log10 > self.log10_max:
+            self.log10_max = log10
+        for match in result['sequence']:
+            self.patterns[match['pattern']] += 1
+            if match['pattern'] == 'dictionary':
+                self.dictionaries[match['dictionary_name']] += 1
+                self.word_counts[match['matched_word']] += 1
+        if len(self.word_counts) > self.words:
+            self._compact()
+
+    def update(self, results):
+        """ Counts each of the iterable results; returns self. """
+        for result in results:
+            self.add(result)
+        return self
+
+    def _compact(self):
+        # Misra-Gries: take the count of the (words / 2 + 1)th most frequent word off
+        # every word, dropping those left with nothing, so half the room is free again.
+        # No word is then undercounted by more than the sum of what was taken off.
+        keep = self.words // 2
+        if len(self.word_counts) <= keep:
+            return
+        cut = sorted(self.word_counts.values(), reverse=True)[keep]
+        for word, count in list(self.word_counts.items()):
+            if count <= cut:
+                del self.word_counts[word]
+            else:
+                self.word_counts[word] = count - cut
+        self.words_error += cut
+
+    def merge(self, other):
+        """ Adds other's counts to these; both must have the same resolution. Returns self. """
+        if other.resolution != self.resolution:
+            raise ValueError('cannot merge aggregates of resolutions %r and %r'
+                             % (self.resolution, other.resolution))
+        self.count += other.count
+        self.scores.update(other.scores)
+        self.bins.update(other.bins)
+        self.log10_sum += other.log10_sum
+        for value in (other.log10_min, other.log10_max):
+            if value is not None:
+                self.log10_min = value if self.log10_min is None else min(self.log10_min, value)
+                self.log10_max = value if self.log10_max is None else max(self.log10_max, value)
+        self.patterns.update(other.patterns)
+        self.dictionaries.update(other.dictionaries)
+        self.word_counts.update(other.word_counts)
+        self.words_error += other.words_error
+        self.words = min(self.words, other.words)
+        if len(self.word_counts) > self.words:
+            self._compact()
+        return self
+
+    #---------------------------------------------------------------------------
+    # reading ------------------------------------------------------------------
+    #---------------------------------------------------------------------------
+
+    def quantile(self, q):
+        """ The guesses_log10 that a fraction q of the results are below, to within
+        resolution / 2; None if there are none.
+        """
+        total = sum(self.bins.values())
+        if not total:
+            return None
+        rank = q * total
+        seen = 0
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if seen >= rank:
+                middle = (index + 0.5) * self.resolution
+                return min(max(middle, self.log10_min), self.log10_max)
+        return self.log10_max
+
+    def top_words(self, n=20):
+        """ [(word, count)] for the n words counted most often, most often first; each
+        count may be up to words_error short.
+        """
+        return sorted(self.word_counts.items(), key=lambda item: (-item[1], item[0]))[:n]
+
+    def summary(self, n=20):
+        """ The counts as a json-friendly dict, with quantiles and the top n words. """
+        scored = sum(self.bins.values())
+        return dict(
+            count=self.count,
+            scores=dict((str(score), count) for score, count in sorted(self.scores.items(), key=_score_order)),
+            guesses_log10=dict(
+                min=self.log10_min,
+                max=self.log10_max,
+                mean=self.log10_sum / scored if scored else None,
+                quantiles=dict(('%g' % q, self.quantile(q)) for q in QUANTILES)),
+            patterns=dict(self.patterns.most_common()),
+            dictionaries=dict(self.dictionaries.most_common()),
+            top_words=[[word, count] for word, count in self.top_words(n)],
+            words_error=self.words_error)
+
+    #---------------------------------------------------------------------------
+    # serialising --------------------------------------------------------------
+    #---------------------------------------------------------------------------
+
+    def to_dict(self):
+        """ Everything needed to rebuild this aggregate with from_dict, json-friendly. """
+        return dict(
+            resolution=self.resolution,
+            words=self.words,
+            count=self.count,
+            scores=[[score, count] for score, count in sorted(self.scores.items(), key=_score_order)],
+            bins=[[index, count] for index, count in sorted(self.bins.items())],
+            log10_sum=self.log10_sum,
+            log10_min=self.log10_min,
+            log10_max=self.log10_max,
+            patterns=dict(self.patterns),
+            dictionaries=dict(self.dictionaries),
+            word_counts=dict(self.word_counts),
+            words_error=self.words_error)
+
+    @classmethod
+    def from_dict(cls, data):
+        aggregate = cls(data['resolution'], data['words'])
+        aggregate.count = data['count']
+        aggregate.scores.update(dict((score, count) for score, count in data['scores']))
+        aggregate.bins.update(dict((index, count) for index, count in data['bins']))
+        aggregate.log10_sum = data['log10_sum']
+        aggregate.log10_min = data['log10_min']
+        aggregate.log10_max = data['log10_max']
+        aggregate.patterns.update(data['patterns'])
+        aggregate.dictionaries.update(data['dictionaries'])
+        aggregate.word_counts.update(data['word_counts'])
+        aggregate.words_error = data['words_error']
+        return aggregate
+
+    def __eq__(self, other):
+        return isinstance(other, Aggregate) and self.to_dict() == other.to_dict()
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+
+def _score_order(item):
+    # None, the empty password's, first.
+    return -1 if item[0] is None else item[0]
@@ -0,0 +1,141 @@
+"""
+Scoring passwords from asyncio code without blocking the event loop.
+
+password_strength can take tens of milliseconds on long passwords, all of it holding
+the loop up when called from a coroutine. password_strength_async runs it on an
+executor instead, and AsyncScorer bounds how much work is in flight there:
+
+    scorer = zxcvbn.aio.AsyncScorer('process', workers=4)
+    result = await scorer.password_strength(password, user_inputs, timeout=1)
+
+Calls beyond limit wait for a slot before anything is submitted, so a burst queues
+in the loop rather than in the executor. Cancelling a call (or its timeout expiring)
+withdraws work that hasn't started; work already running finishes in the background,
+keeping its slot until it does.
+
+Threads share the process's estimator but not the cpu: scoring is pure python, so
+with threads the loop stays responsive while throughput stays that of one core.
+Processes (see zxcvbn.parallel.process_pool) add cores, at the cost of sending every
+password and result between processes.
+"""
+import asyncio
+import concurrent.futures
+import functools
+import os
+import weakref
+
+import zxcvbn.main
+import zxcvbn.parallel
+import zxcvbn.resources
+
+
+class AsyncScorer(object):
+    """
+    Scores passwords on executor: 'thread' or 'process' for a pool of workers threads
+    or processes (default: one per cpu) made here and shut down by close(), or any
+    concurrent.futures executor, which stays the caller's. At most limit (default:
+    workers) calls are submitted at a time, per event loop; in_flight counts them.
+    estimator (default: the shared default one) scores the passwords; with processes
+    it needs fork.
+    """
+
+    def __init__(self, executor='thread', workers=None, limit=None, estimator=None):
+        workers = workers or os.cpu_count() or 1
+        self._owned = executor in ('thread', 'process')
+        if executor == 'thread':
+            executor = concurrent.futures.ThreadPoolExecutor(workers, thread_name_prefix='zxcvbn')
+        elif executor == 'process':
+            executor = zxcvbn.parallel.process_pool(workers, estimator)
+        self.executor = executor
+        # a process pool made elsewhere scores with its workers' own default estimator.
+        self._processes = isinstance(executor, concurrent.futures.ProcessPoolExecutor)
+        self.estimator = estimator
+        self.limit = limit or workers
+        self.in_flight = 0
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    def _semaphore(self):
+        # an asyncio.Semaphore belongs to one loop, so each loop gets its own.
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.limit)
+        return semaphore
+
+    def _call(self, password, user_inputs, layouts, locale, fields):
+        if self._processes:
+            return functools.partial(_first, zxcvbn.parallel._score_chunk,
+                                     [password], user_inputs, layouts, locale, fields)
+        estimator = self.estimator or zxcvbn.main._default_estimator()
+        return functools.partial(_score, estimator, password, user_inputs, layouts, locale, fields)
+
+    async def password_strength(self, password, user_inputs=[], layouts=None, locale=None,
+                                fields=None, timeout=None):
+        """
+        password_strength(password, user_inputs, layouts, locale), or with processes or
+        fields a plain dict of its fields (default: all). Raises asyncio.TimeoutError if
+        that takes over timeout seconds, waiting for a slot included.
+        """
+        call = self._call(password, user_inputs, layouts, locale, fields)
+        if timeout is None:
+            return await self._run(call)
+        return await asyncio.wait_for(self._run(call), timeout)
+
+    async def _run(self, call):
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphore()
+        await semaphore.acquire()
+        try:
+            future = self.executor.submit(call)
+        except BaseException:
+            semaphore.release()
+            raise
+        self.in_flight += 1
+
+        def release():
+            self.in_flight -= 1
+            semaphore.release()
+        # the slot is freed when the work ends, not when its caller stops waiting for it.
+        future.add_done_callback(lambda _: _call_soon(loop, release))
+        return await asyncio.wrap_future(future)
+
+    def close(self, wait=True):
+        """ Shuts down the executor made here, withdrawing work that hasn't started. """
+        if self._owned:
+            self.executor.shutdown(wait=wait, cancel_futures=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        # waiting for running work would block the loop, so it finishes in the background.
+        self.close(wait=False)
+
+
+def _score(estimator, password, user_inputs, layouts, locale, fields):
+    result = estimator.password_strength(password, user_inputs, layouts, locale)
+    if fields is None:
+        return result
+    return dict((field, result[field]) for field in fields if field in result)
+
+
+def _first(function, *args):
+    return function(*args)[0]
+
+
+def _call_soon(loop, callback):
+    try:
+        loop.call_soon_threadsafe(callback)
+    except RuntimeError:
+        # the loop is closed, and its semaphore with it.
+        pass
+
+
+def _default_scorer():
+    return zxcvbn.resources.load_once('default_async_scorer', AsyncScorer)
+
+
+async def password_strength_async(password, user_inputs=[], layouts=None, locale=None, timeout=None):
+    """ password_strength on a shared AsyncScorer of threads. """
+    return await _default_scorer().password_strength(password, user_inputs, layouts, locale,
+                                                      timeout=timeout)
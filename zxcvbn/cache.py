@@ -0,0 +1,76 @@
+"""
+A bounded, thread-safe LRU cache that counts its hits, misses and evictions, for
+analysis that is expensive to redo and cheap to keep.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache(object):
+    """ Keeps the maxsize most recently used entries; maxsize 0 disables the cache.
+    With a ttl, entries also expire ttl seconds after they were put.
+    """
+
+    def __init__(self, maxsize=1024, ttl=None, _clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._expires = {}
+        self._clock = _clock
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            if self.ttl is not None and self._expires.get(key, float('inf')) <= self._clock():
+                del self._data[key]
+                del self._expires[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if self.ttl is not None:
+                self._expires[key] = self._clock() + self.ttl
+            self._trim()
+
+    def _trim(self):
+        while len(self._data) > max(self.maxsize, 0):
+            key, _ = self._data.popitem(last=False)
+            self._expires.pop(key, None)
+            self.evictions += 1
+
+    def resize(self, maxsize):
+        with self._lock:
+            self.maxsize = maxsize
+            self._trim()
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._expires.clear()
+            self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def info(self):
+        """ {hits, misses, evictions, expirations, size, maxsize} """
+        with self._lock:
+            return dict(hits=self.hits, misses=self.misses, evictions=self.evictions,
+                        expirations=self.expirations, size=len(self._data), maxsize=self.maxsize)
@@ -0,0 +1,129 @@
+"""
+Precomputed password_strength results for the most common passwords.
+
+generated/common_results.txt.gz, written by scripts/build_common_results.py, holds the
+guesses, score and match sequence of every password in the 'passwords' frequency list
+and of its variants (see variants). The first line is a json header: the fingerprint
+of the engine the table was built with, and the key lists ("shapes") its matches are
+encoded against. Each further line is
+
+    password <tab> guesses <tab> score <tab> json sequence
+
+where every match is [shape index, values...], without its token and guesses_log10,
+which follow from the password. Lines are only decoded when their password is looked
+up. The table is ignored if the fingerprint doesn't match the running engine.
+"""
+import gzip
+import json
+import math
+
+import zxcvbn.layouts
+import zxcvbn.matching
+import zxcvbn.resources
+import zxcvbn.scoring
+
+TABLE = 'common_results.txt.gz'
+_DERIVED = ('token', 'guesses_log10')
+
+
+def variants(word):
+    """ The passwords the table holds for word: itself, capitalised, and both with a trailing 1. """
+    capitalised = word[:1].upper() + word[1:]
+    return sorted({word, capitalised, word + '1', capitalised + '1'})
+
+
+def fingerprint():
+    """ What the table's results depend on: the bundled dictionaries, the default layouts
+    and the reference year, normalised as json would give them back.
+    """
+    dictionaries = zxcvbn.matching.load_ranked_dictionaries()
+    layouts = zxcvbn.layouts.get_layouts()
+    return json.loads(json.dumps(dict(
+        dictionaries=dict((name, len(ranked_dict)) for name, ranked_dict in dictionaries.items()),
+        layouts=[[layout['name'], layout['average_degree'], layout['starting_positions'], len(layout['graph'])]
+                 for layout in layouts],
+        reference_year=zxcvbn.scoring.REFERENCE_YEAR)))
+
+
+#-------------------------------------------------------------------------------
+# encoding ---------------------------------------------------------------------
+#-------------------------------------------------------------------------------
+
+def encode_match(match, shapes):
+    keys = tuple(match)
+    shape = shapes.setdefault(keys, len(shapes))
+    return [shape] + [[encode_match(m, shapes) for m in match[key]] if key == 'base_matches' else match[key]
+                      for key in keys if key not in _DERIVED]
+
+
+def encode_line(result, shapes):
+    """ result, a password_strength result, as a table line. """
+    return '\t'.join([result['password'], repr(result['guesses']), str(result['score']),
+                      json.dumps([encode_match(m, shapes) for m in result['sequence']],
+                                 separators=(',', ':'))])
+
+
+def decode_match(encoded, shapes, password):
+    values = iter(encoded[1:])
+    match = {}
+    for key in shapes[encoded[0]]:
+        match[key] = None if key in _DERIVED else next(values)
+    match['token'] = password[match['i']:match['j'] + 1]
+    match['guesses_log10'] = math.log(match['guesses'], 10)
+    if 'base_matches' in match:
+        match['base_matches'] = [decode_match(m, shapes, match['base_token'])
+                                 for m in match['base_matches']]
+    return match
+
+
+#-------------------------------------------------------------------------------
+# lookup -----------------------------------------------------------------------
+#-------------------------------------------------------------------------------
+
+def load_table():
+    """ Returns (shapes, {password: undecoded rest of its line}), or None when the table
+    is missing or was built for a different engine.
+    """
+    def load():
+        try:
+            data = zxcvbn.resources.read_bytes(TABLE)
+        except (IOError, OSError):
+            return None
+        lines = gzip.decompress(data).decode('utf-8').split('\n')
+        header = json.loads(lines[0])
+        if header['fingerprint'] != fingerprint():
+            return None
+        entries = {}
+        for line in lines[1:]:
+            if line:
+                password, _, rest = line.partition('\t')
+                entries[password] = rest
+        return header['shapes'], entries
+    return zxcvbn.resources.load_once(TABLE, load)
+
+
+def lookup_score(password):
+    """ (guesses, score) for password, or None if it isn't in the table. """
+    table = load_table()
+    rest = table and table[1].get(password)
+    if not rest:
+        return None
+    guesses, score, _ = rest.split('\t', 2)
+    return json.loads(guesses), int(score)
+
+
+def lookup(password):
+    """ A fresh {password, guesses, guesses_log10, sequence} for password, as
+    most_guessable_match_sequence returns it, or None if it isn't in the table.
+    """
+    table = load_table()
+    rest = table and table[1].get(password)
+    if not rest:
+        return None
+    shapes = table[0]
+    guesses, _, sequence = rest.split('\t', 2)
+    guesses = json.loads(guesses)
+    return dict(password=password,
+                guesses=guesses,
+                guesses_log10=math.log(guesses, 10),
+                sequence=[decode_match(m, shapes, password) for m in json.loads(sequence)])
@@ -4,9 +4,9 @@ import re
 # (Used the same way in the original zxcvbn)
 from zxcvbn import scoring
 # I18N
-from zxcvbn.i18n import _
+from zxcvbn.i18n import _, N_
 
-# Default feedback value
+# Default feedback value, in the environment's locale
 FEEDBACK = {
     "warning": "",
     "suggestions":[
@@ -14,6 +14,11 @@ FEEDBACK = {
         _("Symbols, digits, or uppercase letters are not required."),
     ],
 }
+# the same suggestions, for the locale of each call
+DEFAULT_SUGGESTIONS = [
+    N_("Use a few words. Avoid common phrases."),
+    N_("Symbols, digits, or uppercase letters are not required."),
+]
 
 def get_feedback (score, sequence):
     """
@@ -40,19 +45,20 @@ def get_feedback (score, sequence):
         }
     return feedback
 
-def get_all_feedback (score, sequence):
+def get_all_feedback (score, sequence, _=_):
     """
-    Returns the feedback dictionary consisting of {"warnings":[], "suggestions":[]} for the given sequences.
+    Returns the feedback dictionary consisting of {"warnings":[], "suggestions":[]} for the given sequences,
+    translated with _ (default: the environment's locale; see zxcvbn.i18n.get_translation).
     """
     # Starting feedback
     feedback = dict(warnings=[],suggestions=[])
 
     if len(sequence) == 0:
-        feedback['suggestions'].extend(FEEDBACK['suggestions'])
+        feedback['suggestions'].extend(_(suggestion) for suggestion in DEFAULT_SUGGESTIONS)
     
     # No feedback if score is good or great
     elif score <= 2:
-        _all_feedback = [fdbk for fdbk in [get_match_feedback(item, len(sequence) == 1) for item in sequence] if fdbk]
+        _all_feedback = [fdbk for fdbk in [get_match_feedback(item, len(sequence) == 1, _) for item in sequence] if fdbk]
 
         # If no concrete feedback is returned, give more general feedback
         if not _all_feedback:
@@ -70,56 +76,43 @@ def get_all_feedback (score, sequence):
         
 
 
-def get_match_feedback(match, is_sole_match):
+def get_match_feedback(match, is_sole_match, _=_):
     """
     Returns feedback as a dictionary for a certain match
     """
-    # Define a number of functions that are used in a look up dictionary
-    def fun_bruteforce():
-        return None
-    def fun_dictionary():
-        # If the match is of type dictionary, call specific function
-        return get_dictionary_match_feedback(match, is_sole_match)
-    def fun_spatial():
+    pattern = match['pattern']
+    if pattern == "dictionary":
+        return get_dictionary_match_feedback(match, is_sole_match, _)
+    elif pattern == "spatial":
         if match["turns"] == 1:
-            feedback ={
-                "warning": _('Straight rows of keys are easy to guess.'),
-                "suggestions":[
-                     _("Use a longer keyboard pattern with more turns."),
-                ],
-            }
+            warning = _('Straight rows of keys are easy to guess.')
         else:
-            feedback ={
-                "warning": _('Short keyboard patterns are easy to guess.'),
-                "suggestions":[
-                     _("Use a longer keyboard pattern with more turns."),
-                ],
-            }
-        return feedback
-    def fun_repeat():
+            warning = _('Short keyboard patterns are easy to guess.')
+        return {
+            "warning": warning,
+            "suggestions":[
+                 _("Use a longer keyboard pattern with more turns."),
+            ],
+        }
+    elif pattern == "repeat":
         if len(match["base_token"]) == 1:
-            feedback ={
-                "warning": _('Repeats like "aaa" are easy to guess.'),
-                "suggestions":[
-                    _("Avoid repeated words and characters."),
-                ],
-            }
+            warning = _('Repeats like "aaa" are easy to guess.')
         else:
-            feedback ={
-                    "warning": _('Repeats like "abcabcabc" are only slightly harder to guess than "abc"'),
-                    "suggestions":[
-                        _("Avoid repeated words and characters."),
-                        ],
-                    }
-        return feedback
-    def fun_sequence():
+            warning = _('Repeats like "abcabcabc" are only slightly harder to guess than "abc"')
+        return {
+            "warning": warning,
+            "suggestions":[
+                _("Avoid repeated words and characters."),
+            ],
+        }
+    elif pattern == "sequence":
         return {
             "warning": _("Sequences like abc or 6543 are easy to guess."),
             "suggestions":[
                 _("Avoid sequences."),
             ],
         }
-    def fun_regex():
+    elif pattern == "regex":
         if match["regex_name"] == "recent_year":
             return {
                 "warning": _("Recent years are easy to guess."),
@@ -127,26 +120,17 @@ def get_match_feedback(match, is_sole_match):
                     _("Avoid recent years or years that are associated with you."),
                 ],
             }
-    def fun_date():
+    elif pattern == "date":
         return {
             "warning": _("Dates are often easy to guess."),
             "suggestions":[
                 _("Avoid dates that are associated with you."),
             ],
         }
-    # Dictionary that maps pattern names to funtions that return feedback
-    patterns = {
-        "bruteforce": fun_bruteforce,
-        "dictionary": fun_dictionary,
-        "spatial": fun_spatial,
-        "repeat": fun_repeat,
-        "sequence": fun_sequence,
-        "regex": fun_regex,
-        "date": fun_date,
-    }
-    return(patterns[match['pattern']]())
+    # bruteforce, and regexes other than recent_year, have no feedback
+    return None
 
-def get_dictionary_match_feedback(match, is_sole_match):
+def get_dictionary_match_feedback(match, is_sole_match, _=_):
     """
     Returns feedback for a match that is found in a dictionary
     """
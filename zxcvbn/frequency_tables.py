@@ -0,0 +1,330 @@
+"""
+Binary, memory-mappable form of generated/frequency_lists.json.
+
+Layout (all integers little-endian uint32, every section 4-byte aligned):
+
+    magic 'ZXFT0002', table count
+    trie: alphabet offset, alphabet length, slot count, base offset, check offset,
+          hit index offset, hits offset, hits length
+    per table: name offset, name length, word count, offsets offset, ranks offset, words offset
+    per table: utf-8 name, word offsets (count + 1), ranks (count), utf-8 words
+    trie sections: utf-8 alphabet, base, check, hit index (slot count each), hits
+
+Each word is followed by a newline, so a whole table decodes with one split.
+Words are sorted by their utf-8 bytes, so a lookup is a binary search straight over
+the mapped file: nothing is parsed at load time, and every process mapping the file
+shares the same page-cache pages.
+
+The words of all the tables are also compiled into one double-array trie, which
+dictionary_match walks in place (see DictionaryTrie), so matching doesn't build any
+index in process memory either.
+"""
+import collections
+import hashlib
+import itertools
+import mmap
+import struct
+import sys
+from collections.abc import Mapping
+
+MAGIC = b'ZXFT0002'
+_HEADER = struct.Struct('<8sI')
+_TRIE = struct.Struct('<8I')
+_ENTRY = struct.Struct('<6I')
+# marks a free slot in check: no node has that many slots.
+_FREE = 0xffffffff
+# numbers the tries loaded in this process; see DictionaryTrie.version.
+_versions = itertools.count(1)
+
+
+def _pad(data):
+    return data + b'\0' * (-len(data) % 4)
+
+
+def _pack(values):
+    return struct.pack('<%dI' % len(values), *values)
+
+
+def build_trie(ranked_dictionaries):
+    """ Compiles {dict_name: {word: rank}} into a double-array trie. Returns (alphabet,
+    base, check, hit_index, hits), as DictionaryTrie reads them.
+
+    Every character of the alphabet has a code from 1, most frequent first. The child of
+    the node in slot s for a character with code c is in slot base[s] + c if check of that
+    slot is s; nodes are placed breadth first, each at the lowest base that has free slots
+    for all of its children. hit_index[s], if not 0, is where the node's hits start in
+    hits: their count, then a (table number, rank) pair for each table holding the word,
+    in table order.
+    """
+    children = [{}]
+    node_hits = [[]]
+    frequency = {}
+    for table_no, ranked_dict in enumerate(ranked_dictionaries.values()):
+        for word, rank in ranked_dict.items():
+            node = 0
+            for char in word:
+                child = children[node].get(char)
+                if child is None:
+                    child = children[node][char] = len(children)
+                    children.append({})
+                    node_hits.append([])
+                    frequency[char] = frequency.get(char, 0) + 1
+                node = child
+            node_hits[node].append((table_no, rank))
+    alphabet = ''.join(sorted(frequency, key=lambda char: (-frequency[char], char)))
+    codes = dict((char, code) for code, char in enumerate(alphabet, 1))
+
+    # the free slots form a linked list from nxt[0], each pointing on to the next (or to
+    # size, past the last one, all slots from size on being free too) and back by prv.
+    size = 1
+    used = bytearray(size)
+    used[0] = 1
+    base = [0]
+    check = [_FREE]
+    nxt = [1]
+    prv = [0]
+    tail = 0
+    slots = [0] * len(children)
+
+    def grow(to):
+        nonlocal size, tail
+        used.extend(bytes(to - size))
+        base.extend([0] * (to - size))
+        check.extend([_FREE] * (to - size))
+        nxt.extend(range(size + 1, to + 1))
+        prv.extend([tail] + list(range(size, to - 1)))
+        size, tail = to, to - 1
+
+    queue = collections.deque([0])
+    while queue:
+        node = queue.popleft()
+        if not children[node]:
+            continue
+        child_codes = sorted((codes[char], child) for char, child in children[node].items())
+        first = child_codes[0][0]
+        # try the free slots for the first child, lowest first.
+        p = nxt[0]
+        while True:
+            if p + len(alphabet) >= size:
+                grow(p + 2 * len(alphabet) + 1)
+            b = p - first
+            if b >= 1 and not any(used[b + code] for code, _ in child_codes):
+                break
+            p = nxt[p]
+        base[slots[node]] = b
+        for code, child in child_codes:
+            slot = b + code
+            used[slot] = 1
+            nxt[prv[slot]] = nxt[slot]
+            if nxt[slot] < size:
+                prv[nxt[slot]] = prv[slot]
+            else:
+                tail = prv[slot]
+            check[slot] = slots[node]
+            slots[child] = slot
+            queue.append(child)
+    # room past the last base for every code, so base[s] + code never needs a bounds check.
+    size = max(max(slots), max(base) + len(alphabet)) + 1
+    base, check = base[:size], check[:size]
+    base.extend([0] * (size - len(base)))
+    check.extend([_FREE] * (size - len(check)))
+
+    hit_index = [0] * size
+    hits = [0]  # offset 0 stands for no hits
+    for node, found in enumerate(node_hits):
+        if found:
+            hit_index[slots[node]] = len(hits)
+            hits.append(len(found))
+            for table_no, rank in found:
+                hits.extend((table_no, rank))
+    return alphabet, base, check, hit_index, hits
+
+
+def write_frequency_tables(ranked_dictionaries, f):
+    """ Writes {dict_name: {word: rank}} to the binary file object f. """
+    alphabet, base, check, hit_index, hits = build_trie(ranked_dictionaries)
+    entries = []
+    sections = []
+    offset = _HEADER.size + _TRIE.size + _ENTRY.size * len(ranked_dictionaries)
+    for dict_name, ranked_dict in ranked_dictionaries.items():
+        words = sorted((word.encode('utf-8'), rank) for word, rank in ranked_dict.items())
+        name = _pad(dict_name.encode('utf-8'))
+        offsets = [0]
+        for word, _ in words:
+            offsets.append(offsets[-1] + len(word) + 1)
+        offsets = _pack(offsets)
+        ranks = _pack([rank for _, rank in words])
+        data = _pad(b''.join(word + b'\n' for word, _ in words))
+
+        name_off = offset
+        offsets_off = name_off + len(name)
+        ranks_off = offsets_off + len(offsets)
+        words_off = ranks_off + len(ranks)
+        offset = words_off + len(data)
+        entries.append(_ENTRY.pack(name_off, len(dict_name.encode('utf-8')), len(words),
+                                   offsets_off, ranks_off, words_off))
+        sections.extend([name, offsets, ranks, data])
+
+    trie_sections = [_pad(alphabet.encode('utf-8')), _pack(base), _pack(check), _pack(hit_index), _pack(hits)]
+    trie_offsets = []
+    for section in trie_sections:
+        trie_offsets.append(offset)
+        offset += len(section)
+    f.write(_HEADER.pack(MAGIC, len(ranked_dictionaries)))
+    f.write(_TRIE.pack(trie_offsets[0], len(alphabet.encode('utf-8')), len(base),
+                       trie_offsets[1], trie_offsets[2], trie_offsets[3], trie_offsets[4], len(hits)))
+    for entry in entries:
+        f.write(entry)
+    for section in sections + trie_sections:
+        f.write(section)
+
+
+def load_frequency_tables(path):
+    """ Maps the file at path and returns {dict_name: RankedTable}; the tables share one
+    DictionaryTrie.
+
+    Raises ValueError if the file is not a frequency table file this platform can read.
+    """
+    if sys.byteorder != 'little':
+        raise ValueError('frequency tables are only mapped on little-endian platforms')
+    with open(path, 'rb') as f:
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(buf)
+
+    def uints(offset, count):
+        if offset % 4 or offset + 4 * count > len(buf):
+            raise ValueError('%s is truncated or corrupt' % path)
+        return view[offset:offset + 4 * count].cast('I')
+
+    try:
+        magic, count = _HEADER.unpack_from(buf, 0)
+        if magic != MAGIC:
+            raise ValueError('%s is not a frequency table file' % path)
+        alphabet_off, alphabet_len, size, base_off, check_off, hit_index_off, hits_off, hits_len = \
+                _TRIE.unpack_from(buf, _HEADER.size)
+        entries = [_ENTRY.unpack_from(buf, _HEADER.size + _TRIE.size + k * _ENTRY.size) for k in range(count)]
+    except struct.error:
+        raise ValueError('%s is truncated' % path)
+    names = [bytes(view[name_off:name_off + name_len]).decode('utf-8') for name_off, name_len, _, _, _, _ in entries]
+    trie = DictionaryTrie(names, bytes(view[alphabet_off:alphabet_off + alphabet_len]).decode('utf-8'),
+                          uints(base_off, size), uints(check_off, size), uints(hit_index_off, size),
+                          uints(hits_off, hits_len))
+    tables = {}
+    for table_no, (name, (_, _, n, offsets_off, ranks_off, words_off)) in enumerate(zip(names, entries)):
+        offsets = uints(offsets_off, n + 1)
+        if words_off + offsets[n] > len(buf):
+            raise ValueError('%s is truncated or corrupt' % path)
+        tables[name] = RankedTable(offsets, uints(ranks_off, n), view[words_off:], trie, table_no)
+    return tables
+
+
+class DictionaryTrie(object):
+    """ The words of every table of a mapped file, as the double-array trie build_trie
+    describes, read in place. names are the tables' names by table number, and codes
+    maps each character of the alphabet to its code.
+
+    A walk starts at slot ROOT; from slot s, a character c leads to slot
+    t = base[s] + codes.get(c, 0) if check[t] == s, and nowhere otherwise.
+
+    The mapping is read-only, so a trie never changes: version, unique in the process,
+    stands for its content wherever a cache key needs to, and digest() where the key
+    must mean the same in every process.
+    """
+
+    ROOT = 0
+
+    def __init__(self, names, alphabet, base, check, hit_index, hits):
+        self.version = next(_versions)
+        self.names = names
+        self.codes = dict((char, code) for code, char in enumerate(alphabet, 1))
+        self.base = base
+        self.check = check
+        self.hit_index = hit_index
+        self.hits = hits
+        self._digest = None
+
+    def digest(self):
+        """ A digest of the trie, worked out on first use. Its hits hold every table's
+        words and ranks, so it stands for the whole file.
+        """
+        if self._digest is None:
+            digest = hashlib.blake2b(digest_size=16)
+            digest.update('\n'.join(self.names + [''.join(self.codes)]).encode('utf-8'))
+            for array in (self.base, self.check, self.hit_index, self.hits):
+                digest.update(array)
+            self._digest = digest.hexdigest()
+        return self._digest
+
+    def step(self, slot, char):
+        """ The slot reached from slot by char, or None. """
+        t = self.base[slot] + self.codes.get(char, 0)
+        return t if self.check[t] == slot else None
+
+    def find(self, word):
+        """ [(table number, rank)] for each table holding word. """
+        slot = self.ROOT
+        for char in word:
+            slot = self.step(slot, char)
+            if slot is None:
+                return []
+        return self.hits_at(slot)
+
+    def hits_at(self, slot):
+        h = self.hit_index[slot]
+        if not h:
+            return []
+        hits = self.hits
+        return [(hits[k], hits[k + 1]) for k in range(h + 1, h + 1 + 2 * hits[h], 2)]
+
+
+class RankedTable(Mapping):
+    """ Read-only {word: rank} mapping over one table of a mapped frequency table file. """
+
+    def __init__(self, offsets, ranks, words, trie=None, trie_id=None):
+        self._offsets = offsets
+        self._ranks = ranks
+        self._words = words
+        # this table's words are the hits numbered trie_id in trie.
+        self.trie = trie
+        self.trie_id = trie_id
+
+    def _word(self, k):
+        return bytes(self._words[self._offsets[k]:self._offsets[k + 1] - 1])
+
+    def _all_words(self):
+        n = len(self._ranks)
+        return bytes(self._words[:self._offsets[n]]).decode('utf-8').split('\n')[:n]
+
+    def _find(self, word):
+        if not isinstance(word, str):
+            return -1
+        target = word.encode('utf-8')
+        lo, hi = 0, len(self._ranks)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._word(mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(self._ranks) and self._word(lo) == target:
+            return lo
+        return -1
+
+    def __getitem__(self, word):
+        k = self._find(word)
+        if k < 0:
+            raise KeyError(word)
+        return self._ranks[k]
+
+    def __contains__(self, word):
+        return self._find(word) >= 0
+
+    def __len__(self):
+        return len(self._ranks)
+
+    def __iter__(self):
+        return iter(self._all_words())
+
+    def items(self):
+        # one sequential scan; much cheaper than the binary search Mapping.items would do per word.
+        return zip(self._all_words(), self._ranks)
@@ -1,6 +1,37 @@
 import gettext
 import os
 
+import zxcvbn.cache
+import zxcvbn.resources
+
 localedir = os.path.join(os.path.abspath(os.path.dirname(__file__)), 'locale')
+# the catalog for the environment's locale (LANGUAGE, LC_ALL, LC_MESSAGES, LANG).
 translate = gettext.translation('zxcvbn', localedir, fallback=True)
 _ = translate.gettext
+
+
+def N_(message):
+    """ Marks message for extraction without translating it; it is translated when used. """
+    return message
+
+
+# the catalog found for each locale asked for lately. catalogs are loaded once per .mo
+# file (or once for English), so however many locales callers send, only as many
+# catalogs as ship with the package are kept, and this many names.
+_catalogs = zxcvbn.cache.LRUCache(maxsize=256)
+
+
+def get_translation(locale=None):
+    """ The catalog for locale ('es', 'es_ES', ...), loaded the first time it is asked for;
+    None means the environment's, and a locale without a catalog falls back to English.
+    """
+    if locale is None:
+        return translate
+    catalog = _catalogs.get(locale)
+    if catalog is None:
+        mofile = gettext.find('zxcvbn', localedir, languages=[locale])
+        catalog = zxcvbn.resources.load_once(
+            ('catalog', mofile),
+            lambda: gettext.translation('zxcvbn', localedir, languages=[locale], fallback=True))
+        _catalogs.put(locale, catalog)
+    return catalog
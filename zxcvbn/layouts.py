@@ -0,0 +1,106 @@
+"""
+Keyboard layouts for spatial matching.
+
+Each bundled layout is one generated file, generated/layouts/<name>.json, holding its
+adjacency graph together with the average degree and starting-position count that
+spatial_guesses needs; scripts/build_keyboard_adjacency_graph.py writes them. Layouts
+are loaded the first time they are asked for, and further ones can be added at runtime
+with register_layout.
+"""
+from importlib import resources
+import hashlib
+import json
+
+import zxcvbn.resources
+
+# enabled unless an Estimator or a call asks for others. azerty and qwertz are bundled
+# but opt-in, so deployments that don't want them don't pay for matching them.
+DEFAULT_LAYOUTS = ['qwerty', 'dvorak', 'keypad', 'mac_keypad']
+
+_registered = {}
+
+
+def calc_average_degree(graph):
+    average = 0.0
+    for neighbors in graph.values():
+        average += len([n for n in neighbors if n])
+    average /= len(graph)
+    return average
+
+
+def compile_graph(graph):
+    """ Compiles an adjacency graph into a {prev_char + cur_char: (direction, shifted)} table.
+
+    direction is the position in graph[prev_char] of the first neighbour containing
+    cur_char; shifted is True when cur_char is the shifted key of that neighbour:
+    index 1 in the adjacency means the key is shifted, 0 means unshifted (A vs a, % vs 5).
+    for example, 'q' is adjacent to the entry '2@'. @ is shifted w/ index 1, 2 is unshifted.
+    """
+    table = {}
+    for prev_char, adjacents in graph.items():
+        for direction, adj in enumerate(adjacents):
+            for position, cur_char in enumerate(adj or ''):
+                table.setdefault(prev_char + cur_char, (direction, position == 1))
+    return table
+
+
+def _make_layout(name, graph, average_degree, starting_positions):
+    # layouts are read-only once made (transitions is compiled from graph here), so
+    # version, a digest of what they are made of, stands for their content in cache
+    # keys, the same in every process.
+    content = json.dumps([name, graph, average_degree, starting_positions], sort_keys=True)
+    return dict(name=name,
+                graph=graph,
+                average_degree=average_degree,
+                starting_positions=starting_positions,
+                transitions=compile_graph(graph),
+                version=hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest())
+
+
+def register_layout(name, graph, average_degree=None, starting_positions=None):
+    """ Adds (or replaces) the layout name, given its {char: [adjacent keys]} graph as
+    build_keyboard_adjacency_graph.build_graph makes it. The statistics are derived
+    from the graph unless given.
+    """
+    if average_degree is None:
+        average_degree = calc_average_degree(graph)
+    if starting_positions is None:
+        starting_positions = len(graph)
+    _registered[name] = _make_layout(name, graph, average_degree, starting_positions)
+    return _registered[name]
+
+
+def bundled_layout_names():
+    return sorted(entry.name[:-len('.json')]
+                  for entry in resources.files('zxcvbn').joinpath('generated', 'layouts').iterdir()
+                  if entry.name.endswith('.json'))
+
+
+def layout_names():
+    return sorted(set(bundled_layout_names()) | set(_registered))
+
+
+def get_layout(name):
+    """ Returns the layout name as a dict: name, graph, average_degree, starting_positions,
+    transitions (its compiled graph) and version.
+
+    Raises KeyError for a layout that is neither registered nor bundled.
+    """
+    try:
+        return _registered[name]
+    except KeyError:
+        pass
+    def load():
+        try:
+            data = zxcvbn.resources.load_json('layouts/%s.json' % name)
+        except (IOError, OSError):
+            raise KeyError('unknown keyboard layout %r' % name)
+        return _make_layout(name, data['graph'], data['average_degree'], data['starting_positions'])
+    return zxcvbn.resources.load_once(('layout', name), load)
+
+
+def get_layouts(names=None):
+    """ Returns the layouts named in names (default: DEFAULT_LAYOUTS), in that order. """
+    if names is None:
+        names = DEFAULT_LAYOUTS
+    return [get_layout(name) for name in names]
@@ -0,0 +1,133 @@
+"""
+A dict whose costlier values are only computed when something reads them.
+
+password_strength returns one, so that callers who only look at the score never pay
+for feedback or crack time strings. A lazy key is present from the start, in its
+place in the key order; the first read of its value (by indexing, get, items, json,
+==, copying, pickling...) calls its function and stores the result. Threads reading
+the same result at once share that one call.
+"""
+import threading
+
+_PENDING = object()
+
+
+class LazyDict(dict):
+    """ LazyDict(pairs) where each value may be lazy(function), called on first read. """
+
+    def __init__(self, pairs=()):
+        super(LazyDict, self).__init__()
+        self._functions = {}
+        # reentrant, as a function may read other keys of the same dict.
+        self._lock = threading.RLock()
+        for key, value in pairs:
+            if isinstance(value, lazy):
+                self._functions[key] = value.function
+                value = _PENDING
+            dict.__setitem__(self, key, value)
+
+    def _resolve(self, key, value):
+        if value is _PENDING:
+            with self._lock:
+                # another thread may have resolved (or set) it since value was read.
+                value = dict.__getitem__(self, key)
+                if value is _PENDING:
+                    value = self._functions[key]()
+                    dict.__setitem__(self, key, value)
+                    del self._functions[key]
+        return value
+
+    def _resolve_all(self):
+        for key, value in dict.items(self):
+            if value is _PENDING:
+                self._resolve(key, value)
+
+    def __getitem__(self, key):
+        return self._resolve(key, dict.__getitem__(self, key))
+
+    def get(self, key, default=None):
+        return self._resolve(key, dict.get(self, key, default))
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._functions.pop(key, None)
+            dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key):
+        with self._lock:
+            self._functions.pop(key, None)
+            dict.__delitem__(self, key)
+
+    def pop(self, key, *default):
+        if key in self._functions:
+            self[key]
+        return dict.pop(self, key, *default)
+
+    def popitem(self):
+        self._resolve_all()
+        return dict.popitem(self)
+
+    def setdefault(self, key, default=None):
+        if key in self:
+            return self[key]
+        return dict.setdefault(self, key, default)
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def clear(self):
+        with self._lock:
+            self._functions.clear()
+            dict.clear(self)
+
+    # overriding __iter__ also makes dict(), ** and update() read values through
+    # __getitem__ instead of straight from the table.
+    def __iter__(self):
+        return dict.__iter__(self)
+
+    def items(self):
+        self._resolve_all()
+        return dict.items(self)
+
+    def values(self):
+        self._resolve_all()
+        return dict.values(self)
+
+    def copy(self):
+        return dict(self)
+
+    def __eq__(self, other):
+        self._resolve_all()
+        if isinstance(other, LazyDict):
+            other._resolve_all()
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = None
+
+    def __or__(self, other):
+        return dict(self) | other
+
+    def __ror__(self, other):
+        return other | dict(self)
+
+    def __repr__(self):
+        self._resolve_all()
+        return dict.__repr__(self)
+
+    def __reduce__(self):
+        # pickled (and copied) as the plain dict it resolves to.
+        return dict, (dict(self),)
+
+
+class lazy(object):
+    """ Marks a LazyDict value to be computed by function() when first read. """
+
+    __slots__ = ('function',)
+
+    def __init__(self, function):
+        self.function = function
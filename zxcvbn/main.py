@@ -1,24 +1,195 @@
+import collections
+import copy
+import itertools
 import time
 
+import zxcvbn.common_results
+import zxcvbn.i18n
+import zxcvbn.lazy
 import zxcvbn.matching
+import zxcvbn.resources
 import zxcvbn.scoring
 import zxcvbn.feedback
 import zxcvbn.time_estimates
 
-def password_strength(password, user_inputs=[]):
-    start = time.time()
-    matches = zxcvbn.matching.omnimatch(password, user_inputs)
-    if matches:
-        result = zxcvbn.scoring.most_guessable_match_sequence(password, matches)
-        result['calc_time'] = time.time() - start
 
-        attack_times = zxcvbn.time_estimates.estimate_attack_times(result['guesses'])
-        result.update(attack_times)
+class Estimator(object):
+    """
+    A password strength estimator that owns its dictionaries.
 
-        result['feedback'] = zxcvbn.feedback.get_all_feedback(result['score'], result['sequence'])
+    dictionaries is either a list of bundled frequency list names (default: all of
+    them) or a {dict_name: {word: rank}} mapping. layouts is a list of keyboard layout
+    names (default: zxcvbn.layouts.DEFAULT_LAYOUTS) to look for spatial patterns on.
+    With both defaults, calls without user_inputs look common passwords up in
+    zxcvbn.common_results first; set common_results to False to always analyse.
+    cache, a zxcvbn.result_cache.ResultCache, keeps the results of earlier calls, keyed
+    by the content of the dictionaries and layouts; with a plain dict of more than
+    zxcvbn.matching.PREFIX_LIMIT words, which could change at any time, nothing is cached.
+    locale ('es', ...; default: the environment's) is the language of feedback.
+    Everything specific to one call, such as user_inputs, is passed down explicitly,
+    so one instance can be shared by any number of threads.
+    """
 
-    else:
-         result = {}
-         result['feedback'] = zxcvbn.feedback.get_all_feedback(0, [])        
-    return result
+    def __init__(self, dictionaries=None, layouts=None, cache=None, locale=None):
+        if isinstance(dictionaries, dict):
+            self.ranked_dictionaries = dict(dictionaries)
+        else:
+            self.ranked_dictionaries = zxcvbn.matching.load_ranked_dictionaries(dictionaries)
+        self.layouts = zxcvbn.matching.resolve_layouts(layouts)
+        # the precomputed results hold for the bundled dictionaries and default layouts only.
+        self.common_results = dictionaries is None and layouts is None
+        self.cache = cache
+        self.locale = locale
 
+    def omnimatch(self, password, user_inputs=[], layouts=None):
+        # layouts, if given, replaces the estimator's own for this call only.
+        return zxcvbn.matching.omnimatch(password, user_inputs,
+                                         _ranked_dictionaries=self.ranked_dictionaries,
+                                         _layouts=self.layouts if layouts is None else layouts)
+
+    def _uses_common_results(self, user_inputs, layouts):
+        return self.common_results and not user_inputs and layouts is None
+
+    def password_strength(self, password, user_inputs=[], layouts=None, locale=None):
+        """ The strength of password as a dict. Its feedback and crack_times_display are
+        computed the first time they are read, in locale (default: the estimator's).
+        """
+        start = time.time()
+        result = self._strength(password, user_inputs, layouts)
+        return self._finish(result, time.time() - start, locale)
+
+    def password_strength_many(self, passwords, user_inputs=[], layouts=None, locale=None, chunksize=256):
+        """
+        Yields password_strength(password, user_inputs, layouts, locale) for each of the
+        iterable passwords, in order, taking them chunksize at a time.
+
+        The setup every call shares (dictionaries with user_inputs, layouts) is done once.
+        Within a chunk each distinct password is analysed once, later occurrences getting
+        copies, and matches of identical tokens share their case and l33t variations.
+        """
+        batch_layouts = self.layouts if layouts is None else zxcvbn.matching.resolve_layouts(layouts)
+        ranked_dictionaries = zxcvbn.matching.with_user_inputs(user_inputs, self.ranked_dictionaries)
+        passwords = iter(passwords)
+        while True:
+            chunk = list(itertools.islice(passwords, chunksize))
+            if not chunk:
+                return
+            batch = (ranked_dictionaries, batch_layouts, {})
+            remaining = collections.Counter(chunk)
+            results = {}
+            for password in chunk:
+                start = time.time()
+                if password not in results:
+                    results[password] = self._strength(password, user_inputs, layouts, _batch=batch)
+                remaining[password] -= 1
+                # the last occurrence takes the original, the others a copy of it.
+                result = results.pop(password) if not remaining[password] else copy.deepcopy(results[password])
+                yield self._finish(result, time.time() - start, locale)
+
+    def _strength(self, password, user_inputs, layouts, _batch=None):
+        # password_strength's result, without the parts _finish adds. _batch is the
+        # (ranked_dictionaries, layouts, variations) the calls of one batch share.
+        result = context = None
+        if self.cache is not None:
+            # what sets this call's result apart from others sharing the cache, read each
+            # time, as plain dicts can be edited in place; None when it can't be told.
+            context = zxcvbn.matching._analysis_context(
+                self.ranked_dictionaries, self.layouts if layouts is None else zxcvbn.matching.resolve_layouts(layouts),
+                shared=True)
+            if context is not None:
+                result = self.cache.get(password, user_inputs, context)
+        if result is None:
+            if self._uses_common_results(user_inputs, layouts):
+                result = zxcvbn.common_results.lookup(password)
+            if result is None:
+                if _batch is None:
+                    matches = self.omnimatch(password, user_inputs, layouts)
+                    variations = None
+                else:
+                    ranked_dictionaries, batch_layouts, variations = _batch
+                    matches = zxcvbn.matching._omnimatch(password, ranked_dictionaries, batch_layouts)
+                result = zxcvbn.scoring.most_guessable_match_sequence(
+                    password, matches, _variations=variations) if matches else {}
+            if result:
+                result['crack_times_seconds'] = zxcvbn.time_estimates.attack_times_seconds(result['guesses'])
+                result['score'] = zxcvbn.time_estimates.guesses_to_score(result['guesses'])
+            # cached without anything locale-specific, so one entry serves every locale.
+            if context is not None:
+                self.cache.put(password, user_inputs, result, context)
+        return result
+
+    def _finish(self, result, calc_time, locale):
+        _ = zxcvbn.i18n.get_translation(self.locale if locale is None else locale).gettext
+        if not result:
+            return zxcvbn.lazy.LazyDict([
+                ('feedback', zxcvbn.lazy.lazy(lambda: zxcvbn.feedback.get_all_feedback(0, [], _)))])
+        crack_times_seconds = result['crack_times_seconds']
+        score = result['score']
+        sequence = result['sequence']
+        return zxcvbn.lazy.LazyDict([
+            ('password', result['password']),
+            ('guesses', result['guesses']),
+            ('guesses_log10', result['guesses_log10']),
+            ('sequence', sequence),
+            ('calc_time', calc_time),
+            ('crack_times_seconds', crack_times_seconds),
+            ('crack_times_display', zxcvbn.lazy.lazy(
+                lambda: zxcvbn.time_estimates.display_times(crack_times_seconds))),
+            ('score', score),
+            ('feedback', zxcvbn.lazy.lazy(lambda: zxcvbn.feedback.get_all_feedback(score, sequence, _))),
+        ])
+
+    def meets_score(self, password, min_score, user_inputs=[], layouts=None):
+        """
+        Whether password_strength(password, user_inputs, layouts) would score at least
+        min_score (a result without a score counting as 0), without building feedback or
+        attack times, and stopping as soon as the answer is certain.
+
+        The optimal match sequence never needs more guesses than any single match covering
+        the whole password, so the password is rejected as soon as one such match, or
+        plain bruteforce, is guessable within the threshold. Matchers run cheapest first
+        (zxcvbn.matching.THRESHOLD_ORDER) to find those matches early; accepting a
+        password still takes every matcher and the full sequence search.
+        """
+        threshold = zxcvbn.time_estimates.min_guesses_for_score(min_score)
+        if threshold <= 0:
+            return True
+        if not password or zxcvbn.scoring.whole_password_guesses(password) < threshold:
+            return False
+        if self._uses_common_results(user_inputs, layouts):
+            found = zxcvbn.common_results.lookup_score(password)
+            if found is not None:
+                return found[1] >= min_score
+        ranked_dictionaries = zxcvbn.matching.with_user_inputs(user_inputs, self.ranked_dictionaries)
+        layouts = self.layouts if layouts is None else zxcvbn.matching.resolve_layouts(layouts)
+        found = {}
+        for matcher, matches in zxcvbn.matching.run_matchers(password, ranked_dictionaries, layouts,
+                                                             order=zxcvbn.matching.THRESHOLD_ORDER):
+            for match in matches:
+                if match['i'] == 0 and match['j'] == len(password) - 1 and \
+                        zxcvbn.scoring.whole_password_guesses(password, match) < threshold:
+                    return False
+            found[matcher] = matches
+        # in omnimatch's order, as ties between equally guessable sequences depend on it.
+        matches = [match for matcher in zxcvbn.matching.MATCHERS for match in found.get(matcher, [])]
+        if not matches:
+            return False
+        matches.sort(key=lambda x : (x['i'], x['j']))
+        return zxcvbn.scoring.most_guessable_match_sequence(password, matches)['guesses'] >= threshold
+
+
+def _default_estimator():
+    # created on first use so that importing zxcvbn stays cheap.
+    return zxcvbn.resources.load_once('default_estimator', Estimator)
+
+
+def password_strength(password, user_inputs=[], layouts=None, locale=None):
+    return _default_estimator().password_strength(password, user_inputs, layouts, locale)
+
+
+def password_strength_many(passwords, user_inputs=[], layouts=None, locale=None, chunksize=256):
+    return _default_estimator().password_strength_many(passwords, user_inputs, layouts, locale, chunksize)
+
+
+def meets_score(password, min_score, user_inputs=[], layouts=None):
+    return _default_estimator().meets_score(password, min_score, user_inputs, layouts)
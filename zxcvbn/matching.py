@@ -1,21 +1,18 @@
+import functools
+import hashlib
 from itertools import groupby
-import pkg_resources
+import operator
+import os
 import re
 
-try:
-    import simplejson as json
-    json # silences pyflakes :<
-except ImportError:
-    import json
 
-
-import zxcvbn.adjacency
+import zxcvbn.cache
+import zxcvbn.layouts
+import zxcvbn.resources
+import zxcvbn.result_cache
 import zxcvbn.scoring 
 
 
-RANKED_DICTIONARIES = {}
-
-
 def translate(string, chr_map):
     out = ''
     for char in string:
@@ -25,22 +22,97 @@ def translate(string, chr_map):
 
 
 
+#-------------------------------------------------------------------------------
+# prepass: what the matchers need to know about every character ----------------
+#-------------------------------------------------------------------------------
+
+# character classes of the ascii characters: l(ower, a-z), u(pper, A-Z), d(igit) or o(ther).
+_ASCII_CLASSES = str.maketrans(''.join(chr(c) for c in range(128)),
+                               ''.join('l' if 'a' <= chr(c) <= 'z' else
+                                       'u' if 'A' <= chr(c) <= 'Z' else
+                                       'd' if chr(c).isdecimal() else 'o' for c in range(128)))
+_ASCII_DIGIT_RUN = re.compile(r'[0-9]+')
+# \d and \s are str.isdecimal and str.isspace: see MAYBE_DATE_WITH_SEPARATOR.
+_DATE_RUN = re.compile(r'[\d\s/\\_.-]+')
+
+
+def _spans(regex, password):
+    return [rx_match.span() for rx_match in regex.finditer(password)]
+
+
+def prepass(password):
+    """ Character-level facts about password that several matchers need, worked out once:
+
+      password     the password itself
+      codepoints   ord() of every character
+      deltas       codepoints[k] - codepoints[k-1], for k from 1
+      classes      a string with a class per character: 'l' for a-z, 'u' for A-Z,
+                   'd' for any decimal digit and 'o' for anything else
+      characters   the set of characters
+      digit_runs   (start, end) of every run of str.isdigit characters
+      date_runs    (start, end) of every run of digits and date separators
+
+    omnimatch makes one per password and hands it to every matcher, and skips the
+    matchers applicable_matchers(view) leaves out.
+    """
+    codepoints = list(map(ord, password))
+    classes = password.translate(_ASCII_CLASSES)
+    if password.isascii():
+        digit_runs = _spans(_ASCII_DIGIT_RUN, password)
+    else:
+        # every ascii character is a class letter by now; whatever is left isn't ascii.
+        classes = ''.join(char if char in 'ludo' else 'd' if char.isdecimal() else 'o'
+                          for char in classes)
+        digit_runs = list(_character_runs(password, str.isdigit))
+    return dict(password=password,
+                codepoints=codepoints,
+                deltas=list(map(operator.sub, codepoints[1:], codepoints)),
+                classes=classes,
+                characters=frozenset(password),
+                digit_runs=digit_runs,
+                date_runs=_spans(_DATE_RUN, password))
+
+
 #-------------------------------------------------------------------------------
 # dictionary match (common passwords, english, last names, etc) ----------------
 #-------------------------------------------------------------------------------
 
-def dictionary_match(password, _ranked_dictionaries=RANKED_DICTIONARIES):
+def dictionary_match(password, _ranked_dictionaries=None, _layouts=None, _prepass=None):
+    return _dictionary_matches(password, _ranked_dictionaries, find_reversed=False)[0]
+
+
+def reversed_dictionary_match(password, _ranked_dictionaries=None, _layouts=None, _prepass=None):
+    return _dictionary_matches(password, _ranked_dictionaries, find_reversed=True)[1]
+
+
+def forward_and_reversed_dictionary_match(password, _ranked_dictionaries=None, _layouts=None, _prepass=None):
+    """ dictionary_match + reversed_dictionary_match, found in a single pass. """
+    matches, reversed_matches = _dictionary_matches(password, _ranked_dictionaries, find_reversed=True)
+    return matches + reversed_matches
+
+
+def _dictionary_matches(password, _ranked_dictionaries, find_reversed):
+    """ Returns (matches, reversed_matches).
+
+    Reversed words are found with the same walks, over the reversed password from each
+    position as the forward walk goes, so no second pass is needed.
+    """
+    if _ranked_dictionaries is None:
+        _ranked_dictionaries = _default_ranked_dictionaries()
     matches = []
+    reversed_matches = []
     length = len(password)
 
     pw_lower = password.lower()
+    rev_lower = password[::-1].lower()
+    walks = [(walk, walk.encode(pw_lower), walk.encode(rev_lower) if find_reversed else None)
+             for walk in dictionary_walks(_ranked_dictionaries)]
 
-    for dict_name, ranked_dict in _ranked_dictionaries.items():
-        for i in range(0, length):
-            for j in range(i, length):
+    for i in range(0, length):
+        for walk, forward, backward in walks:
+            for j, hits in walk.words(forward, i, length):
                 word = pw_lower[i:j+1]
-                if word in ranked_dict:
-                    rank = ranked_dict[word]
+                for _, dict_name, rank in hits:
                     matches.append(dict(pattern='dictionary',
                                         i=i, j=j,
                                         token=password[i:j+1],
@@ -49,7 +121,22 @@ def dictionary_match(password, _ranked_dictionaries=RANKED_DICTIONARIES):
                                         l33t=False,
                                         reversed=False,
                                         dictionary_name=dict_name))
-    return matches
+            if not find_reversed:
+                continue
+            # same walk over the reversed password; rev_lower[i:k+1] covers
+            # password[length-1-k:length-i] in the original orientation.
+            for k, hits in walk.words(backward, i, length):
+                word = rev_lower[i:k+1]
+                for _, dict_name, rank in hits:
+                    reversed_matches.append(dict(pattern='dictionary',
+                                                 i=length - 1 - k, j=length - 1 - i,
+                                                 token=password[length - 1 - k:length - i],
+                                                 matched_word=word,
+                                                 rank=rank,
+                                                 l33t=False,
+                                                 reversed=True,
+                                                 dictionary_name=dict_name))
+    return matches, reversed_matches
 
 
 # def _build_dict_matcher(dict_name, ranked_dict):
@@ -62,14 +149,143 @@ def dictionary_match(password, _ranked_dictionaries=RANKED_DICTIONARIES):
 #     return func
 
 
-def reversed_dictionary_match(password, _ranked_dictionaries=RANKED_DICTIONARIES):
-    matches = dictionary_match(password[::-1])
-    for match in matches:
-        match['token'] = match['token'][::-1]  # reverse token back
-        match['reversed'] = True
-        # map coordinates back to original string
-        match['i'], match['j'] = len(password) - 1 - match['j'], len(password) - 1 - match['i']
-    return matches
+def dictionary_walks(ranked_dictionaries):
+    """ What the dictionary matchers walk for ranked_dictionaries: a TrieWalk over the
+    mapped trie behind the bundled RankedTables, then a WordsWalk over any plain dicts
+    (user_inputs, the json fallback, the caller's own).
+
+    Nothing is built ahead or kept between calls: the trie is read where it is mapped,
+    and plain dicts are read as they are now, so edits to them are seen at once.
+    """
+    walks = []
+    tries = {}
+    plain = []
+    for position, (dict_name, ranked_dict) in enumerate(ranked_dictionaries.items()):
+        trie = getattr(ranked_dict, 'trie', None)
+        if trie is None:
+            plain.append((position, dict_name, ranked_dict))
+            continue
+        if id(trie) not in tries:
+            tries[id(trie)] = TrieWalk(trie)
+            walks.append(tries[id(trie)])
+        tries[id(trie)].wanted.setdefault(ranked_dict.trie_id, []).append((position, dict_name))
+    if plain:
+        walks.append(WordsWalk(plain))
+    return walks
+
+
+class TrieWalk(object):
+    """ Walks a zxcvbn.frequency_tables.DictionaryTrie in place. wanted maps a table
+    number to the (position, dict_name) pairs the call passed that table as.
+
+    A walk's state is a trie slot: step(slot, char) is the slot char leads to, or None,
+    and hits(slot) are the [(position, dict_name, rank)] of the word that spells, in the
+    call's order.
+    """
+
+    def __init__(self, trie):
+        self.trie = trie
+        self.wanted = {}
+        self.root = trie.ROOT
+        self.step = trie.step
+
+    def hits(self, slot):
+        h = self.trie.hit_index[slot]
+        if not h:
+            return []
+        all_hits = self.trie.hits
+        hits = []
+        for k in range(h + 1, h + 1 + 2 * all_hits[h], 2):
+            for position, dict_name in self.wanted.get(all_hits[k], ()):
+                hits.append((position, dict_name, all_hits[k + 1]))
+        if len(hits) > 1:
+            hits.sort()
+        return hits
+
+    def encode(self, text):
+        """ text as words() takes it: the code of every character. """
+        codes = self.trie.codes
+        return [codes.get(char, 0) for char in text]
+
+    def words(self, codes, i, end):
+        """ [(j, hits)] for every word spelled from i to j < end that has hits. """
+        trie = self.trie
+        base, check, hit_index = trie.base, trie.check, trie.hit_index
+        found = []
+        slot = trie.ROOT
+        for j in range(i, end):
+            t = base[slot] + codes[j]
+            if check[t] != slot:
+                break
+            slot = t
+            if hit_index[t]:
+                hits = self.hits(t)
+                if hits:
+                    found.append((j, hits))
+        return found
+
+
+# plain dicts with more words than this between them are probed at every length
+# rather than pruned by a set of their prefixes, which would take longer to build.
+PREFIX_LIMIT = 1000
+# ... up to this length; past it, only as far as their longest word, which is then
+# worked out once per call.
+SHORT_WORD_LENGTH = 16
+
+
+class WordsWalk(object):
+    """ Walks plain {word: rank} dicts, given as [(position, dict_name, ranked_dict)].
+
+    A walk's state is the word spelled so far. Small dicts are pruned by a set of their
+    prefixes, built per call; bigger ones are looked up at every length up to their
+    longest word.
+    """
+
+    root = ''
+
+    def __init__(self, dicts):
+        self.dicts = dicts
+        self.prefixes = None
+        self._longest = None
+        if sum(len(ranked_dict) for _, _, ranked_dict in dicts) <= PREFIX_LIMIT:
+            self.prefixes = set(word[:k] for _, _, ranked_dict in dicts
+                                for word in ranked_dict for k in range(1, len(word) + 1))
+
+    def longest(self):
+        """ The length of the longest word, worked out on first use. """
+        if self._longest is None:
+            self._longest = max([max(map(len, ranked_dict), default=0) for _, _, ranked_dict in self.dicts])
+        return self._longest
+
+    def step(self, word, char):
+        word += char
+        if self.prefixes is not None:
+            return word if word in self.prefixes else None
+        if len(word) > SHORT_WORD_LENGTH and len(word) > self.longest():
+            return None
+        return word
+
+    def hits(self, word):
+        return [(position, dict_name, ranked_dict[word]) for position, dict_name, ranked_dict in self.dicts
+                if word in ranked_dict]
+
+    def encode(self, text):
+        return text
+
+    def words(self, text, i, end):
+        """ [(j, hits)] for every word text[i:j+1], j < end, that has hits. """
+        prefixes = self.prefixes
+        if prefixes is None and end - i > SHORT_WORD_LENGTH:
+            end = min(end, i + self.longest())
+        found = []
+        for j in range(i, end):
+            word = text[i:j+1]
+            if prefixes is not None and word not in prefixes:
+                break
+            hits = self.hits(word)
+            if hits:
+                found.append((j, hits))
+        return found
 
 
 def _build_ranked_dict(unranked_list):
@@ -81,22 +297,46 @@ def _build_ranked_dict(unranked_list):
     return result
 
 
-def _set_user_input_dictionary(ordered_list):
-    """ Sets the user inputs dictionary """
-    RANKED_DICTIONARIES['user_inputs'] = _build_ranked_dict(ordered_list)
+def frequency_list_names():
+    """ Names of the bundled frequency lists, in the order they are matched. """
+    tables = zxcvbn.resources.load_frequency_tables()
+    if tables is None:
+        tables = zxcvbn.resources.load_json('frequency_lists.json')
+    return list(tables)
 
 
-def _load_frequency_lists():
-    data = pkg_resources.resource_string(__name__, 'generated/frequency_lists.json')
-    dicts = json.loads(data.decode())
-    for name, wordlist in dicts.items():
-        RANKED_DICTIONARIES[name] = _build_ranked_dict(wordlist)
+def load_ranked_dictionary(dict_name):
+    """ Returns the {word: rank} dictionary for one bundled frequency list, loading just
+    that list the first time it is asked for.
+    """
+    def load():
+        tables = zxcvbn.resources.load_frequency_tables()
+        if tables is not None:
+            return tables[dict_name]
+        return _build_ranked_dict(zxcvbn.resources.load_json('frequency_lists.json')[dict_name])
+    return zxcvbn.resources.load_once(('ranked_dictionary', dict_name), load)
+
+
+def load_ranked_dictionaries(dict_names=None):
+    """ Returns {dict_name: ranked_dict} for dict_names (default: every bundled list), suitable
+    as the _ranked_dictionaries argument of the dictionary matchers. Lists that aren't asked
+    for, e.g. 'spanish', are never loaded.
+    """
+    if dict_names is None:
+        dict_names = frequency_list_names()
+    return dict((dict_name, load_ranked_dictionary(dict_name)) for dict_name in dict_names)
 
 
+def _default_ranked_dictionaries():
+    return zxcvbn.resources.load_once('RANKED_DICTIONARIES', load_ranked_dictionaries)
 
 
+def __getattr__(name):
+    # RANKED_DICTIONARIES is loaded on first access rather than at import.
+    if name == 'RANKED_DICTIONARIES':
+        return _default_ranked_dictionaries()
+    raise AttributeError('module %r has no attribute %r' % (__name__, name))
 
-_load_frequency_lists()
 
 #-------------------------------------------------------------------------------
 # dictionary match with common l33t substitutions ------------------------------
@@ -117,6 +357,8 @@ L33T_TABLE = {
   'z': ['2'],
 }
 
+L33T_CHARACTERS = frozenset(sub for subs in L33T_TABLE.values() for sub in subs)
+
 # makes a pruned copy of L33T_TABLE that only includes password's possible substitutions
 def relevant_l33t_subtable(password):
     password_chars = set(password)
@@ -139,6 +381,7 @@ def enumerate_l33t_subs(table):
         for sub in subs:
             key = str(sorted(sub))
             if key not in members:
+                members.add(key)
                 deduped.append(sub)
         return deduped
 
@@ -169,115 +412,305 @@ def enumerate_l33t_subs(table):
     return map(dict, subs)
 
 
-def l33t_match(password, _ranked_dictionaries=RANKED_DICTIONARIES):
-    matches = []
+@functools.lru_cache(maxsize=1024)
+def _l33t_subs(table_items):
+    # enumerate_l33t_subs for a relevant_l33t_subtable, frozen into table_items so it can be cached.
+    return tuple(enumerate_l33t_subs(dict((letter, list(l33t_chrs)) for letter, l33t_chrs in table_items)))
 
-    for sub in enumerate_l33t_subs(relevant_l33t_subtable(password)):
-        if len(sub) == 0:
-            break
-        subbed_password = translate(password, sub)
-        
-        for match in dictionary_match(subbed_password):
-            token = password[match['i']:match['j'] + 1]
-            if token.lower() == match['matched_word']:
-                continue  # only return the matches that contain an actual substitution
-            match_sub = {}  # subset of mappings in sub that are in use for this match
-            for subbed_chr, char in sub.items():
-                if token.find(subbed_chr) != -1:
-                    match_sub[subbed_chr] = char
-            match['l33t'] = True
-            match['token'] = token
-            match['sub'] = match_sub
-            match['sub_display'] = ', '.join([("%s -> %s" % (k, v)) for k, v in match_sub.items()])
-            matches.append(match)
-    # filter single-character l33t matches to reduce noise.
-    # otherwise '1' matches 'i', '4' matches 'a', both very common English words
-    # with low dictionary rank.
-    return [match for match in matches if len(match['token']) > 1]
+
+def l33t_match(password, _ranked_dictionaries=None, _layouts=None, _prepass=None):
+    """ Finds dictionary words spelled with substitutions from L33T_TABLE.
+
+    Rather than translating the password with every map from enumerate_l33t_subs and
+    rerunning dictionary_match for each, this walks dictionary_walks once per start
+    position and branches on each character's alternatives. A branch is kept only while
+    some map from enumerate_l33t_subs agrees with every choice made on it, so the result
+    is the same, and the work is bounded by the dictionaries rather than by the number
+    of maps.
+    """
+    if _ranked_dictionaries is None:
+        _ranked_dictionaries = _default_ranked_dictionaries()
+    table = relevant_l33t_subtable(password)
+    if not table:
+        return []
+    subs = _l33t_subs(tuple((letter, tuple(l33t_chrs)) for letter, l33t_chrs in table.items()))
+    letters = {}  # l33t char -> letters it can stand for
+    for letter, l33t_chrs in table.items():
+        for l33t_chr in l33t_chrs:
+            letters.setdefault(l33t_chr, []).append(letter)
+    letter_order = dict((letter, k) for k, letter in enumerate(L33T_TABLE))
+
+    pw_lower = password.lower()
+    length = len(password)
+    found = []
+
+    def walk(source, source_no, i):
+        # each entry of the stack is a word spelling pw_lower[i:j+1] with the substitutions
+        # in choices (l33t char -> letter, or None where the l33t char stands for itself),
+        # the state where it leaves source's walk, and the (position, sub) pairs from subs
+        # that agree with every choice so far. entries come off the stack depth first, in
+        # the order the branches are listed, and the walk stops where source has no longer
+        # words, so its depth is bounded by the dictionaries, not the password.
+        stack = [(i - 1, source.root, '', {}, candidates)]
+        while stack:
+            j, state, word, choices, agreeing = stack.pop()
+            if j > i:
+                # single-character l33t matches are filtered to reduce noise: otherwise '1'
+                # matches 'i', '4' matches 'a', both very common English words with low rank.
+                # matches without any actual substitution are regular dictionary matches.
+                match_sub = [(l33t_chr, letter) for l33t_chr, letter in choices.items() if letter]
+                hits = source.hits(state) if match_sub else None
+                if hits:
+                    match_sub = dict(sorted(match_sub, key=lambda item: letter_order[item[1]]))
+                    for _, dict_name, rank in hits:
+                        found.append((agreeing[0][0], source_no, dict(
+                            pattern='dictionary',
+                            i=i, j=j,
+                            token=password[i:j+1],
+                            matched_word=word,
+                            rank=rank,
+                            l33t=True,
+                            reversed=False,
+                            dictionary_name=dict_name,
+                            sub=match_sub,
+                            sub_display=', '.join([("%s -> %s" % (k, v)) for k, v in match_sub.items()]))))
+            j += 1
+            if j == length:
+                continue
+            char = pw_lower[j]
+            if char not in letters:
+                branches = [(char, choices, agreeing)]
+            elif char in choices:
+                branches = [(choices[char] or char, choices, agreeing)]
+            else:
+                branches = []
+                for letter in [None] + letters[char]:
+                    branch_agreeing = [(k, sub) for k, sub in agreeing if sub.get(char) == letter]
+                    if branch_agreeing:
+                        branch_choices = dict(choices)
+                        branch_choices[char] = letter
+                        branches.append((letter or char, branch_choices, branch_agreeing))
+            for next_char, branch_choices, branch_agreeing in reversed(branches):
+                next_state = source.step(state, next_char)
+                if next_state is not None:
+                    stack.append((j, next_state, word + next_char, branch_choices, branch_agreeing))
+
+    candidates = list(enumerate(subs))
+    for source_no, source in enumerate(dictionary_walks(_ranked_dictionaries)):
+        for i in range(0, length):
+            walk(source, source_no, i)
+    # order as if each map had been tried in turn, as enumerate_l33t_subs lists them.
+    found.sort(key=lambda item: item[:2])
+    return [match for _, _, match in found]
 
 # ------------------------------------------------------------------------------
 # spatial match (qwerty/dvorak/keypad) -----------------------------------------
 # ------------------------------------------------------------------------------
 
-def spatial_match(password):
-    matches = []
-    for graph_name, graph in zxcvbn.adjacency.graphs.items():
-        matches.extend(spatial_match_helper(password, graph, graph_name))
-    return matches
+def spatial_match(password, _ranked_dictionaries=None, _layouts=None, _prepass=None):
+    """ Finds keyboard patterns on every layout in _layouts (default: the layouts in
+    zxcvbn.layouts.DEFAULT_LAYOUTS) in a single scan of the password.
 
-
-def spatial_match_helper(password, graph, graph_name):
-    result = []
-    i = 0
-    while i < len(password) - 1:
-        j = i + 1
-        last_direction = None
-        turns = 0
-        shifted_count = 0
-        while True:
-            prev_char = password[j-1]
-            found = False
-            found_direction = -1
-            cur_direction = -1
-            adjacents = graph[prev_char] if prev_char in graph else []
-            # consider growing pattern by one character if j hasn't gone over the edge.
-            if j < len(password):
-                cur_char = password[j]
-                for adj in adjacents:
-                    cur_direction += 1
-                    if adj and adj.find(cur_char) != -1:
-                        found = True
-                        found_direction = cur_direction
-                        if adj.find(cur_char) == 1:
-                            # index 1 in the adjacency means the key is shifted, 0 means unshifted: A vs a, % vs 5, etc.
-                            # for example, 'q' is adjacent to the entry '2@'. @ is shifted w/ index 1, 2 is unshifted.
-                            shifted_count += 1
-                        if last_direction != found_direction:
-                            # adding a turn is correct even in the initial case when last_direction is null:
-                            # every spatial pattern starts with a turn.
-                            turns += 1
-                            last_direction = found_direction
-                        break
-            # if the current pattern continued, extend j and try to grow again
-            if found:
-                j += 1
+    each layout tracks its own pattern (start, last direction, turns, shifted count);
+    at every step the pair of adjacent characters is looked up in the layout's
+    compiled table, and a pattern that can't grow is pushed and a new one started.
+    """
+    if _layouts is None:
+        _layouts = zxcvbn.layouts.get_layouts()
+    tables = [(layout['name'], layout['transitions']) for layout in _layouts]
+    results = [[] for _ in tables]
+    patterns = [(0, None, 0, 0) for _ in tables]
+    length = len(password)
+    for j in range(1, length + 1):
+        pair = password[j-1:j+1]
+        for k, (graph_name, table) in enumerate(tables):
+            i, last_direction, turns, shifted_count = patterns[k]
+            step = table.get(pair) if j < length else None
+            if step is not None:
+                # the pattern continues
+                direction, shifted = step
+                if shifted:
+                    shifted_count += 1
+                if last_direction != direction:
+                    # adding a turn is correct even in the initial case when last_direction is null:
+                    # every spatial pattern starts with a turn.
+                    turns += 1
+                    last_direction = direction
+                patterns[k] = (i, last_direction, turns, shifted_count)
+                continue
             # otherwise push the pattern discovered so far, if any...
-            else:
-                if j - i > 2: # don't consider length 1 or 2 chains.
-                    result.append({
-                        'pattern': 'spatial',
-                        'i': i,
-                        'j': j-1,
-                        'token': password[i:j],
-                        'graph': graph_name,
-                        'turns': turns,
-                        'shifted_count': shifted_count,
-                    })
-                # ...and then start a new search for the rest of the password.
-                i = j
-                break
-    return result
+            if j - i > 2: # don't consider length 1 or 2 chains.
+                results[k].append({
+                    'pattern': 'spatial',
+                    'i': i,
+                    'j': j-1,
+                    'token': password[i:j],
+                    'graph': graph_name,
+                    'turns': turns,
+                    'shifted_count': shifted_count,
+                })
+            # ...and then start a new search for the rest of the password.
+            patterns[k] = (j, None, 0, 0)
+    return [match for result in results for match in result]
 
 #-------------------------------------------------------------------------------
 # repeats (aaa, abcabcabc) and sequences (abcdef) ------------------------------
 #-------------------------------------------------------------------------------
 
 
+def _common_extension(s, i, j, limit):
+    """ Length of the longest common prefix of s[i:] and s[j:], up to limit. Gallops to
+    bracket it, then binary searches the bracket: O(log n) slice comparisons, in C.
+    """
+    lo, step = 0, 1
+    while lo + step <= limit and s[i+lo:i+lo+step] == s[j+lo:j+lo+step]:
+        lo += step
+        step *= 2
+    hi = min(lo + step, limit + 1)
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if s[i+lo:i+mid] == s[j+lo:j+mid]:
+            lo = mid
+        else:
+            hi = mid
+    return lo
+
+
+def _runs(s):
+    """ Yields (start, end, period) for every run of s: a substring s[start:end] at least
+    two periods long, with smallest period period, that can't be extended either way.
+
+    a run with period q covers two sampled positions i, i + q with i a multiple of q, so
+    it is found by extending forwards and backwards from one of them. that is
+    n / q samples per period, O(n log n) samples in all.
+    """
+    n = len(s)
+    r = s[::-1]
+    for q in range(1, n // 2 + 1):
+        i = 0
+        while i + q < n:
+            if s[i] != s[i+q] and (not i or s[i-1] != s[i+q-1]):
+                # nothing repeats across this sample; true of most of them.
+                i += q
+                continue
+            forward = _common_extension(s, i, i + q, n - i - q) if s[i] == s[i+q] else 0
+            backward = _common_extension(r, n - i, n - i - q, i) if i and s[i-1] == s[i+q-1] else 0
+            if forward + backward < q:
+                i += q
+                continue
+            start, end = i - backward, i + q + forward
+            root = s[start:start+q]
+            if (root + root).find(root, 1) == q:
+                # otherwise the smallest period is a divisor of q, and that run is found for it.
+                yield start, end, q
+            # two runs with the same period overlap by less than one period.
+            i = (end - q) // q * q + q
+
+
+def _repeat_starts(password):
+    """ Maps every position that starts a repeat (a substring xx...x, as matched by
+    (.+)\\1+) to (lazy_base, lazy_end, greedy_base, greedy_end): the lengths of its shortest
+    and longest repeated x, and where the repeats of each end.
+    """
+    starts = {}
+    offset = 0
+    # like the regex '.', a repeat never spans a newline.
+    for segment in password.split('\n'):
+        for start, end, q in _runs(segment):
+            start += offset
+            end += offset
+            for p in range(start, end - 2 * q + 1):
+                # every multiple of q that fits twice is a repeated x starting at p.
+                longest = (end - p) // (2 * q) * q
+                if p not in starts:
+                    starts[p] = [q, end, longest, end]
+                    continue
+                lengths = starts[p]
+                if q < lengths[0]:
+                    lengths[0:2] = q, end
+                if longest > lengths[2]:
+                    lengths[2:4] = longest, end
+        offset += len(segment) + 1
+    return starts
+
+# base token analyses (base_guesses, base_matches), shared by every call and thread.
+# As a ResultCache, it finds entries by a keyed hash of the token and what the analysis
+# depends on, and holds them encrypted, so no token or user input is kept in the clear.
+# REPEAT_CACHE.info() reports its size and hit rate; REPEAT_CACHE.store.resize(0) turns
+# it off.
+REPEAT_CACHE = zxcvbn.result_cache.ResultCache(maxsize=1024)
+
+
+def _analysis_context(ranked_dictionaries, layouts, shared=False):
+    """ What a base token analysis (or, for Estimator's result cache, a whole result)
+    depends on besides the token, or None when that can't be pinned down cheaply, and
+    nothing is cached.
+
+    Mapped tables never change, and count by their trie's version and table number, or
+    its digest when shared, for a cache whose store other processes read too. Plain
+    dicts could be edited in place at any time, so they count by their content, which
+    is only worth reading for small ones (user_inputs); with a bigger one nothing is
+    cached. Layouts count by version, a digest of their content.
+    """
+    if ranked_dictionaries is None:
+        ranked_dictionaries = _default_ranked_dictionaries()
+    if layouts is None:
+        layouts = zxcvbn.layouts.get_layouts()
+    context = []
+    plain_words = 0
+    for dict_name, ranked_dict in ranked_dictionaries.items():
+        trie = getattr(ranked_dict, 'trie', None)
+        if trie is not None:
+            context.append([dict_name, trie.digest() if shared else trie.version, ranked_dict.trie_id])
+            continue
+        plain_words += len(ranked_dict)
+        if plain_words > PREFIX_LIMIT:
+            return None
+        context.append([dict_name, sorted(ranked_dict.items())])
+    for layout in layouts:
+        if 'version' not in layout:
+            return None
+        context.append([layout['name'], layout['version']])
+    return context
+
+
+def _analyse_base_token(base_token, ranked_dictionaries, layouts, context):
+    cached = REPEAT_CACHE.get(base_token, (), context) if context is not None else None
+    if cached is None:
+        base_analysis = zxcvbn.scoring.most_guessable_match_sequence(
+            base_token, _omnimatch(base_token, ranked_dictionaries, layouts))
+        cached = dict(guesses=base_analysis['guesses'], sequence=base_analysis['sequence'])
+        if context is not None:
+            # stored as encrypted json, so neither this caller nor a later one can change it.
+            REPEAT_CACHE.put(base_token, (), cached, context)
+    return cached['guesses'], cached['sequence']
+
+
+# the regexes repeat_match used to find repeats with, still the faster way on short
+# passwords; from REPEAT_RUNS_LENGTH characters up, _run_repeats finds the same ones
+# without backtracking (see benchmarks/bench_repeat_match.py).
 greedy = re.compile(r'(.+)\1+')
 lazy = re.compile(r'(.+?)\1+')
 lazy_anchored = re.compile(r'^(.+?)\1+$')
+REPEAT_RUNS_LENGTH = 64
 
-def repeat_match(password):
-    matches = []
-    last_index = 0
 
-    while last_index < len(password):
-        greedy_match = greedy.search(password[last_index:])
-        lazy_match = lazy.search(password[last_index:])
+def _find_repeats(password):
+    """ Yields (i, j, token, base_token) for each repeat, left to right, as the regexes
+    (.+)\\1+ and (.+?)\\1+ find them.
+    """
+    if len(password) < REPEAT_RUNS_LENGTH:
+        return _regex_repeats(password)
+    return _run_repeats(password)
 
+
+def _regex_repeats(password):
+    last_index = 0
+    while last_index < len(password):
+        greedy_match = greedy.search(password, last_index)
         if not greedy_match:
             break
-
+        lazy_match = lazy.search(password, last_index)
         if len(greedy_match.group(0)) > len(lazy_match.group(0)):
             # greedy beats lazy for 'aabaab'
             #   greedy: [aabaab, aab]
@@ -287,40 +720,71 @@ def repeat_match(password):
             # aabaab in aabaabaabaab.
             # run an anchored lazy match on greedy's repeated string
             # to find the shortest repeated string
-            #print(match.group(0))
             base_token = lazy_anchored.search(match.group(0)).group(1)
-
         else:
             # lazy beats greedy for 'aaaaa'
             #   greedy: [aaaa,  aa]
             #   lazy:   [aaaaa, a]
             match = lazy_match
             base_token = match.group(1)
+        i, last_index = match.span(0)
+        yield i, last_index - 1, match.group(0), base_token
 
-        i, j = match.span(0)
-        i += last_index
-        j += last_index - 1
-        
-        # recursively match and score the base string
-        base_analysis = zxcvbn.scoring.most_guessable_match_sequence(base_token, omnimatch(base_token))
 
-        base_matches = base_analysis['sequence']
-        base_guesses = base_analysis['guesses'] 
-     
+def _run_repeats(password):
+    """ _find_repeats from the runs of password, in near-linear time. """
+    last_index = 0
+    starts = _repeat_starts(password)
+    for i in sorted(starts):
+        if i < last_index:
+            continue
+        lazy_base, lazy_end, greedy_base, greedy_end = starts[i]
+        # x repeats for as long as the string keeps its period
+        lazy_length = (lazy_end - i) // lazy_base * lazy_base
+        greedy_length = (greedy_end - i) // greedy_base * greedy_base
+
+        if greedy_length > lazy_length:
+            # greedy beats lazy for 'aabaab'
+            #   greedy: [aabaab, aab]
+            #   lazy:   [aa,     a]
+            token = password[i:i+greedy_length]
+            # greedy's repeated string might itself be repeated, eg.
+            # aabaab in aabaabaabaab.
+            # its shortest repeated string is its smallest rotation onto itself.
+            base_token = token[:(token + token).find(token, 1)]
+
+        else:
+            # lazy beats greedy for 'aaaaa'
+            #   greedy: [aaaa,  aa]
+            #   lazy:   [aaaaa, a]
+            token = password[i:i+lazy_length]
+            base_token = token[:lazy_base]
+
+        last_index = i + len(token)
+        yield i, last_index - 1, token, base_token
+
+
+def repeat_match(password, _ranked_dictionaries=None, _layouts=None, _prepass=None):
+    matches = []
+    context = False
+    for i, j, token, base_token in _find_repeats(password):
+        # recursively match and score the base string, or reuse an earlier analysis of it
+        if context is False:
+            context = _analysis_context(_ranked_dictionaries, _layouts)
+        base_guesses, base_matches = _analyse_base_token(
+            base_token, _ranked_dictionaries, _layouts, context)
+
         matches.append(dict(pattern='repeat', i=i, j=j,
-                            token=match.group(0), base_token=base_token,
+                            token=token, base_token=base_token,
                             base_guesses=base_guesses,
                             base_matches=base_matches,
-                            repeat_count=len(match.group(0))/len(base_token)))
-
-        last_index = j + 1
-
+                            repeat_count=len(token)/len(base_token)))
     return matches
 
 
 
 MAX_DELTA = 5
-def sequence_match(password):
+def sequence_match(password, _ranked_dictionaries=None, _layouts=None, _prepass=None):
     """ Identifies sequences by looking for repeated differences in unicode codepoint.
     this allows skipping, such as 9753, and also matches some extended unicode sequences
     such as Greek and Cyrillic alphabets.
@@ -336,20 +800,23 @@ def sequence_match(password):
     """
     if len(password) == 1:
         return []
+    if _prepass is None:
+        _prepass = prepass(password)
+    classes = _prepass['classes']
 
     result = []
 
     def update(i, j, delta):
         if j - i > 1 or abs(delta) == 1:
             if 0 < abs(delta) <= MAX_DELTA:
-                token = password[i:j+1]
-                if re.match(r'^[a-z]+$', token):
+                token_classes = set(classes[i:j+1])
+                if token_classes == {'l'}:
                     sequence_name = 'lower'
                     sequence_space = 26
-                elif re.match(r'^[A-Z]+$', token):
+                elif token_classes == {'u'}:
                     sequence_name = 'upper'
                     sequence_space = 26
-                elif re.match(r'^\d+$', token):
+                elif token_classes == {'d'}:
                     sequence_name = 'digits'
                     sequence_space = 10
                 else:
@@ -367,8 +834,7 @@ def sequence_match(password):
     i = 0
     last_delta = None
 
-    for k in range(1, len(password)):
-        delta = ord(password[k]) - ord(password[k - 1])
+    for k, delta in enumerate(_prepass['deltas'], 1):
         if last_delta is None:
             last_delta = delta
         
@@ -388,10 +854,11 @@ def sequence_match(password):
 # regex matching ---------------------------------------------------------------
 #-------------------------------------------------------------------------------
 
+# MATCHER_PRECONDITIONS[regex_match] only lets passwords with a 19 or 20 through.
 REGEXEN = dict(
     recent_year=re.compile(r'19\d\d|200\d|201\d'))
 
-def regex_match(password, _regexen=REGEXEN):
+def regex_match(password, _ranked_dictionaries=None, _layouts=None, _prepass=None, _regexen=REGEXEN):
     matches = []
     for name, regex in _regexen.items():
         for rx_match in regex.finditer(password):
@@ -425,7 +892,28 @@ DATE_SPLITS = {
 }
 
 
-def date_match(password):
+MAYBE_DATE_WITH_SEPARATOR = re.compile(r'''
+  ^
+  ( \d{1,4} )    # day, month, year
+  ( [\s/\\_.-] ) # separator
+  ( \d{1,2} )    # day, month
+  \2             # same separator
+  ( \d{1,4} )    # day, month, year
+  $
+''', re.VERBOSE)
+
+
+def _character_runs(password, predicate):
+    """ Yields (start, end) for each maximal run of characters satisfying predicate. """
+    start = 0
+    for matched, run in groupby(password, predicate):
+        end = start + sum(1 for _ in run)
+        if matched:
+            yield start, end
+        start = end
+
+
+def date_match(password, _ranked_dictionaries=None, _layouts=None, _prepass=None):
     """ a "date" is recognized as:
       any 3-tuple that starts or ends with a 2- or 4-digit year,
       with 2 or 0 separator chars (1.1.91 or 1191),
@@ -442,71 +930,58 @@ def date_match(password):
      finally, remove matches that are substrings of other matches to reduce noise.
     
     note: instead of using a lazy or greedy regex to find many dates over the full string,
-     this uses a ^...$ regex against every substring of the password -- less performant but leads
-     to every possible date match.
+     this uses a ^...$ regex against every substring of the runs of digits and separators
+     in the password -- less performant but leads to every possible date match.
     """
+    if _prepass is None:
+        _prepass = prepass(password)
     matches = []
-    maybe_date_no_separator = re.compile(r'^\d{4,8}$')
-    maybe_date_with_separator = re.compile(r'''
-      ^
-      ( \d{1,4} )    # day, month, year
-      ( [\s/\\_.-] ) # separator
-      ( \d{1,2} )    # day, month
-      \2             # same separator
-      ( \d{1,4} )    # day, month, year
-      $
-    ''', re.VERBOSE)
-
-    # dates without separators are between length 4 '1191' and 8 '11111991'
-    for i in range(0, len(password) - 3):
-        candidates = []
-        for j in range(i + 4, min(i + 9, len(password) + 1)):
-            token = password[i:j]
-            if not token.isdigit():
-                continue
-            for k, l in DATE_SPLITS[len(token)]:
-                dmy = map_ints_to_dmy((int(token[:k]), int(token[k:l]), int(token[l:])))
 
-                if dmy:
-                    candidates.append(dmy)
-        
-            if not len(candidates):
-                continue
-            # at this point: different possible dmy mappings for the same i,j substring.
-            # match the candidate date that likely takes the fewest guesses: a year closest to 2000.
-            # (scoring.REFERENCE_YEAR).
-            #
-            # ie, considering '111504', prefer 11-15-04 to 1-1-1504
-            # (interpreting '04' as 2004)
-            best_candidate = candidates[0]
-            metric = lambda candidate: abs(candidate['year'] - zxcvbn.scoring.REFERENCE_YEAR)
-            min_distance = metric(candidates[0])
-            for candidate in candidates[1:]:
-                distance = metric(candidate)
-                if distance < min_distance:
-                    best_candidate, min_distance = candidate, distance
-            matches.append(dict(pattern='date', token=token,
-                                i=i, j=j-1, separator='',
-                                year=best_candidate['year'],
-                                month=best_candidate['month'],
-                                day=best_candidate['day']))
-
-    # dates with separators are between length 6 '1/1/91' and 10 '11/11/1991'
-    for i in range(0, len(password) - 5):
-        for j in range(i + 6,min(i + 11, len(password) + 1)):
-            token = password[i:j]
-            rx_match = maybe_date_with_separator.search(token)
-            if not rx_match:
+    # dates without separators are between length 4 '1191' and 8 '11111991',
+    # all digits, so they are only looked for within runs of digits.
+    for start, end in _prepass['digit_runs']:
+        for i in range(start, end - 3):
+            best_candidate = min_distance = None
+            for j in range(i + 4, min(i + 9, end + 1)):
+                token = password[i:j]
+                # the best date reading of this token competes with those of the shorter
+                # tokens starting at i: a year closest to scoring.REFERENCE_YEAR wins.
+                candidate = map_digits_to_dmy(token)
+                if candidate is not None:
+                    distance = abs(candidate['year'] - zxcvbn.scoring.REFERENCE_YEAR)
+                    if best_candidate is None or distance < min_distance:
+                        best_candidate, min_distance = candidate, distance
+
+                if best_candidate is None:
+                    continue
+                matches.append(dict(pattern='date', token=token,
+                                    i=i, j=j-1, separator='',
+                                    year=best_candidate['year'],
+                                    month=best_candidate['month'],
+                                    day=best_candidate['day']))
+
+    # dates with separators are between length 6 '1/1/91' and 10 '11/11/1991',
+    # within runs of digits and separators, starting with a digit.
+    for start, end in _prepass['date_runs']:
+        if password[start:end].isdecimal():
+            continue
+        for i in range(start, end - 5):
+            if not password[i].isdecimal():
                 continue
-            dmy = map_ints_to_dmy((int(rx_match.group(1)), 
-                                   int(rx_match.group(3)), 
-                                   int(rx_match.group(4))))
-            if not dmy:
-                continue 
-
-            matches.append(dict(pattern='date', token=token,
-                                i=i, j=j-1, separator=rx_match.group(2),
-                                year=dmy['year'], month=dmy['month'], day=dmy['day']))
+            for j in range(i + 6, min(i + 11, end + 1)):
+                token = password[i:j]
+                rx_match = MAYBE_DATE_WITH_SEPARATOR.search(token)
+                if not rx_match:
+                    continue
+                dmy = map_ints_to_dmy((int(rx_match.group(1)), 
+                                       int(rx_match.group(3)), 
+                                       int(rx_match.group(4))))
+                if not dmy:
+                    continue 
+
+                matches.append(dict(pattern='date', token=token,
+                                    i=i, j=j-1, separator=rx_match.group(2),
+                                    year=dmy['year'], month=dmy['month'], day=dmy['day']))
 
     # matches now contains all valid date strings in a way that is tricky to capture
     # with regexes only. while thorough, it will contain some unintuitive noise:
@@ -514,15 +989,75 @@ def date_match(password):
     # '2015_06_04', in addition to matching 2015_06_04, will also contain
     # 5(!) other date matches: 15_06_04, 5_06_04, ..., even 2015 (matched as 5/1/2020)
     #
-    # to reduce noise, remove date matches that are strict substrings of others
-    def is_submatch(match):
-        for other_match in matches:
-            if match == other_match:
-                continue
-            if other_match['i'] <= match['i'] and other_match['j'] >= match['j']:
-                return True 
-        return False
-    return [match for match in matches if not is_submatch(match)]
+    # to reduce noise, remove date matches that are strict substrings of others:
+    # sweep them by start, longest first; a match ending no later than one before it
+    # in that order lies inside it.
+    submatches = set()
+    furthest = -1
+    for k in sorted(range(len(matches)), key=lambda k: (matches[k]['i'], -matches[k]['j'])):
+        if matches[k]['j'] <= furthest:
+            submatches.add(k)
+        furthest = max(furthest, matches[k]['j'])
+    return [match for k, match in enumerate(matches) if k not in submatches]
+
+
+# day-month-year readings of digit strings longer than the precomputed table covers.
+# those strings are often birthdays, so the cache is keyed by a keyed hash of the string
+# rather than the string itself, and off unless resized: a miss costs about as much as
+# working the reading out, and most of the substrings date_match asks about are misses.
+DATE_CACHE = zxcvbn.cache.LRUCache(maxsize=0)
+_DATE_CACHE_SECRET = os.urandom(32)
+_NOT_CACHED = object()
+
+
+def _date_table():
+    """ {digit string: (year, month, day)} for every 4 digit string that reads as a date,
+    from generated/date_table.json, or None if the table was built with other date
+    parameters than the current ones.
+    """
+    def load():
+        data = zxcvbn.resources.load_json('date_table.json')
+        if (data['reference_year'], data['min_year'], data['max_year']) != \
+                (zxcvbn.scoring.REFERENCE_YEAR, DATE_MIN_YEAR, DATE_MAX_YEAR):
+            return None
+        return dict((token, dict(year=year, month=month, day=day))
+                    for token, (year, month, day) in data['dates'].items())
+    return zxcvbn.resources.load_once('date_table', load)
+
+
+def map_digits_to_dmy(token):
+    """ The day-month-year reading of a 4-8 digit token that likely takes the fewest
+    guesses, or None.
+
+    considering '111504', prefer 11-15-04 to 1-1-1504 (interpreting '04' as 2004): of
+    the DATE_SPLITS readings, the first one whose year is closest to REFERENCE_YEAR.
+    4 digit tokens come from the precomputed table, longer ones from DATE_CACHE if it
+    is on.
+    """
+    if len(token) == 4 and token.isascii():
+        table = _date_table()
+        if table is not None:
+            return table.get(token)
+    if DATE_CACHE.maxsize <= 0:
+        return _map_digits_to_dmy(token)
+    key = hashlib.blake2b(token.encode('utf-8'), key=_DATE_CACHE_SECRET, digest_size=16).digest()
+    dmy = DATE_CACHE.get(key, _NOT_CACHED)
+    if dmy is _NOT_CACHED:
+        dmy = _map_digits_to_dmy(token)
+        DATE_CACHE.put(key, dmy)
+    return dmy
+
+
+def _map_digits_to_dmy(token):
+    best_candidate = min_distance = None
+    for k, l in DATE_SPLITS[len(token)]:
+        candidate = map_ints_to_dmy((int(token[:k]), int(token[k:l]), int(token[l:])))
+        if candidate is None:
+            continue
+        distance = abs(candidate['year'] - zxcvbn.scoring.REFERENCE_YEAR)
+        if best_candidate is None or distance < min_distance:
+            best_candidate, min_distance = candidate, distance
+    return best_candidate
 
 
 def map_ints_to_dmy(ints):
@@ -593,8 +1128,7 @@ def two_to_four_digit_year(year):
 
 
 MATCHERS = [
-    dictionary_match,
-    reversed_dictionary_match,
+    forward_and_reversed_dictionary_match,  # dictionary_match + reversed_dictionary_match
     l33t_match,
     spatial_match,
     repeat_match, 
@@ -604,12 +1138,88 @@ MATCHERS = [
 ]
 
 
-def omnimatch(password, user_inputs=[]):
-    _set_user_input_dictionary(user_inputs)
+def _has_run(runs, length):
+    return any(end - start >= length for start, end in runs)
+
+
+# what a password needs for a matcher to find anything; omnimatch skips the matchers
+# whose precondition fails on the password's prepass. unlisted matchers always run.
+MATCHER_PRECONDITIONS = {
+    l33t_match: lambda view: not view['characters'].isdisjoint(L33T_CHARACTERS),
+    # a repeat repeats at least one character.
+    repeat_match: lambda view: len(view['characters']) < len(view['codepoints']),
+    sequence_match: lambda view: len(view['codepoints']) > 1,
+    regex_match: lambda view: _has_run(view['digit_runs'], 4) and
+                              ('19' in view['password'] or '20' in view['password']),
+    date_match: lambda view: _has_run(view['digit_runs'], 4) or _has_run(view['date_runs'], 6),
+}
+
 
+# the order meets_score runs matchers in: cheapest first, except that the dictionary
+# matchers come early as they find most weak passwords whole.
+THRESHOLD_ORDER = [
+    sequence_match,
+    regex_match,
+    forward_and_reversed_dictionary_match,
+    date_match,
+    spatial_match,
+    repeat_match,
+    l33t_match
+]
+
+
+def applicable_matchers(view):
+    """ The matchers omnimatch runs for a password with prepass view, in MATCHERS order. """
+    return [matcher for matcher in MATCHERS
+            if matcher not in MATCHER_PRECONDITIONS or MATCHER_PRECONDITIONS[matcher](view)]
+
+
+def omnimatch(password, user_inputs=[], _ranked_dictionaries=None, _layouts=None):
+    """ Runs every matcher over password. user_inputs are matched as their own dictionary
+    on top of _ranked_dictionaries (default: every bundled list); nothing global is touched,
+    so concurrent calls can't see each other's user_inputs. _layouts is a list of layout
+    names or layouts from zxcvbn.layouts (default: zxcvbn.layouts.DEFAULT_LAYOUTS).
+    """
+    return _omnimatch(password, with_user_inputs(user_inputs, _ranked_dictionaries),
+                      resolve_layouts(_layouts))
+
+
+def with_user_inputs(user_inputs, _ranked_dictionaries=None):
+    """ _ranked_dictionaries (default: every bundled list) plus user_inputs as their own
+    'user_inputs' dictionary, in a new dict.
+    """
+    if _ranked_dictionaries is None:
+        _ranked_dictionaries = _default_ranked_dictionaries()
+    ranked_dictionaries = dict(_ranked_dictionaries)
+    ranked_dictionaries['user_inputs'] = _build_ranked_dict(user_inputs)
+    return ranked_dictionaries
+
+
+def resolve_layouts(layouts):
+    """ Turns a list of layout names and/or layouts into layouts; None means the defaults. """
+    if layouts is None:
+        return zxcvbn.layouts.get_layouts()
+    return [zxcvbn.layouts.get_layout(layout) if isinstance(layout, str) else layout
+            for layout in layouts]
+
+
+def _omnimatch(password, ranked_dictionaries, layouts=None):
     matches = []
-    if len(password):
-        for matcher in MATCHERS:
-            matches.extend(matcher(password))
-        matches.sort(key=lambda x : (x['i'], x['j']))
+    for _, found in run_matchers(password, ranked_dictionaries, layouts):
+        matches.extend(found)
+    matches.sort(key=lambda x : (x['i'], x['j']))
     return matches
+
+
+def run_matchers(password, ranked_dictionaries, layouts=None, order=MATCHERS):
+    """ Yields (matcher, matches) for each matcher in order whose precondition holds.
+
+    every matcher takes the call's dictionaries, user_inputs included, and layouts, so
+    nested calls (repeat_match on its base token) see the same ones.
+    """
+    if len(password):
+        view = prepass(password)
+        for matcher in order:
+            if matcher not in MATCHER_PRECONDITIONS or MATCHER_PRECONDITIONS[matcher](view):
+                yield matcher, matcher(password, _ranked_dictionaries=ranked_dictionaries,
+                                       _layouts=layouts, _prepass=view)
@@ -0,0 +1,115 @@
+"""
+Scoring large batches of passwords on several processes.
+
+password_strength_parallel forks its workers from a process that has already loaded
+everything they need, so they share it instead of each loading their own copy:
+
+- the frequency lists and the trie dictionary matching walks are memory-mapped from
+  generated/frequency_lists.bin: they live in the page cache, hold no Python objects,
+  and are never copied;
+- layouts, date and common-password tables are built before the fork, then moved out
+  of the garbage collector's reach with gc.freeze, so that collections in the workers
+  don't write to (and so copy) the pages holding them.
+
+Reading an object still updates its reference count, so a worker does copy the pages
+of the few heap tables its passwords reach: a few MiB in all, against the tens of MiB
+a worker that loaded everything itself would hold.
+
+Where fork isn't available, each worker loads the default estimator itself.
+"""
+import collections
+import concurrent.futures
+import gc
+import itertools
+import multiprocessing
+import os
+
+import zxcvbn.main
+
+# a password that reaches every lazily loaded table: dictionaries, l33t, layouts, dates.
+WARM_UP = 'P4ssw0rd qwerty 25/12/1990 aaaa abcabc'
+
+_estimator = None
+
+
+def prepare(estimator=None):
+    """ Loads everything estimator (default: the shared default one) uses, and returns it. """
+    if estimator is None:
+        estimator = zxcvbn.main._default_estimator()
+    estimator.password_strength(WARM_UP)['feedback']
+    return estimator
+
+
+def _init_worker(estimator):
+    global _estimator
+    _estimator = estimator if estimator is not None else prepare()
+
+
+def _score_chunk(chunk, user_inputs, layouts, locale, fields):
+    # also run by pools not made by process_pool, whose workers load their own estimator.
+    if _estimator is None:
+        _init_worker(None)
+    results = _estimator.password_strength_many(chunk, user_inputs, layouts, locale, chunksize=len(chunk))
+    if fields is None:
+        return [dict(result) for result in results]
+    return [dict((field, result[field]) for field in fields if field in result) for result in results]
+
+
+def process_pool(workers=None, estimator=None):
+    """
+    A ProcessPoolExecutor of workers processes (default: one per cpu) set up to run
+    _score_chunk with estimator (default: the shared default one), which is loaded here
+    first so that forked workers share it. Any other estimator needs the fork start method.
+    """
+    fork = 'fork' in multiprocessing.get_all_start_methods()
+    if not fork and estimator is not None:
+        raise ValueError('a custom estimator can only be shared with forked workers')
+    if fork:
+        estimator = prepare(estimator)
+    return concurrent.futures.ProcessPoolExecutor(
+        max_workers=workers or os.cpu_count() or 1,
+        mp_context=multiprocessing.get_context('fork') if fork else None,
+        initializer=_init_worker,
+        initargs=(estimator if fork else None,))
+
+
+def password_strength_parallel(passwords, user_inputs=[], layouts=None, locale=None, workers=None,
+                               chunksize=256, fields=None, estimator=None, _freeze=True):
+    """
+    Yields password_strength(password, user_inputs, layouts, locale) for each of the
+    iterable passwords, in order, scored chunksize at a time by workers processes
+    (default: one per cpu). Results are plain dicts; fields, if given, keeps only those
+    keys, which also spares the workers building feedback nobody reads.
+
+    At most two chunks per worker are in flight, so passwords can be an arbitrarily
+    long iterator. estimator defaults to the shared default one; any other needs the
+    fork start method.
+    """
+    workers = workers or os.cpu_count() or 1
+    freeze = _freeze and 'fork' in multiprocessing.get_all_start_methods()
+    if freeze:
+        # process_pool loads everything first, then nothing new is made before the fork.
+        estimator = prepare(estimator)
+        gc.collect()
+        gc.freeze()
+    try:
+        pool = process_pool(workers, estimator)
+    except BaseException:
+        if freeze:
+            gc.unfreeze()
+        raise
+    try:
+        passwords = iter(passwords)
+        chunks = iter(lambda: list(itertools.islice(passwords, chunksize)), [])
+        pending = collections.deque(pool.submit(_score_chunk, chunk, user_inputs, layouts, locale, fields)
+                                    for chunk in itertools.islice(chunks, 2 * workers))
+        while pending:
+            results = pending.popleft().result()
+            for chunk in itertools.islice(chunks, 1):
+                pending.append(pool.submit(_score_chunk, chunk, user_inputs, layouts, locale, fields))
+            for result in results:
+                yield result
+    finally:
+        pool.shutdown(cancel_futures=True)
+        if freeze:
+            gc.unfreeze()
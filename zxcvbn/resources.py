@@ -0,0 +1,54 @@
+"""
+Load-once access to the data files under zxcvbn/generated.
+
+Nothing here runs at import time: each file is read the first time something asks
+for it, through importlib.resources, and then kept for the life of the process.
+"""
+import json
+import struct
+import threading
+from importlib import resources
+
+import zxcvbn.frequency_tables
+
+_lock = threading.RLock()
+_loaded = {}
+
+
+def load_once(key, loader):
+    """ Returns loader(), calling it only the first time key is asked for. """
+    try:
+        return _loaded[key]
+    except KeyError:
+        pass
+    with _lock:
+        if key not in _loaded:
+            _loaded[key] = loader()
+        return _loaded[key]
+
+
+def _generated(name):
+    return resources.files('zxcvbn') / 'generated' / name
+
+
+def read_bytes(name):
+    """ Returns the raw contents of generated/<name>. """
+    return _generated(name).read_bytes()
+
+
+def load_json(name):
+    """ Returns the parsed contents of generated/<name>. """
+    return load_once(name, lambda: json.loads(_generated(name).read_text(encoding='utf-8')))
+
+
+def load_frequency_tables():
+    """ Returns the mapped {dict_name: RankedTable} from generated/frequency_lists.bin,
+    or None when the binary tables are missing or unreadable.
+    """
+    def load():
+        try:
+            with resources.as_file(_generated('frequency_lists.bin')) as path:
+                return zxcvbn.frequency_tables.load_frequency_tables(path)
+        except (IOError, OSError, ValueError, struct.error):
+            return None
+    return load_once('frequency_lists.bin', load)
@@ -0,0 +1,183 @@
+"""
+An opt-in cache of whole password_strength results, for flows that score the same
+password several times (retries, revalidation, checks as the user types):
+
+    estimator = zxcvbn.Estimator(cache=zxcvbn.result_cache.ResultCache(maxsize=4096, ttl=300))
+
+Neither passwords nor results are kept in the clear. An entry's key is an HMAC of the
+password, the user_inputs and the estimator's configuration under the cache's secret,
+and its value is the result as json (without feedback and crack time strings, which
+are rebuilt in each call's locale), encrypted with a keystream derived from the same
+inputs under a separate key, and authenticated together with its key, so reading it
+back takes the password itself, and an entry moved to another key reads as a miss.
+Every hit decodes a new copy, so nothing a caller does to a result (nor
+estimate_guesses' caching in match dicts) can reach the cache.
+
+By default entries live in an in-process LRU; SQLiteStore keeps them in a local file
+instead, shared by every process that opens it with the same secret.
+"""
+import hashlib
+import hmac
+import json
+import os
+import threading
+import time
+
+import zxcvbn.cache
+
+NONCE_SIZE = 16
+TAG_SIZE = 16
+
+
+class ResultCache(object):
+    """ Caches up to maxsize results for ttl seconds (default: until evicted) in store,
+    an LRUCache unless given. secret, 32 random bytes by default, must be the same in
+    every process sharing a store.
+    """
+
+    def __init__(self, maxsize=1024, ttl=None, secret=None, store=None):
+        if secret is None:
+            secret = os.urandom(32)
+        self._key_secret = hmac.new(secret, b'key', hashlib.sha256).digest()
+        self._value_secret = hmac.new(secret, b'value', hashlib.sha256).digest()
+        self._tag_secret = hmac.new(secret, b'tag', hashlib.sha256).digest()
+        self.store = zxcvbn.cache.LRUCache(maxsize, ttl) if store is None else store
+        self.rejected = 0
+
+    def _canonical(self, password, user_inputs, context):
+        return json.dumps([password, list(user_inputs), context], default=str).encode('utf-8')
+
+    def _keystream(self, canonical, nonce, size):
+        seed = hmac.new(self._value_secret, nonce + canonical, hashlib.sha256).digest()
+        return hashlib.shake_256(seed).digest(size)
+
+    def _tag(self, key, nonce, ciphertext):
+        # the key is authenticated too, so an entry copied or moved to another key fails.
+        return hmac.new(self._tag_secret, key + nonce + ciphertext, hashlib.sha256).digest()[:TAG_SIZE]
+
+    def get(self, password, user_inputs=(), context=None):
+        """ A new copy of the result cached for password and user_inputs under context
+        (anything json can encode that tells apart estimators and per-call options), or None.
+        """
+        if getattr(self.store, 'maxsize', 1) <= 0:
+            return None
+        canonical = self._canonical(password, user_inputs, context)
+        key = hmac.new(self._key_secret, canonical, hashlib.sha256).digest()
+        entry = self.store.get(key)
+        if entry is None:
+            return None
+        nonce, tag, ciphertext = entry[:NONCE_SIZE], entry[NONCE_SIZE:NONCE_SIZE + TAG_SIZE], \
+                entry[NONCE_SIZE + TAG_SIZE:]
+        if not hmac.compare_digest(tag, self._tag(key, nonce, ciphertext)):
+            # written under another secret or key, or tampered with: never trust it.
+            self.rejected += 1
+            return None
+        plaintext = _xor(ciphertext, self._keystream(canonical, nonce, len(ciphertext)))
+        try:
+            return json.loads(plaintext.decode('utf-8'))
+        except ValueError:
+            # UnicodeDecodeError included: authentic, but not a result this code wrote.
+            self.rejected += 1
+            return None
+
+    def put(self, password, user_inputs, result, context=None):
+        if getattr(self.store, 'maxsize', 1) <= 0:
+            return
+        canonical = self._canonical(password, user_inputs, context)
+        key = hmac.new(self._key_secret, canonical, hashlib.sha256).digest()
+        plaintext = json.dumps(result, separators=(',', ':')).encode('utf-8')
+        nonce = os.urandom(NONCE_SIZE)
+        ciphertext = _xor(plaintext, self._keystream(canonical, nonce, len(plaintext)))
+        self.store.put(key, nonce + self._tag(key, nonce, ciphertext) + ciphertext)
+
+    def clear(self):
+        self.store.clear()
+        self.rejected = 0
+
+    def __len__(self):
+        return len(self.store)
+
+    def info(self):
+        """ The store's info(): {hits, misses, evictions, expirations, size, maxsize}, plus
+        rejected, the entries found but not accepted.
+        """
+        info = self.store.info()
+        info['rejected'] = self.rejected
+        return info
+
+
+def _xor(data, keystream):
+    return (int.from_bytes(data, 'big') ^ int.from_bytes(keystream, 'big')).to_bytes(len(data), 'big')
+
+
+#-------------------------------------------------------------------------------
+# shared store -----------------------------------------------------------------
+#-------------------------------------------------------------------------------
+
+class SQLiteStore(object):
+    """ A store for ResultCache in the sqlite database file path, shared by the processes
+    that open it. Keeps the maxsize most recently used entries, each for ttl seconds.
+    hits and misses are counted per process.
+    """
+
+    def __init__(self, path, maxsize=65536, ttl=None):
+        import sqlite3  # optional in some python builds; only needed here.
+        self._sqlite3 = sqlite3
+        self.path = path
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._pid = None
+        self._db = None
+        self.hits = 0
+        self.misses = 0
+        with self._lock:
+            self._connection().execute('CREATE TABLE IF NOT EXISTS results '
+                                       '(key BLOB PRIMARY KEY, value BLOB, expires REAL, used REAL)')
+            self._db.execute('CREATE INDEX IF NOT EXISTS results_used ON results (used)')
+
+    def _connection(self):
+        # a connection must not cross a fork, so each process opens its own.
+        if self._pid != os.getpid():
+            self._db = self._sqlite3.connect(self.path, timeout=30, isolation_level=None,
+                                             check_same_thread=False)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._pid = os.getpid()
+        return self._db
+
+    def get(self, key, default=None):
+        now = time.time()
+        with self._lock:
+            db = self._connection()
+            row = db.execute('SELECT value FROM results WHERE key = ? AND expires > ?',
+                             (key, now)).fetchone()
+            if row is None:
+                self.misses += 1
+                return default
+            db.execute('UPDATE results SET used = ? WHERE key = ?', (now, key))
+            self.hits += 1
+            return bytes(row[0])
+
+    def put(self, key, value):
+        now = time.time()
+        expires = float('inf') if self.ttl is None else now + self.ttl
+        with self._lock:
+            db = self._connection()
+            db.execute('INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)', (key, value, expires, now))
+            db.execute('DELETE FROM results WHERE expires <= ?', (now,))
+            db.execute('DELETE FROM results WHERE key IN '
+                       '(SELECT key FROM results ORDER BY used DESC LIMIT -1 OFFSET ?)', (max(self.maxsize, 0),))
+
+    def clear(self):
+        with self._lock:
+            self._connection().execute('DELETE FROM results')
+            self.hits = self.misses = 0
+
+    def __len__(self):
+        with self._lock:
+            return self._connection().execute('SELECT COUNT(*) FROM results').fetchone()[0]
+
+    def info(self):
+        """ {hits, misses, size, maxsize}; evictions and expirations aren't tracked. """
+        size = len(self)
+        return dict(hits=self.hits, misses=self.misses, size=size, maxsize=self.maxsize)
@@ -1,16 +1,13 @@
 
+import functools
 import math
 import re
 
-import zxcvbn.adjacency
+import zxcvbn.layouts
+import zxcvbn.resources
 
 
-def calc_average_degree(graph):
-    average = 0.0
-    for neighbors in graph.values():
-        average += len([n for n in neighbors if n])
-    average /= len(graph)
-    return average
+calc_average_degree = zxcvbn.layouts.calc_average_degree
 
 
 BRUTEFORCE_CARDINALITY = 10
@@ -20,6 +17,10 @@ MIN_SUBMATCH_GUESSES_MULTI_CHAR = 50
 MIN_SUBMATCH_GUESSES_MULTI_CHAR = 50
 
 
+# nCk and the sums and spatial counts built on it are pure functions of small integers
+# that the same few arguments keep coming back to, so they are memoized. they keep the
+# original arithmetic, float division included, so estimates don't change.
+@functools.lru_cache(maxsize=4096)
 def nCk(n, k):
     # http://blog.plover.com/math/choose.html
     if k > n:
@@ -34,6 +35,15 @@ def nCk(n, k):
     return r
 
 
+@functools.lru_cache(maxsize=4096)
+def binomial_sum(n, k):
+    """ nCk(n, i) summed over 0 < i < k, in that order. """
+    total = 0
+    for i in range(1, k):
+        total += nCk(n, i)
+    return total
+
+
   # ------------------------------------------------------------------------------
   # search --- most guessable match sequence -------------------------------------
   # ------------------------------------------------------------------------------
@@ -41,7 +51,7 @@ def nCk(n, k):
 
   # ------------------------------------------------------------------------------
 
-def most_guessable_match_sequence(password, matches, _exclude_additive=False):
+def most_guessable_match_sequence(password, matches, _exclude_additive=False, _variations=None):
     """
       Takes a sequence of overlapping matches, returns the non-overlapping sequence with
       minimum guesses. the following is a O(l_max * (n + m)) dynamic programming algorithm
@@ -71,124 +81,176 @@ def most_guessable_match_sequence(password, matches, _exclude_additive=False):
          D^(l-1) approximates Sum(D^i for i in [1..l-1]
     """
     n = len(password)
+    # corner: empty password
+    if n == 0:
+        return dict(password=password, guesses=1, guesses_log10=0.0, sequence=[])
+    factorials, penalties, bruteforce = _sequence_terms(n, _exclude_additive)
 
-    # partition matches into sublists according to ending index j
+    # partition matches into sublists according to ending index j, scoring each match once.
+    # matches of the same token share their case and l33t variations, within this call or
+    # across the calls that pass the same _variations.
     matches_by_j = [[] for _ in range(0,n)]
+    variations = {} if _variations is None else _variations
     for m in matches:
+        estimate_guesses(m, password, _variations=variations)
         matches_by_j[m['j']].append(m)
 
-    optimal = {
-        # optimal['m'][k][l] holds final match in the best length-l match sequence covering the
-        # password prefix up to k, inclusive.
-        # if there is no length-l sequence that scores better (fewer guesses) than
-        # a shorter match sequence spanning the same prefix, optimal.m[k][l] is undefined.
-        'm':  [{} for _ in range(0, n)],
-
-        # same structure as optimal['m'], except holds the product term Prod(m.guesses for m in sequence).
-        # optimal['pi'] allows for fast (non-looping) updates to the minimization function.
-        'pi':  [{} for _ in range(0, n)],
-
-        # optimal['g'][k] holds the lowest guesses up to k according to the minimization function.
-        'g':  [float('inf') for _ in range(0, n)],
-
-        # optimal.['l'][k] holds the length, l, of the optimal sequence covering up to k.
-        # (this is also the largest key in optimal.['m'][k] and optimal['pi'][k] objects)
-        'l':  [0 for _ in range(0, n)]
-    }
-   
-    def update(m, l):
-        """ helper: considers whether a length-l sequence ending at match m is better (fewer guesses)
-            than previously encountered sequences, updating state if so.
+    # the state of the best length-l sequence covering the password prefix up to k,
+    # inclusive, is at index l of the kth list of these arrays. each list is only as
+    # long as the longest sequence reaching k, which is short in practice.
+    # the sequence's final match. a bruteforce match is only made when unwinding; until
+    # then it is just the index where its span starts.
+    # if there is no length-l sequence that scores better (fewer guesses) than
+    # a shorter match sequence spanning the same prefix, the entry is None.
+    state_m = [[None] for _ in range(0, n)]
+    # the product term Prod(m.guesses for m in sequence), for fast (non-looping) updates
+    # to the minimization function.
+    state_pi = [[None] for _ in range(0, n)]
+    # the ls with a state at k, in the order they first got one. later steps try them
+    # in that order, which decides between sequences with equal guesses.
+    lengths = [[] for _ in range(0, n)]
+    # the lowest guesses up to k according to the minimization function, and the length,
+    # l, of that sequence.
+    best_g = [float('inf')] * n
+    best_l = [0] * n
+
+    def update(k, l, pi, m):
+        """ helper: considers whether a length-l sequence ending with m at k, with product
+            term pi, is better (fewer guesses) than previously encountered sequences,
+            updating state if so.
         """
-        k = m['j']
-        pi = estimate_guesses(m, password)
-        if l > 1:
-            # we're considering a length-l sequence ending with match m:
-            # obtain the product term in the minimization function by multiplying m's guesses
-            # by the product of the length-(l-1) sequence ending just before m, at m.i - 1.
-            pi *= optimal['pi'][m['i'] - 1][l - 1]
-        # calculate the minimization func
-        g = math.factorial(l) * pi
-        if not _exclude_additive:
-            g += MIN_GUESSES_BEFORE_GROWING_SEQUENCE ** (l - 1)
-        # update state if new best
-        if g < optimal['g'][k]:
-            optimal['g'][k] = g
-            optimal['l'][k] = l
-            optimal['m'][k][l] = m
-            optimal['pi'][k][l] = pi
-
-    def bruteforce_update(k):
-        """ helper: considers whether bruteforce matches ending at position k are optimal.
-        """
-        # three cases to consider...
+        if l == len(factorials):
+            # a longer sequence than any so far: the terms grow one l at a time.
+            factorials.append(factorials[-1] * l)
+            penalties.append(0 if _exclude_additive else MIN_GUESSES_BEFORE_GROWING_SEQUENCE ** (l - 1))
+        g = factorials[l] * pi + penalties[l]
+        if g < best_g[k]:
+            best_g[k] = g
+            best_l[k] = l
+            row_m = state_m[k]
+            if l >= len(row_m):
+                row_m.extend([None] * (l + 1 - len(row_m)))
+                state_pi[k].extend([None] * (l + 1 - len(state_pi[k])))
+            if row_m[l] is None:
+                lengths[k].append(l)
+            row_m[l] = m
+            state_pi[k][l] = pi
+
+    for k in range(0, n):
+        for m in matches_by_j[k]:
+            i = m['i']
+            if i > 0:
+                # we're considering length-(l + 1) sequences ending with match m:
+                # the product term is m's guesses times the product of the length-l
+                # sequence ending just before m, at m.i - 1.
+                previous = state_pi[i - 1]
+                for l in lengths[i - 1]:
+                    update(k, l + 1, m['guesses'] * previous[l], m)
+            else:
+                update(k, 1, m['guesses'], m)
+
+        # bruteforce matches ending at k. three cases to consider...
         # case 1: a bruteforce match spanning the full prefix.
-        m = make_bruteforce_match(0, k)
-        update(m, 1)
+        update(k, 1, bruteforce[k + 1], 0)
         if k == 0:
-            return 
-        for l, last_m in optimal['m'][k - 1].items():
-            #l = int(l)
-            if last_m['pattern'] == 'bruteforce':
+            continue
+        previous_m = state_m[k - 1]
+        previous_pi = state_pi[k - 1]
+        for l in lengths[k - 1]:
+            last_m = previous_m[l]
+            if not isinstance(last_m, dict):
                 # case 2: if the optimal length-l sequence up to k - 1 ended in a bruteforce match,
                 # consider whether extending it by one character is optimal up to k.
                 # this preserves the sequence length l.
-                m = make_bruteforce_match(last_m['i'], k)
-                update(m, l)
+                pi = bruteforce[k - last_m + 1]
+                if l > 1:
+                    pi *= state_pi[last_m - 1][l - 1]
+                update(k, l, pi, last_m)
             else:
                 # case 3: if the optimal length-l sequence up to k - 1 ends in a non-bruteforce match,
                 # consider whether starting a new single-character bruteforce match is optimal.
                 # this adds a new match, adding 1 to the prior sequence length l.
-                m = make_bruteforce_match(k, k)
-                update(m, l + 1)
-
-    def make_bruteforce_match(i, j):
-        """ helper: make bruteforce match objects spanning i to j, inclusive.
-        """
-        return dict(pattern='bruteforce', token=password[i:j+1], i=i, j=j)
-
-    def unwind(n):
-        """ helper: step backwards through optimal['m'] starting at the end,
-            constructing the final optimal match sequence.
-        """
-        optimal_match_sequence = []
-        k = n - 1
-        l = optimal['l'][k]
-        while k >= 0:
-            m = optimal['m'][k][l]
-            optimal_match_sequence.insert(0, m)
-            k = m['i'] - 1
-            l -= 1
-        return optimal_match_sequence
-
-    for k in range(0, n):
-        for m in matches_by_j[k]:
-            if m['i'] > 0:
-                for l in optimal['m'][m['i'] - 1].keys():
-                    #l = parseInt(l)
-                    update(m, l + 1)
-            else:
-                update(m, 1)
-        bruteforce_update(k)
-    import json
-    optimal_match_sequence = unwind(n)
-
-    # corner: empty password
-    if len(password) == 0:
-        guesses = 1
-    else:
-        guesses = optimal['g'][n - 1]
+                update(k, l + 1, bruteforce[1] * previous_pi[l], k)
+
+    # step backwards through the states starting at the end,
+    # constructing the final optimal match sequence.
+    optimal_match_sequence = []
+    k = n - 1
+    l = best_l[k]
+    while k >= 0:
+        m = state_m[k][l]
+        if not isinstance(m, dict):
+            m = make_bruteforce_match(password, m, k, bruteforce[k - m + 1])
+        optimal_match_sequence.append(m)
+        k = m['i'] - 1
+        l -= 1
+    optimal_match_sequence.reverse()
+
+    guesses = best_g[n - 1]
 
     # final result object
     return dict(password=password, guesses=guesses,
                 guesses_log10=math.log(guesses, 10),
                 sequence=optimal_match_sequence)
 
+
+# l!, D^(l - 1) and bruteforce guesses for a span of length l, for l below
+# SEQUENCE_TERMS_LENGTH, which covers every sequence and span of most passwords.
+SEQUENCE_TERMS_LENGTH = 64
+_SEQUENCE_TERMS = None
+_NO_PENALTIES = [0] * SEQUENCE_TERMS_LENGTH
+
+
+def _sequence_terms(n, exclude_additive=False):
+    """ Returns (factorials, penalties, bruteforce) for a password of length n: l!, the
+    length penalty D^(l - 1) (0 with exclude_additive), and the guesses of a bruteforce
+    match of length l in a longer password. bruteforce goes up to n; below
+    SEQUENCE_TERMS_LENGTH, the other two are shared and go as far as n too, and beyond,
+    they are this call's own and most_guessable_match_sequence appends to them as
+    longer sequences come up.
+    """
+    global _SEQUENCE_TERMS
+    if _SEQUENCE_TERMS is None:
+        _SEQUENCE_TERMS = (
+            [math.factorial(l) for l in range(SEQUENCE_TERMS_LENGTH)],
+            [0] + [MIN_GUESSES_BEFORE_GROWING_SEQUENCE ** (l - 1) for l in range(1, SEQUENCE_TERMS_LENGTH)],
+            [1] + [bruteforce_guesses(dict(token='x' * l)) for l in range(1, SEQUENCE_TERMS_LENGTH)])
+    factorials, penalties, bruteforce = _SEQUENCE_TERMS
+    if exclude_additive:
+        penalties = _NO_PENALTIES
+    if n < SEQUENCE_TERMS_LENGTH:
+        return factorials, penalties, bruteforce
+    # the sequences of a long password are no longer than a short one's, in practice,
+    # so its terms start from the shared ones and grow only as far as needed.
+    bruteforce = list(bruteforce)
+    guesses = bruteforce[-1]
+    for l in range(SEQUENCE_TERMS_LENGTH, n + 1):
+        guesses *= BRUTEFORCE_CARDINALITY
+        bruteforce.append(guesses)
+    return list(factorials), list(penalties), bruteforce
+
+
+def make_bruteforce_match(password, i, j, guesses):
+    """ helper: make a scored bruteforce match object spanning i to j, inclusive.
+    """
+    return dict(pattern='bruteforce', token=password[i:j+1], i=i, j=j,
+                guesses=guesses, guesses_log10=math.log(guesses, 10))
+
+def whole_password_guesses(password, match=None):
+    """ the guesses most_guessable_match_sequence counts for the sequence made of match
+    alone, which must span all of password (default: one bruteforce match). every such
+    sequence is tried, so the optimal sequence never needs more guesses than this.
+    """
+    if match is None:
+        match = dict(pattern='bruteforce', token=password, i=0, j=len(password) - 1)
+    factorials, penalties, _ = _sequence_terms(1)
+    return factorials[1] * estimate_guesses(match, password) + penalties[1]
+
 # ------------------------------------------------------------------------------
 # guess estimation -- one function per match pattern ---------------------------
 # ------------------------------------------------------------------------------
 
-def bruteforce_guesses(match):
+def bruteforce_guesses(match, _variations=None):
     guesses = BRUTEFORCE_CARDINALITY ** len(match['token'])
     # small detail: make bruteforce matches at minimum one guess bigger than smallest allowed
     # submatch guesses, such that non-bruteforce submatches over the same [i..j] take precidence.
@@ -196,10 +258,10 @@ def bruteforce_guesses(match):
             else MIN_SUBMATCH_GUESSES_MULTI_CHAR + 1
     return max(guesses, min_guesses) 
 
-def repeat_guesses(match):
+def repeat_guesses(match, _variations=None):
     return match['base_guesses'] * match['repeat_count']
 
-def sequence_guesses(match):
+def sequence_guesses(match, _variations=None):
     first_chr = match['token'][0]
     # lower guesses for obvious starting points
     if first_chr in ['a', 'A', 'z', 'Z', '0', '1', '9']:
@@ -220,7 +282,7 @@ def sequence_guesses(match):
 MIN_YEAR_SPACE = 20
 REFERENCE_YEAR = 2016
 
-def regex_guesses(match):
+def regex_guesses(match, _variations=None):
     char_class_bases = dict(alpha_lower=26, alpha_upper=26,
                             alpha=52, alphanumeric=62,
                             digits=10, symbols=33)
@@ -232,7 +294,7 @@ def regex_guesses(match):
         year_space = abs(int(match['regex_match'][0]) - REFERENCE_YEAR)
         return max(year_space, MIN_YEAR_SPACE)
 
-def date_guesses(match):
+def date_guesses(match, _variations=None):
     # base guesses: (year distance from REFERENCE_YEAR) * num_days * num_years
     year_space = max(abs(match['year'] - REFERENCE_YEAR), MIN_YEAR_SPACE)
     guesses = year_space * 365
@@ -244,23 +306,36 @@ def date_guesses(match):
         guesses *= 4 
     return guesses
 
-KEYBOARD_AVERAGE_DEGREE = calc_average_degree(zxcvbn.adjacency.graphs['qwerty'])
-# slightly different for keypad/mac keypad, but close enough
-KEYPAD_AVERAGE_DEGREE = calc_average_degree(zxcvbn.adjacency.graphs['keypad'])
-
-KEYBOARD_STARTING_POSITIONS =len(zxcvbn.adjacency.graphs['qwerty'])
-KEYPAD_STARTING_POSITIONS = len(zxcvbn.adjacency.graphs['keypad'])
-
-def spatial_guesses(match):
-    if match['graph'] in ['qwerty', 'dvorak']:
-        s = KEYBOARD_STARTING_POSITIONS
-        d = KEYBOARD_AVERAGE_DEGREE
-    else:
-        s = KEYPAD_STARTING_POSITIONS
-        d = KEYPAD_AVERAGE_DEGREE
+def _graph_statistics():
+    """ KEYBOARD_AVERAGE_DEGREE, KEYPAD_AVERAGE_DEGREE, KEYBOARD_STARTING_POSITIONS and
+    KEYPAD_STARTING_POSITIONS, the qwerty and keypad statistics kept for compatibility;
+    spatial_guesses uses the statistics of each match's own layout.
+    """
+    def compute():
+        qwerty = zxcvbn.layouts.get_layout('qwerty')
+        keypad = zxcvbn.layouts.get_layout('keypad')
+        return dict(KEYBOARD_AVERAGE_DEGREE=qwerty['average_degree'],
+                    KEYPAD_AVERAGE_DEGREE=keypad['average_degree'],
+                    KEYBOARD_STARTING_POSITIONS=qwerty['starting_positions'],
+                    KEYPAD_STARTING_POSITIONS=keypad['starting_positions'])
+    return zxcvbn.resources.load_once('graph_statistics', compute)
+
+
+def __getattr__(name):
+    if name in ('KEYBOARD_AVERAGE_DEGREE', 'KEYPAD_AVERAGE_DEGREE',
+                'KEYBOARD_STARTING_POSITIONS', 'KEYPAD_STARTING_POSITIONS'):
+        return _graph_statistics()[name]
+    raise AttributeError('module %r has no attribute %r' % (__name__, name))
+
+def spatial_guesses(match, _variations=None):
+    # the statistics of the layout the match was found on, by its name.
+    layout = zxcvbn.layouts.get_layout(match['graph'])
+    return _spatial_guesses(layout['starting_positions'], layout['average_degree'],
+                            len(match['token']), match['turns'], match['shifted_count'])
+
+@functools.lru_cache(maxsize=4096)
+def _spatial_guesses(s, d, L, t, S):
     guesses = 0
-    L = len(match['token'])
-    t = match['turns']
     # estimate the number of possible patterns w/ length L or less with t turns or less.
     for i in range(2, L):
         possible_turns = min(t, i - 1)
@@ -268,22 +343,30 @@ def spatial_guesses(match):
             guesses += nCk(i - 1, j - 1) * s * (d ** j)
     # add extra guesses for shifted keys. (% instead of 5, A instead of a.)
     # math is similar to extra guesses of l33t substitutions in dictionary matches.
-    if match['shifted_count']:
-        S = match['shifted_count']
-        U = len(match['token']) - S  # unshifted count
+    if S:
+        U = L - S  # unshifted count
         if S == 0 or U == 0:
             guesses *= 2
         else:
-            shifted_variations = 0
-            for i in range(1,min(S, U)):
-                shifted_variations += nCk(S + U, i) 
-            guesses *= shifted_variations
+            guesses *= binomial_sum(S + U, min(S, U))
     return guesses
 
-def dictionary_guesses(match):
+def dictionary_guesses(match, _variations=None):
     match['base_guesses'] = match['rank']   # keep these as properties for display purposes
-    match['uppercase_variations'] = uppercase_variations(match)
-    match['l33t_variations'] = l33t_variations(match)
+    if _variations is None:
+        match['uppercase_variations'] = uppercase_variations(match)
+        match['l33t_variations'] = l33t_variations(match)
+    else:
+        # shared by the matches of one call: the same token is often found in several
+        # dictionaries, and reversed or l33t.
+        key = ('uppercase', match['token'])
+        if key not in _variations:
+            _variations[key] = uppercase_variations(match)
+        match['uppercase_variations'] = _variations[key]
+        key = ('l33t', match['token'], tuple(sorted(match['sub'].items()))) if match['l33t'] else None
+        if key not in _variations:
+            _variations[key] = l33t_variations(match)
+        match['l33t_variations'] = _variations[key]
     reversed_variations = 2 if match['reversed'] else 1
     # ensure user_inputs matches take precedence
     match['bonus'] = 0 if match['dictionary_name'] == 'user_inputs' else 1
@@ -309,10 +392,7 @@ def uppercase_variations(match):
     # the number of ways to lowercase U+L letters with L lowercase letters or less.
     U = len([chr for chr in word if chr.isupper()])
     L = len([chr for chr in word if chr.islower()])
-    variations = 0
-    for i in range(1, min(U, L)):
-        variations += nCk(U + L, i) 
-    return variations
+    return binomial_sum(U + L, min(U, L))
 
 def l33t_variations(match):
     if not match['l33t']:
@@ -331,14 +411,19 @@ def l33t_variations(match):
         else:
             # this case is similar to capitalization:
             # with aa44a, U = 3, S = 2, attacker needs to try unsubbed + one sub + two subs
-            p = min(U, S)
-            possibilities = 0
-            for i in range(1, p):
-                possibilities += nCk(U + S, i) 
-            variations *= possibilities
+            variations *= binomial_sum(U + S, min(U, S))
     return variations
 
-def estimate_guesses(match, password):
+ESTIMATION_FUNCTIONS = dict(
+  bruteforce=bruteforce_guesses,
+  dictionary=dictionary_guesses,
+  spatial=spatial_guesses,
+  repeat=repeat_guesses,
+  sequence=sequence_guesses,
+  regex=regex_guesses,
+  date=date_guesses)
+
+def estimate_guesses(match, password, _variations=None):
     if 'guesses' in match:
         return match['guesses']  # a match's guess estimate doesn't change. cache it.
     min_guesses = 1
@@ -346,16 +431,7 @@ def estimate_guesses(match, password):
         min_guesses = MIN_SUBMATCH_GUESSES_SINGLE_CHAR if len(match['token']) == 1 \
                 else MIN_SUBMATCH_GUESSES_MULTI_CHAR
     
-    estimation_functions = dict(
-      bruteforce=bruteforce_guesses,
-      dictionary=dictionary_guesses,
-      spatial=spatial_guesses,
-      repeat=repeat_guesses,
-      sequence=sequence_guesses,
-      regex=regex_guesses,
-      date=date_guesses)
-
-    guesses = estimation_functions[match['pattern']](match)
+    guesses = ESTIMATION_FUNCTIONS[match['pattern']](match, _variations=_variations)
     match['guesses'] = max(guesses, min_guesses)
     if 'bonus' in match:
         match['guesses'] += match['bonus']
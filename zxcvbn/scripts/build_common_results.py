@@ -0,0 +1,38 @@
+import os
+import sys
+import gzip
+import json
+
+sys.path.insert(0, os.path.join(os.pardir, os.pardir))
+
+from zxcvbn.common_results import TABLE, variants, fingerprint, encode_line
+from zxcvbn.main import Estimator
+from zxcvbn.matching import load_ranked_dictionary
+
+
+def main():
+    '''
+    writes ../generated/common_results.txt.gz: the password_strength result of every
+    password in the 'passwords' frequency list and of its variants, for password_strength
+    to look up instead of working them out. rerun it whenever the frequency lists, the
+    default layouts or the scoring change; benchmarks/bench_common_results.py checks
+    the table against the engine.
+    '''
+    estimator = Estimator()
+    estimator.common_results = False
+    passwords = sorted(set(password for word in load_ranked_dictionary('passwords')
+                           for password in variants(word)))
+    shapes = {}
+    lines = [encode_line(estimator.password_strength(password), shapes) for password in passwords]
+    header = json.dumps(dict(fingerprint=fingerprint(),
+                             shapes=[list(keys) for keys in sorted(shapes, key=shapes.get)]),
+                        sort_keys=True, separators=(',', ':'))
+    with gzip.GzipFile('../generated/' + TABLE, 'wb', mtime=0) as f:
+        f.write('\n'.join([header] + lines).encode('utf-8') + b'\n')
+
+
+if __name__ == '__main__':
+    if os.path.basename(os.getcwd()) != 'scripts':
+        print('run this from the scripts directory')
+        exit(1)
+    main()
@@ -0,0 +1,35 @@
+import os
+import sys
+import json
+
+sys.path.insert(0, os.path.join(os.pardir, os.pardir))
+
+from zxcvbn.matching import _map_digits_to_dmy, DATE_MIN_YEAR, DATE_MAX_YEAR
+from zxcvbn.scoring import REFERENCE_YEAR
+
+
+def main():
+    '''
+    writes ../generated/date_table.json: the best day-month-year reading of every
+    4 digit string that has one, so date_match looks those up instead of working
+    them out. rerun it whenever DATE_MIN_YEAR, DATE_MAX_YEAR or REFERENCE_YEAR
+    change; until then the table is ignored.
+    '''
+    dates = {}
+    for n in range(10 ** 4):
+        token = '%04d' % n
+        dmy = _map_digits_to_dmy(token)
+        if dmy is not None:
+            dates[token] = [dmy['year'], dmy['month'], dmy['day']]
+    with open('../generated/date_table.json', 'w') as f:
+        json.dump(dict(reference_year=REFERENCE_YEAR,
+                       min_year=DATE_MIN_YEAR,
+                       max_year=DATE_MAX_YEAR,
+                       dates=dates), f, sort_keys=True, separators=(',', ':'))
+
+
+if __name__ == '__main__':
+    if os.path.basename(os.getcwd()) != 'scripts':
+        print('run this from the scripts directory')
+        exit(1)
+    main()
@@ -0,0 +1,30 @@
+import os
+import sys
+import json
+
+sys.path.insert(0, os.path.join(os.pardir, os.pardir))
+
+from zxcvbn.matching import _build_ranked_dict
+from zxcvbn.frequency_tables import write_frequency_tables
+
+
+def main():
+    '''
+    writes ../generated/frequency_lists.bin, the memory-mappable twin of
+    ../generated/frequency_lists.json, with the trie dictionary_match walks. rerun it
+    whenever the json is regenerated.
+    '''
+    with open('../generated/frequency_lists.json') as f:
+        lists = json.load(f)
+    ranked_dictionaries = dict((name, _build_ranked_dict(wordlist)) for name, wordlist in lists.items())
+    # written aside and renamed, so a failed build never leaves a truncated table behind.
+    with open('../generated/frequency_lists.bin.tmp', 'wb') as f:
+        write_frequency_tables(ranked_dictionaries, f)
+    os.replace('../generated/frequency_lists.bin.tmp', '../generated/frequency_lists.bin')
+
+
+if __name__ == '__main__':
+    if os.path.basename(os.getcwd()) != 'scripts':
+        print('run this from the scripts directory')
+        exit(1)
+    main()
@@ -1,9 +1,5 @@
-from __future__ import with_statement
-try:
-    import simplejson as json
-    json # silence pyflakes
-except ImportError:
-    import json
+import json
+import os
 
 qwerty = r'''
 `~ 1! 2@ 3# 4$ 5% 6^ 7& 8* 9( 0) -_ =+
@@ -19,6 +15,22 @@ dvorak = r'''
       ;: qQ jJ kK xX bB mM wW vV zZ
 '''
 
+# european layouts. the iso key left of the bottom row ('<>') takes column 0; the
+# azerty number row starts at column 1, as the '²' key left of it is not modelled.
+azerty = r'''
+   &1 é2 "3 '4 (5 -6 è7 _8 ç9 à0 )° =+
+    aA zZ eE rR tT yY uU iI oO pP ^¨ $£
+     qQ sS dD fF gG hH jJ kK lL mM ù% *µ
+   <> wW xX cC vV bB nN ,? ;. :/ !§
+'''
+
+qwertz = r'''
+^° 1! 2" 3§ 4$ 5% 6& 7/ 8( 9) 0= ß? ´`
+    qQ wW eE rR tT zZ uU iI oO pP üÜ +*
+     aA sS dD fF gG hH jJ kK lL öÖ äÄ #'
+   <> yY xX cC vV bB nN mM ,; .: -_
+'''
+
 keypad = r'''
   / * -
 7 8 9 +
@@ -71,7 +83,7 @@ def build_graph(layout_str, slanted):
             position_table[(x,y)] = token
 
     adjacency_graph = {}
-    for (x,y), chars in position_table.iteritems():
+    for (x,y), chars in position_table.items():
         for char in chars:
             adjacency_graph[char] = []
             for coord in adjacency_func(x, y):
@@ -80,13 +92,34 @@ def build_graph(layout_str, slanted):
                 adjacency_graph[char].append(position_table.get(coord, None))
     return adjacency_graph
 
+def calc_average_degree(graph):
+    '''
+    average number of neighbours per key; spatial_guesses uses it to count possible patterns.
+    '''
+    average = 0.0
+    for neighbors in graph.values():
+        average += len([n for n in neighbors if n])
+    average /= len(graph)
+    return average
+
+LAYOUTS = [('qwerty', qwerty, True),
+           ('dvorak', dvorak, True),
+           ('azerty', azerty, True),
+           ('qwertz', qwertz, True),
+           ('keypad', keypad, False),
+           ('mac_keypad', mac_keypad, False)]
+
 if __name__ == '__main__':
-    with open('../generated/adjacency_graphs.json', 'w') as f:
-        out = {}
-        for graph_name, args in [('qwerty', (qwerty, True)),
-                                 ('dvorak', (dvorak, True)),
-                                 ('keypad', (keypad, False)),
-                                 ('mac_keypad', (mac_keypad, False))]:
-            graph = build_graph(*args)
-            out[graph_name] = graph
-        json.dump(out, f)
+    if os.path.basename(os.getcwd()) != 'scripts':
+        print('run this from the scripts directory')
+        exit(1)
+    # one artifact per layout: the graph plus the statistics spatial_guesses needs,
+    # so the package never has to derive them at runtime.
+    if not os.path.isdir('../generated/layouts'):
+        os.mkdir('../generated/layouts')
+    for layout_name, layout_str, slanted in LAYOUTS:
+        graph = build_graph(layout_str, slanted)
+        with open('../generated/layouts/%s.json' % layout_name, 'w') as f:
+            json.dump(dict(graph=graph,
+                           average_degree=calc_average_degree(graph),
+                           starting_positions=len(graph)), f, sort_keys=True)
@@ -0,0 +1,295 @@
+"""
+A local scoring service, so that several processes on a host can share one loaded
+estimator instead of each loading the dictionaries:
+
+    python -m zxcvbn.server --port 8765           # or --unix /run/zxcvbn.sock
+
+It speaks just enough HTTP/1.1 (keep-alive, Content-Length bodies), with nothing
+outside the standard library:
+
+    POST /score     {"password": ..., "user_inputs": [...], "fields": [...], "locale": ...}
+                    -> the password_strength result (only fields, if given)
+    GET  /health    -> {"status": "ok", ...}
+    GET  /metrics   -> request counts, batch sizes and latency percentiles
+
+Requests arriving together are scored together: a batch is taken from the queue as
+soon as the previous one is done (or max_delay after its first request, when idle),
+up to max_batch requests, and scored on a thread with password_strength_many, so
+the event loop keeps accepting requests meanwhile. Passwords are never logged.
+
+It binds to localhost by default and has no authentication; don't expose it further.
+"""
+import argparse
+import asyncio
+import collections
+import concurrent.futures
+import json
+import os
+import re
+import sys
+import time
+
+import zxcvbn.main
+
+MAX_BODY = 64 * 1024
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           413: 'Payload Too Large', 500: 'Internal Server Error', 503: 'Service Unavailable'}
+PERCENTILES = [0.5, 0.9, 0.99]
+# what a locale from a client may look like ('es', 'pt_BR', 'sr_RS@latin', ...): never a
+# path, and short.
+LOCALE = re.compile(r'[A-Za-z]{2,8}([_-][A-Za-z0-9]{1,8}){0,2}(\.[A-Za-z0-9-]{1,16})?(@[A-Za-z0-9]{1,16})?\Z')
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message=None):
+        super(HTTPError, self).__init__(message or REASONS[status])
+        self.status = status
+
+
+class Server(object):
+    """
+    Scores the passwords POSTed to /score with estimator (default: the shared default
+    one), max_batch at a time at most, waiting up to max_delay seconds for a batch to
+    fill when idle. Beyond max_queue waiting requests, new ones get a 503. Latency
+    percentiles are over the last latency_window requests.
+    """
+
+    def __init__(self, estimator=None, max_batch=64, max_delay=0.002, max_queue=4096, latency_window=10000):
+        self.estimator = estimator or zxcvbn.main._default_estimator()
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.max_queue = max_queue
+        self._queue = None
+        self._executor = concurrent.futures.ThreadPoolExecutor(1, thread_name_prefix='zxcvbn-server')
+        self._started = time.time()
+        self._latencies = collections.deque(maxlen=latency_window)
+        self._counts = collections.Counter()
+        self._batches = 0
+        self._batched = 0
+        self._largest_batch = 0
+
+    #---------------------------------------------------------------------------
+    # batching -----------------------------------------------------------------
+    #---------------------------------------------------------------------------
+
+    async def score(self, password, user_inputs=(), locale=None, fields=None):
+        """ The result for password as json bytes, scored in a batch with whatever else
+        is waiting.
+        """
+        if self._queue.qsize() >= self.max_queue:
+            raise HTTPError(503, 'too many requests waiting')
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((password, tuple(user_inputs), locale, fields, future))
+        return await future
+
+    async def _batcher(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            if self.max_delay and self._queue.empty():
+                # nothing else waiting: give concurrent requests a moment to join.
+                await asyncio.sleep(self.max_delay)
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            batch = [request for request in batch if not request[-1].cancelled()]
+            if not batch:
+                continue
+            self._batches += 1
+            self._batched += len(batch)
+            self._largest_batch = max(self._largest_batch, len(batch))
+            try:
+                results = await loop.run_in_executor(self._executor, self._score_batch, batch)
+            except Exception as e:
+                results = [e] * len(batch)
+            for request, result in zip(batch, results):
+                future = request[-1]
+                if future.cancelled():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    def _score_batch(self, batch):
+        # password_strength_many shares its setup between passwords with the same
+        # user_inputs and locale, so the batch is scored a group at a time.
+        results = [None] * len(batch)
+        groups = collections.defaultdict(list)
+        for n, (password, user_inputs, locale, fields, future) in enumerate(batch):
+            groups[user_inputs, locale].append(n)
+        for (user_inputs, locale), indexes in groups.items():
+            scored = self.estimator.password_strength_many([batch[n][0] for n in indexes], list(user_inputs),
+                                                           locale=locale, chunksize=len(indexes))
+            for n, result in zip(indexes, scored):
+                fields = batch[n][3]
+                if fields is not None:
+                    result = dict((field, result[field]) for field in fields if field in result)
+                # encoded here, so that lazy feedback is built off the event loop too.
+                results[n] = json.dumps(result).encode('utf-8')
+        return results
+
+    #---------------------------------------------------------------------------
+    # http ---------------------------------------------------------------------
+    #---------------------------------------------------------------------------
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await _read_request(reader)
+                except HTTPError as e:
+                    await self._respond(writer, e.status, json.dumps(dict(error=str(e))).encode('utf-8'), False)
+                    return
+                if request is None:
+                    return
+                method, path, headers, body = request
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                start = time.time()
+                try:
+                    status, payload = 200, await self._route(method, path, body)
+                except HTTPError as e:
+                    status, payload = e.status, json.dumps(dict(error=str(e))).encode('utf-8')
+                except Exception as e:
+                    status, payload = 500, json.dumps(dict(error=type(e).__name__)).encode('utf-8')
+                self._counts[status] += 1
+                if path == '/score':
+                    self._latencies.append(time.time() - start)
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _route(self, method, path, body):
+        if path == '/score':
+            if method != 'POST':
+                raise HTTPError(405)
+            try:
+                request = json.loads(body)
+                password = request['password']
+            except (ValueError, TypeError, KeyError):
+                raise HTTPError(400, 'expected a json object with a password')
+            user_inputs = request.get('user_inputs') or []
+            fields = request.get('fields')
+            locale = request.get('locale')
+            if not isinstance(password, str) or not _strings(user_inputs) or \
+                    not (fields is None or _strings(fields)) or not (locale is None or isinstance(locale, str)):
+                raise HTTPError(400, 'password and locale must be strings, user_inputs and fields lists of strings')
+            if locale is not None and not LOCALE.match(locale):
+                raise HTTPError(400, 'locale must be a locale name, such as es or pt_BR')
+            return await self.score(password, user_inputs, locale, fields)
+        if path in ('/health', '/metrics'):
+            if method != 'GET':
+                raise HTTPError(405)
+            return json.dumps(self.health() if path == '/health' else self.metrics()).encode('utf-8')
+        raise HTTPError(404)
+
+    async def _respond(self, writer, status, payload, keep_alive):
+        writer.write(('HTTP/1.1 %d %s\r\nContent-Type: application/json\r\nContent-Length: %d\r\n'
+                      'Connection: %s\r\n\r\n' % (status, REASONS[status], len(payload),
+                                                  'keep-alive' if keep_alive else 'close')).encode('ascii'))
+        writer.write(payload)
+        await writer.drain()
+
+    #---------------------------------------------------------------------------
+    # health and metrics -------------------------------------------------------
+    #---------------------------------------------------------------------------
+
+    def health(self):
+        return dict(status='ok', pid=os.getpid(), uptime=time.time() - self._started,
+                    queued=self._queue.qsize() if self._queue is not None else 0)
+
+    def metrics(self):
+        latencies = sorted(self._latencies)
+        return dict(
+            uptime=time.time() - self._started,
+            responses=dict((str(status), count) for status, count in sorted(self._counts.items())),
+            queued=self._queue.qsize() if self._queue is not None else 0,
+            batches=self._batches,
+            mean_batch=self._batched / self._batches if self._batches else None,
+            largest_batch=self._largest_batch,
+            latency_ms=dict(('p%g' % (100 * q), latencies[min(int(len(latencies) * q), len(latencies) - 1)] * 1e3
+                             if latencies else None) for q in PERCENTILES),
+            latency_window=len(latencies))
+
+    #---------------------------------------------------------------------------
+    # serving ------------------------------------------------------------------
+    #---------------------------------------------------------------------------
+
+    async def start(self, host='127.0.0.1', port=8765, path=None):
+        """ Starts listening on path, a unix socket, or else host and port, and returns
+        the asyncio server; requests are served until it is closed.
+        """
+        # loading happens here, not on the first request.
+        self.estimator.password_strength('warm up')['feedback']
+        self._queue = asyncio.Queue()
+        self._batcher_task = asyncio.ensure_future(self._batcher())
+        if path is not None:
+            return await asyncio.start_unix_server(self._handle, path=path)
+        return await asyncio.start_server(self._handle, host, port)
+
+    async def serve_forever(self, host='127.0.0.1', port=8765, path=None):
+        server = await self.start(host, port, path)
+        async with server:
+            await server.serve_forever()
+
+
+def _strings(value):
+    return isinstance(value, list) and all(isinstance(item, str) for item in value)
+
+
+async def _read_request(reader):
+    """ (method, path, {lowercased header: value}, body), or None at the end of the
+    connection. Raises HTTPError for requests it won't serve.
+    """
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, path, version = line.decode('latin-1').split(' ', 2)
+    except ValueError:
+        raise HTTPError(400, 'malformed request line')
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        if len(headers) >= 100:
+            raise HTTPError(400, 'too many headers')
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    if version.strip() == 'HTTP/1.0' and headers.get('connection', '').lower() != 'keep-alive':
+        headers['connection'] = 'close'
+    try:
+        length = int(headers.get('content-length', 0))
+    except ValueError:
+        raise HTTPError(400, 'bad Content-Length')
+    if length > MAX_BODY:
+        raise HTTPError(413)
+    body = await reader.readexactly(length) if length > 0 else b''
+    return method, path.split('?', 1)[0], headers, body
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m zxcvbn.server', description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--host', default='127.0.0.1', help='address to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='port to listen on (default: 8765)')
+    parser.add_argument('--unix', metavar='PATH', help='listen on this unix socket instead')
+    parser.add_argument('--max-batch', type=int, default=64, help='most requests scored together (default: 64)')
+    parser.add_argument('--max-delay', type=float, default=0.002,
+                        help='seconds an idle server waits for a batch to fill (default: 0.002)')
+    parser.add_argument('--max-queue', type=int, default=4096,
+                        help='waiting requests beyond which new ones get a 503 (default: 4096)')
+    args = parser.parse_args(argv)
+    server = Server(max_batch=args.max_batch, max_delay=args.max_delay, max_queue=args.max_queue)
+    try:
+        asyncio.run(server.serve_forever(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,17 +1,20 @@
+def estimate_attack_times(guesses):
+    crack_times_seconds = attack_times_seconds(guesses)
+    return dict(crack_times_seconds=crack_times_seconds,
+                crack_times_display=display_times(crack_times_seconds),
+                score=guesses_to_score(guesses))
 
 
-def estimate_attack_times(guesses):
-    crack_times_seconds = dict(online_throttling_100_per_hour=guesses / (100.0 / 3600),
-                               online_no_throttling_10_per_second=guesses / 10.0,
-                               offline_slow_hashing_1e4_per_second=guesses / 1.0e4,
-                               offline_fast_hashing_1e10_per_second=guesses / 1.0e10)
+def attack_times_seconds(guesses):
+    return dict(online_throttling_100_per_hour=guesses / (100.0 / 3600),
+                online_no_throttling_10_per_second=guesses / 10.0,
+                offline_slow_hashing_1e4_per_second=guesses / 1.0e4,
+                offline_fast_hashing_1e10_per_second=guesses / 1.0e10)
 
-    crack_times_display = {scenario: display_time(seconds)
-                           for scenario, seconds in crack_times_seconds.items()}
 
-    return dict(crack_times_seconds=crack_times_seconds,
-                crack_times_display=crack_times_display,
-                score=guesses_to_score(guesses))
+def display_times(crack_times_seconds):
+    return {scenario: display_time(seconds)
+            for scenario, seconds in crack_times_seconds.items()}
 
 
 def guesses_to_score(guesses):
@@ -33,6 +36,15 @@ def guesses_to_score(guesses):
       # strong protection from offline attacks under same scenario: "very unguessable"
       return 4
 
+def min_guesses_for_score(score):
+    """ The fewest guesses guesses_to_score maps to score or higher; inf above 4. """
+    delta = 5
+    if score <= 0:
+        return 0
+    if score > 4:
+        return float('inf')
+    return (1e3, 1e6, 1e8, 1e10)[score - 1] + delta
+
 def display_time(seconds):
     minute = 60
     hour = minute * 60